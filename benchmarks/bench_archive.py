@@ -0,0 +1,68 @@
+"""
+Compare in-memory zip extraction against a temp file round trip.
+
+    python benchmarks/bench_archive.py [fit file] [repeat]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import zipfile
+
+from garminconnect.archive import iter_members
+
+FIT = "tests/12129115726_ACTIVITY.fit"
+
+
+def via_tempfile(data: bytes) -> int:
+    """What consumers did before: write the zip, unzip it, read it back."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "activity.zip")
+        with open(path, "wb") as f:
+            f.write(data)
+        with zipfile.ZipFile(path) as archive:
+            archive.extractall(directory)
+            names = archive.namelist()
+        total = 0
+        for name in names:
+            with open(os.path.join(directory, name), "rb") as f:
+                total += len(f.read())
+    return total
+
+
+def in_memory(data: bytes) -> int:
+    return sum(len(member.read()) for member in iter_members(data))
+
+
+def measure(name, func, data, repeat):
+    best = min(timeit.repeat(lambda: func(data), number=1, repeat=repeat))
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>22}: {best * 1000:7.3f} ms, peak {peak / 1024:8.1f} KiB")
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else FIT
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with open(path, "rb") as f:
+        content = f.read()
+
+    for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression) as archive:
+            archive.writestr(os.path.basename(path), content)
+        data = buffer.getvalue()
+        label = "stored" if compression == zipfile.ZIP_STORED else "deflated"
+        print(f"{label}, {len(content)} bytes:")
+        measure("temp file", via_tempfile, data, repeat)
+        measure("iter_members", in_memory, data, repeat)
+
+
+if __name__ == "__main__":
+    main()
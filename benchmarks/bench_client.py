@@ -0,0 +1,320 @@
+"""
+Benchmark the client's hot paths against a local FakeConnectServer, and
+save the results as JSON to compare later changes against a baseline.
+
+    python benchmarks/bench_client.py [--repeat N] [--only NAME ...]
+        [--save results.json] [--baseline results.json] [--threshold 0.1]
+
+Times are the best of 'repeat' runs; peak memory is traced over one
+extra run. With --baseline, cases slower (or with a larger peak) by more
+than 'threshold' are flagged and the exit status is 1.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Tuple
+
+from garminconnect import Garmin
+from garminconnect.details import decode_details
+from garminconnect.fakeserver import (
+    ACTIVITY_ID_BASE,
+    FakeAccount,
+    FakeConnectServer,
+)
+from garminconnect.ratelimit import RateLimiter
+
+ACCOUNT = FakeAccount(
+    days=365, activities=2000, samples=10000, today=date(2024, 12, 31)
+)
+MAXCHART = (100, 1000, 10000)
+CALLS = 1000
+HTTP_CALLS = 200
+DOWNLOADS = 5
+
+# name -> setup(server, tokenstore) returning (run, work, unit)
+Setup = Callable[[FakeConnectServer, str], Tuple[Callable, int, str]]
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+def benchmark(name: str):
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def unlimited() -> RateLimiter:
+    # Pacing would measure the rate limiter's schedule, not the client
+    return RateLimiter(1e9, burst=1e9, max_rate=1e9)
+
+
+def client(server: FakeConnectServer) -> Garmin:
+    return server.attach(Garmin(rate_limiter=unlimited()))
+
+
+class NullGarth:
+    """Answers every request at once, isolating the client's overhead."""
+
+    response = type("Response", (), {"status_code": 200, "content": b"{}"})
+
+    def connectapi(self, path, **kwargs):
+        return {}
+
+    def request(self, method, subdomain, path, **kwargs):
+        return self.response
+
+    def post(self, subdomain, path, **kwargs):
+        return {}
+
+
+def offline_client() -> Garmin:
+    garmin = Garmin(rate_limiter=unlimited())
+    garmin.garth = NullGarth()
+    garmin.display_name = ACCOUNT.display_name
+    return garmin
+
+
+@benchmark("login")
+def login(server, tokenstore):
+    def run():
+        garmin = Garmin(rate_limiter=unlimited())
+        server.mount(garmin).login(tokenstore)
+
+    return run, 1, "logins"
+
+
+@benchmark("connectapi")
+def connectapi(server, tokenstore):
+    garmin = offline_client()
+
+    def run():
+        for _ in range(CALLS):
+            garmin.get_hrv_data("2024-12-01")
+
+    return run, CALLS, "calls"
+
+
+@benchmark("connectapi_http")
+def connectapi_http(server, tokenstore):
+    garmin = client(server)
+
+    def run():
+        for _ in range(HTTP_CALLS):
+            garmin.get_hrv_data("2024-12-01")
+
+    return run, HTTP_CALLS, "calls"
+
+
+@benchmark("get_activities_by_date")
+def activities_by_date(server, tokenstore):
+    garmin = client(server)
+    start, end = str(ACCOUNT.first_day), str(ACCOUNT.today)
+
+    def run():
+        assert len(garmin.get_activities_by_date(start, end)) == 2000
+
+    return run, ACCOUNT.activities, "activities"
+
+
+@benchmark("get_activities_by_date[typed]")
+def activities_by_date_typed(server, tokenstore):
+    garmin = client(server)
+    start, end = str(ACCOUNT.first_day), str(ACCOUNT.today)
+
+    def run():
+        activities = garmin.get_activities_by_date(start, end, typed=True)
+        assert len(activities) == 2000
+
+    return run, ACCOUNT.activities, "activities"
+
+
+@benchmark("download_activity")
+def download_activity(server, tokenstore):
+    garmin = client(server)
+    ids = [ACTIVITY_ID_BASE + i for i in range(DOWNLOADS)]
+    original = Garmin.ActivityDownloadFormat.ORIGINAL
+    size = sum(len(garmin.download_activity(i, original)) for i in ids)
+
+    def run():
+        for activity_id in ids:
+            garmin.download_activity(activity_id, original)
+
+    return run, size, "bytes"
+
+
+def details_decode(maxchart: int) -> Setup:
+    def setup(server, tokenstore):
+        details = client(server).get_activity_details(
+            ACTIVITY_ID_BASE, maxchart=maxchart
+        )
+
+        return lambda: decode_details(details), maxchart, "samples"
+
+    return setup
+
+
+def details_fetch(maxchart: int) -> Setup:
+    def setup(server, tokenstore):
+        garmin = client(server)
+
+        def run():
+            garmin.get_activity_metrics(ACTIVITY_ID_BASE, maxchart=maxchart)
+
+        return run, maxchart, "samples"
+
+    return setup
+
+
+for size in MAXCHART:
+    benchmark(f"get_activity_details_decode[{size}]")(details_decode(size))
+    benchmark(f"get_activity_metrics[{size}]")(details_fetch(size))
+
+
+def measurements(count: int):
+    start = datetime(2024, 1, 1, 7)
+    return [
+        {
+            "timestamp": (start + timedelta(days=i)).isoformat(),
+            "weight": 72.5 + i % 10 / 10,
+            "percent_fat": 18.0,
+            "bmi": 22.4,
+        }
+        for i in range(count)
+    ]
+
+
+def body_composition_fit(count: int) -> Setup:
+    def setup(server, tokenstore):
+        # Offline, so the time is the FIT encoding rather than the upload
+        garmin = offline_client()
+        batch = measurements(count)
+
+        def run():
+            garmin.add_body_compositions(batch, batch_size=count)
+
+        return run, count, "weigh-ins"
+
+    return setup
+
+
+for size in (1, 500):
+    benchmark(f"body_composition_fit[{size}]")(body_composition_fit(size))
+
+
+@benchmark("add_body_composition")
+def add_body_composition(server, tokenstore):
+    garmin = client(server)
+
+    def run():
+        garmin.add_body_composition("2024-01-01T07:00:00", 72.5, 18.0)
+
+    return run, 1, "uploads"
+
+
+def measure(run: Callable, repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "median": statistics.median(times),
+        "peak_bytes": peak,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> bool:
+    """Print each case relative to 'baseline', return True on regression."""
+
+    regressed = False
+    print(f"\nCompared to {baseline['created']}:")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        speed = result["seconds"] / before["seconds"]
+        memory = (result["peak_bytes"] + 1) / (before["peak_bytes"] + 1)
+        flags = []
+        if speed > 1 + threshold:
+            flags.append("SLOWER")
+        if memory > 1 + threshold:
+            flags.append("MORE MEMORY")
+        regressed = regressed or bool(flags)
+        print(
+            f"{name:>36}: time {speed:5.2f}x, peak {memory:5.2f}x "
+            f"{' '.join(flags)}"
+        )
+
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Run these cases only")
+    parser.add_argument("--save", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare with saved results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = {}
+    server = FakeConnectServer([ACCOUNT])
+    with server, tempfile.TemporaryDirectory() as tokenstore:
+        client(server).garth.dump(tokenstore)
+        for name, setup in BENCHMARKS.items():
+            if args.only and name not in args.only:
+                continue
+            run, work, unit = setup(server, tokenstore)
+            run()  # warm up connections and caches
+            result = measure(run, args.repeat)
+            result.update(
+                work=work,
+                unit=unit,
+                rate=work / result["seconds"],
+            )
+            results[name] = result
+            print(
+                f"{name:>36}: {result['seconds'] * 1000:9.2f} ms "
+                f"{result['rate']:14.1f} {unit}/s "
+                f"peak {result['peak_bytes'] / 1024:9.1f} KiB"
+            )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved to {args.save}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
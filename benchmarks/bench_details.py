@@ -0,0 +1,74 @@
+"""
+Compare decode_details against walking the activityDetailMetrics dicts.
+
+    python benchmarks/bench_details.py [samples] [repeat]
+"""
+
+import random
+import sys
+import timeit
+
+from garminconnect.details import decode_details, decode_details_naive
+
+KEYS = (
+    "directTimestamp",
+    "directHeartRate",
+    "directSpeed",
+    "directElevation",
+    "directLatitude",
+    "directLongitude",
+    "sumDistance",
+    "directPower",
+)
+
+
+def synthetic_details(samples: int) -> dict:
+    rng = random.Random(0)
+    return {
+        "metricDescriptors": [
+            {"metricsIndex": index, "key": key}
+            for index, key in enumerate(KEYS)
+        ],
+        "activityDetailMetrics": [
+            {
+                "metrics": [
+                    1.7e12 + i * 1000.0,
+                    *(
+                        None if rng.random() < 0.02 else rng.uniform(0, 200)
+                        for _ in KEYS[1:]
+                    ),
+                ]
+            }
+            for i in range(samples)
+        ],
+    }
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    details = synthetic_details(samples)
+
+    cases = {
+        "naive": lambda: decode_details_naive(details),
+        "array": lambda: decode_details(details, use_numpy=False),
+    }
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("numpy not installed, skipping numpy decoder")
+    else:
+        cases["numpy"] = lambda: decode_details(details, use_numpy=True)
+
+    baseline = None
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(
+            f"{name:>6}: {best * 1000:8.2f} ms for {samples} samples "
+            f"({baseline / best:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Measure FIT decoding throughput in files per second.
+
+    python benchmarks/bench_fitfile.py [fit file or directory] [files]
+"""
+
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+from garminconnect.fitfile import decode_files
+
+FIT = "tests/12129115726_ACTIVITY.fit"
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else FIT
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        if os.path.isdir(source):
+            paths = sorted(
+                glob.glob(os.path.join(source, "*.fit"))
+                + glob.glob(os.path.join(source, "*.zip"))
+            )
+        else:
+            # Distinct copies, so every file gets its own output directory
+            paths = []
+            for i in range(count):
+                paths.append(os.path.join(directory, f"{i}.fit"))
+                shutil.copyfile(source, paths[-1])
+
+        for processes in sorted({1, 2, os.cpu_count() or 1}):
+            out_dir = os.path.join(directory, f"out-{processes}")
+            report = decode_files(paths, out_dir, processes=processes)
+            print(
+                f"{processes:>3} processes: {report.files} files, "
+                f"{report.records} records in {report.seconds:.2f}s "
+                f"({report.files_per_second:.0f} files/s, "
+                f"{len(report.failed)} failed)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark the cold start of garminconnect: the time to import it and to
+construct a Garmin, each in a fresh interpreter.
+
+    python benchmarks/bench_import.py [--repeat N] [--save results.json]
+        [--baseline results.json] [--threshold 0.1]
+
+Also lists the heavy dependencies that 'import garminconnect' loaded,
+which should be none; they are imported when first needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List
+
+HEAVY = ("garth", "requests", "pydantic", "withings_sync", "orjson")
+
+CASES = {
+    "import": "import garminconnect",
+    "construct": "import garminconnect; garminconnect.Garmin()",
+}
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+{code}
+seconds = time.perf_counter() - started
+print(seconds, *[m for m in {heavy!r} if m in sys.modules])
+"""
+
+
+def run_case(code: str) -> List[str]:
+    # Run from the repository so the working copy is what gets imported
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY)],
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": root},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return output
+
+
+def measure(code: str, repeat: int) -> Dict[str, object]:
+    run_case(code)  # write bytecode caches
+    times = []
+    for _ in range(repeat):
+        seconds, *loaded = run_case(code)
+        times.append(float(seconds))
+
+    return {
+        "seconds": min(times),
+        "median": statistics.median(times),
+        "loaded": loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--save", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare with saved results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in CASES.items():
+        result = results[name] = measure(code, args.repeat)
+        print(
+            f"{name:>10}: {result['seconds'] * 1000:8.2f} ms "
+            f"(median {result['median'] * 1000:.2f} ms) "
+            f"loaded: {', '.join(result['loaded']) or '-'}"
+        )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved to {args.save}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressed = False
+        print(f"\nCompared to {baseline['created']}:")
+        for name, result in results.items():
+            before = baseline["results"].get(name)
+            if before is None:
+                continue
+            speed = result["seconds"] / before["seconds"]
+            slower = speed > 1 + args.threshold
+            regressed = regressed or slower
+            print(f"{name:>10}: {speed:5.2f}x {'SLOWER' if slower else ''}")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
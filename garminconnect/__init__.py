@@ -2,168 +2,430 @@
 
 import logging
 import os
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
 from enum import Enum, auto
-from typing import Any, Dict, List, Optional
-
-import garth
-from withings_sync import fit
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import archive, export, planner, upload
+from .bundle import ActivityBundle, DailySnapshot, fan_out
+from .details import decode_details, iter_details
+from .endpoints import ConnectEndpoints
+from .instrumentation import (
+    CallRecord,
+    Instrumentation,
+    caller_name,
+    entry_name,
+    record_as,
+)
+from .models import ActivitySummary, HrvSummary, SleepSummary, UserSummary
+from .pagination import Cursor, iter_items
+from .ratelimit import RateLimiter, parse_retry_after
+from .singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 
-class Garmin:
-    """Class for fetching data from Garmin Connect."""
+def _to_date(value: Union[str, date]) -> date:
+    """Return 'value' as a date, accepting 'YYYY-MM-DD' strings."""
+
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _date_range(start: Union[str, date], end: Union[str, date]):
+    """Yield every date from 'start' through 'end' inclusive."""
+
+    current, last = _to_date(start), _to_date(end)
+    while current <= last:
+        yield current
+        current += timedelta(days=1)
+
+
+def _default_json_loads() -> Optional[Callable[[bytes], Any]]:
+    """Return orjson.loads if orjson is installed, imported on first use."""
+
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+
+    return orjson.loads
+
 
-    def __init__(self, email=None, password=None, is_cn=False):
-        """Create a new class instance."""
+def _encode_body_composition(measurements: List[Dict[str, Any]]) -> bytes:
+    """Encode weigh-ins as a single FIT weight file."""
+
+    from withings_sync import fit
+
+    timestamps = [
+        (
+            datetime.fromisoformat(m["timestamp"])
+            if m.get("timestamp")
+            else datetime.now()
+        )
+        for m in measurements
+    ]
+    fitEncoder = fit.FitEncoderWeight()
+    fitEncoder.write_file_info()
+    fitEncoder.write_file_creator()
+    fitEncoder.write_device_info(timestamps[0])
+    for dt, measurement in zip(timestamps, measurements):
+        fields = {k: v for k, v in measurement.items() if k != "timestamp"}
+        fitEncoder.write_weight_scale(dt, **fields)
+    fitEncoder.finish()
+
+    return fitEncoder.getvalue()
+
+
+@dataclass(frozen=True)
+class LoginState:
+    """Account details read at login, replaced as a whole, never mutated."""
+
+    display_name: Optional[str] = None
+    full_name: Optional[str] = None
+    unit_system: Optional[str] = None
+
+
+class Garmin(ConnectEndpoints):
+    """
+    Class for fetching data from Garmin Connect.
+
+    One logged-in instance may be shared by any number of threads: the
+    OAuth2 token is refreshed once under a lock when it expires, requests
+    share one connection pool that grows to the largest worker count used
+    (see configure_pool), the rate limiter, cache and coalescing are
+    thread-safe, and the login details are an immutable LoginState swapped
+    in at once. Calling login() while other threads make requests is not
+    supported.
+    """
+
+    # Per-activity sub-resources for get_activity_bundle -> getter
+    ACTIVITY_PARTS = {
+        "splits": "get_activity_splits",
+        "split_summaries": "get_activity_split_summaries",
+        "weather": "get_activity_weather",
+        "hr_in_timezones": "get_activity_hr_in_timezones",
+        "exercise_sets": "get_activity_exercise_sets",
+        "gear": "get_activity_gear",
+        "evaluation": "get_activity_evaluation",
+        "details": "get_activity_details",
+    }
+
+    # DailySnapshot fields for get_daily_snapshot -> per-day getter
+    SNAPSHOT_PARTS = {
+        "stats": "get_user_summary",
+        "body_composition": "get_body_composition",
+        "heart_rates": "get_heart_rates",
+        "rhr": "get_rhr_day",
+        "sleep": "get_sleep_data",
+        "hrv": "get_hrv_data",
+        "stress": "get_all_day_stress",
+        "body_battery": "get_body_battery",
+        "spo2": "get_spo2_data",
+        "respiration": "get_respiration_data",
+        "hydration": "get_hydration_data",
+        "steps": "get_steps_data",
+        "floors": "get_floors",
+        "training_readiness": "get_training_readiness",
+        "training_status": "get_training_status",
+        "max_metrics": "get_max_metrics",
+        "blood_pressure": "get_blood_pressure",
+    }
+
+    # Request methods that are transport rather than endpoints
+    TRANSPORT = frozenset({"connectapi", "download", "stream"})
+
+    # Seconds before expiry a token is refreshed, so it can't expire between
+    # the locked check and garth's own, unlocked one
+    TOKEN_REFRESH_MARGIN = 60
+
+    # Per-day getters taking a single 'cdate' that fetch_range can fan out
+    RANGE_METRICS = (
+        "get_user_summary",
+        "get_sleep_data",
+        "get_hrv_data",
+        "get_stress_data",
+        "get_spo2_data",
+        "get_respiration_data",
+        "get_training_readiness",
+        "get_training_status",
+        "get_rhr_day",
+        "get_heart_rates",
+        "get_all_day_stress",
+        "get_hydration_data",
+        "get_max_metrics",
+        "get_steps_data",
+        "get_floors",
+    )
+
+    def __init__(
+        self,
+        email=None,
+        password=None,
+        is_cn=False,
+        cache=None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 5,
+        coalesce: bool = False,
+        pool_size: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        json_loads: Optional[Callable[[bytes], Any]] = None,
+    ):
+        """
+        Create a new class instance. Pass a garminconnect.cache.ResponseCache
+        (or compatible object) as 'cache' to serve repeated GETs from disk.
+        Requests are paced by 'rate_limiter' and retried up to 'max_retries'
+        times when the server answers 429. With 'coalesce', identical GETs
+        issued concurrently share a single request and its result.
+        'pool_size' sets the number of pooled connections up front.
+        Every request is recorded per getter in 'instrumentation', a new
+        garminconnect.instrumentation.Instrumentation by default.
+        Responses are decoded with 'json_loads', orjson.loads when orjson
+        is installed and requests' decoder otherwise.
+        """
         self.username = email
         self.password = password
         self.is_cn = is_cn
-
-        self.garmin_connect_user_settings_url = (
-            "/userprofile-service/userprofile/user-settings"
-        )
-        self.garmin_connect_devices_url = (
-            "/device-service/deviceregistration/devices"
-        )
-        self.garmin_connect_device_url = "/device-service/deviceservice"
-        self.garmin_connect_weight_url = "/weight-service"
-        self.garmin_connect_daily_summary_url = (
-            "/usersummary-service/usersummary/daily"
-        )
-        self.garmin_connect_metrics_url = (
-            "/metrics-service/metrics/maxmet/daily"
-        )
-        self.garmin_connect_daily_hydration_url = (
-            "/usersummary-service/usersummary/hydration/daily"
-        )
-        self.garmin_connect_daily_stats_steps_url = (
-            "/usersummary-service/stats/steps/daily"
-        )
-        self.garmin_connect_personal_record_url = (
-            "/personalrecord-service/personalrecord/prs"
-        )
-        self.garmin_connect_earned_badges_url = "/badge-service/badge/earned"
-        self.garmin_connect_adhoc_challenges_url = (
-            "/adhocchallenge-service/adHocChallenge/historical"
-        )
-        self.garmin_connect_badge_challenges_url = (
-            "/badgechallenge-service/badgeChallenge/completed"
-        )
-        self.garmin_connect_available_badge_challenges_url = (
-            "/badgechallenge-service/badgeChallenge/available"
-        )
-        self.garmin_connect_non_completed_badge_challenges_url = (
-            "/badgechallenge-service/badgeChallenge/non-completed"
-        )
-        self.garmin_connect_inprogress_virtual_challenges_url = (
-            "/badgechallenge-service/virtualChallenge/inProgress"
-        )
-        self.garmin_connect_daily_sleep_url = (
-            "/wellness-service/wellness/dailySleepData"
-        )
-        self.garmin_connect_daily_stress_url = (
-            "/wellness-service/wellness/dailyStress"
-        )
-        self.garmin_connect_hill_score_url = (
-            "/metrics-service/metrics/hillscore"
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.singleflight = SingleFlight() if coalesce else None
+        self.instrumentation = instrumentation or Instrumentation()
+        self.json_loads = json_loads or _default_json_loads()
+
+        # garth pulls in requests and pydantic, so import it on first use
+        import garth
+
+        # requests' default HTTPAdapter pool size
+        self.pool_size = pool_size or 10
+        self.garth = garth.Client(
+            domain="garmin.cn" if is_cn else "garmin.com",
+            pool_maxsize=self.pool_size,
         )
 
-        self.garmin_connect_daily_body_battery_url = (
-            "/wellness-service/wellness/bodyBattery/reports/daily"
-        )
+        self.login_state = LoginState()
+        self._state_lock = threading.Lock()
+        self._token_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
 
-        self.garmin_connect_blood_pressure_endpoint = (
-            "/bloodpressure-service/bloodpressure/range"
-        )
+    @property
+    def display_name(self) -> Optional[str]:
+        return self.login_state.display_name
 
-        self.garmin_connect_set_blood_pressure_endpoint = (
-            "/bloodpressure-service/bloodpressure"
-        )
+    @display_name.setter
+    def display_name(self, value: Optional[str]):
+        with self._state_lock:
+            self.login_state = replace(self.login_state, display_name=value)
 
-        self.garmin_connect_endurance_score_url = (
-            "/metrics-service/metrics/endurancescore"
-        )
+    @property
+    def full_name(self) -> Optional[str]:
+        return self.login_state.full_name
 
-        self.garmin_connect_goals_url = "/goal-service/goal/goals"
+    @full_name.setter
+    def full_name(self, value: Optional[str]):
+        with self._state_lock:
+            self.login_state = replace(self.login_state, full_name=value)
 
-        self.garmin_connect_rhr_url = "/userstats-service/wellness/daily"
+    @property
+    def unit_system(self) -> Optional[str]:
+        return self.login_state.unit_system
 
-        self.garmin_connect_hrv_url = "/hrv-service/hrv"
+    @unit_system.setter
+    def unit_system(self, value: Optional[str]):
+        with self._state_lock:
+            self.login_state = replace(self.login_state, unit_system=value)
 
-        self.garmin_connect_training_readiness_url = (
-            "/metrics-service/metrics/trainingreadiness"
-        )
+    def configure_pool(self, size: int):
+        """
+        Make sure the shared connection pools hold at least 'size'
+        connections, so 'size' threads don't open and drop connections.
 
-        self.garmin_connect_race_predictor_url = (
-            "/metrics-service/metrics/racepredictions"
-        )
-        self.garmin_connect_training_status_url = (
-            "/metrics-service/metrics/trainingstatus/aggregated"
-        )
-        self.garmin_connect_user_summary_chart = (
-            "/wellness-service/wellness/dailySummaryChart"
-        )
-        self.garmin_connect_floors_chart_daily_url = (
-            "/wellness-service/wellness/floorsChartData/daily"
-        )
-        self.garmin_connect_heartrates_daily_url = (
-            "/wellness-service/wellness/dailyHeartRate"
-        )
-        self.garmin_connect_daily_respiration_url = (
-            "/wellness-service/wellness/daily/respiration"
-        )
-        self.garmin_connect_daily_spo2_url = (
-            "/wellness-service/wellness/daily/spo2"
-        )
-        self.garmin_all_day_stress_url = (
-            "/wellness-service/wellness/dailyStress"
-        )
-        self.garmin_connect_activities = (
-            "/activitylist-service/activities/search/activities"
-        )
-        self.garmin_connect_activity = "/activity-service/activity"
-        self.garmin_connect_activity_types = (
-            "/activity-service/activity/activityTypes"
-        )
-        self.garmin_connect_activity_fordate = (
-            "/mobile-gateway/heartRate/forDate"
-        )
-        self.garmin_connect_fitnessstats = "/fitnessstats-service/activity"
+        Call before fanning out: every adapter mounted on the session,
+        including those mounted for proxies or tests, is replaced by a copy
+        with a larger pool and the old one closed.
+        """
 
-        self.garmin_connect_fit_download = "/download-service/files/activity"
-        self.garmin_connect_tcx_download = (
-            "/download-service/export/tcx/activity"
-        )
-        self.garmin_connect_gpx_download = (
-            "/download-service/export/gpx/activity"
+        from requests.adapters import HTTPAdapter
+
+        with self._pool_lock:
+            session = getattr(self.garth, "sess", None)
+            if size <= self.pool_size or session is None:
+                return
+            for prefix, old in list(session.adapters.items()):
+                if not isinstance(old, HTTPAdapter):
+                    continue
+                # The unpickling path builds a fresh pool from the state
+                resized = type(old).__new__(type(old))
+                resized.__setstate__({**vars(old), "_pool_maxsize": size})
+                session.mount(prefix, resized)
+                old.close()
+            # Kept by garth when it mounts its adapter again on load()
+            self.garth.pool_maxsize = size
+            self.pool_size = size
+            logger.debug(f"Connection pools resized to {size}")
+
+    def _token_expired(self) -> bool:
+        from garth.auth_tokens import OAuth2Token
+
+        token = self.garth.oauth2_token
+
+        return (
+            not isinstance(token, OAuth2Token)
+            or token.expires_at - self.TOKEN_REFRESH_MARGIN < time.time()
         )
-        self.garmin_connect_kml_download = (
-            "/download-service/export/kml/activity"
+
+    def refresh_oauth2(self):
+        """
+        Refresh an expired or expiring OAuth2 token once, however many
+        threads ask. Called before every request, ahead of garth's own
+        refresh, which isn't locked.
+        """
+
+        if not getattr(self.garth, "oauth1_token", None):
+            return
+        if not self._token_expired():
+            return
+        with self._token_lock:
+            if self._token_expired():
+                logger.debug("Refreshing OAuth2 token")
+                self.garth.refresh_oauth2()
+
+    def _send(self, request, path, **kwargs):
+        """
+        Call 'request' under the rate limiter, retrying on 429, and record
+        the call in self.instrumentation under the calling getter's name.
+        """
+
+        from garth.exc import GarthHTTPError
+
+        endpoint = caller_name(self, self.TRANSPORT, request.__name__)
+        last = {}
+
+        def capture(response, *args, **kwargs):
+            last["status"] = response.status_code
+            # Don't read a streamed body just to measure it
+            last["size"] = (
+                int(response.headers.get("Content-Length") or 0)
+                if kwargs.get("stream")
+                else len(response.content)
+            )
+
+        # garth's request() defaults to one shared headers dict
+        kwargs.setdefault("headers", {})
+        kwargs["hooks"] = {"response": capture}
+        attempt = 0
+        error = None
+        started = time.perf_counter()
+        try:
+            while True:
+                self.rate_limiter.acquire()
+                self.refresh_oauth2()
+                try:
+                    response = request(path, **kwargs)
+                except GarthHTTPError as e:
+                    error_response = getattr(e.error, "response", None)
+                    if getattr(error_response, "status_code", None) != 429:
+                        raise
+                    if attempt >= self.max_retries:
+                        raise GarminConnectTooManyRequestsError(
+                            f"Too many requests for {path}"
+                        ) from e
+                    retry_after = parse_retry_after(
+                        error_response.headers.get("Retry-After")
+                    )
+                    delay = self.rate_limiter.on_throttle(attempt, retry_after)
+                    logger.debug(
+                        f"Throttled on {path}, retrying in {delay:.2f}s"
+                    )
+                    attempt += 1
+                else:
+                    self.rate_limiter.on_success()
+                    return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.instrumentation.record(
+                CallRecord(
+                    endpoint,
+                    path,
+                    time.perf_counter() - started,
+                    last.get("status"),
+                    last.get("size", 0),
+                    attempt,
+                    error,
+                )
+            )
+
+    def connectapi(self, path, **kwargs):
+        if self.singleflight is None or kwargs.get("method", "GET") != "GET":
+            return self._connectapi(path, **kwargs)
+
+        # Key on the request as sent, independent of dict ordering
+        params = kwargs.get("params") or {}
+        options = {k: v for k, v in kwargs.items() if k != "params"}
+        key = (
+            path,
+            repr(sorted(params.items())),
+            repr(sorted(options.items())),
         )
-        self.garmin_connect_csv_download = (
-            "/download-service/export/csv/activity"
+
+        return self.singleflight.do(
+            key, lambda: self._connectapi(path, **kwargs)
         )
 
-        self.garmin_connect_upload = "/upload-service/upload"
+    def _transport(self):
+        """garth's connectapi, decoding with self.json_loads if set."""
 
-        self.garmin_connect_gear = "/gear-service/gear/filterGear"
-        self.garmin_connect_gear_baseurl = "/gear-service/gear/"
+        loads = self.json_loads
+        if loads is None:
+            return self.garth.connectapi
 
-        self.garth = garth.Client(
-            domain="garmin.cn" if is_cn else "garmin.com"
-        )
+        def connectapi(path, method="GET", **kwargs):
+            response = self.garth.request(
+                method, "connectapi", path, api=True, **kwargs
+            )
+            if response.status_code == 204:
+                return None
+            return loads(response.content)
 
-        self.display_name = None
-        self.full_name = None
-        self.unit_system = None
+        return connectapi
 
-    def connectapi(self, path, **kwargs):
-        return self.garth.connectapi(path, **kwargs)
+    def _connectapi(self, path, **kwargs):
+        if self.cache is None or kwargs.get("method", "GET") != "GET":
+            return self._send(self._transport(), path, **kwargs)
+
+        params = kwargs.get("params")
+        hit, response = self.cache.get(self.display_name, path, params)
+        if hit:
+            logger.debug("Serving %s from cache", path)
+            return response
+
+        response = self._send(self._transport(), path, **kwargs)
+        self.cache.set(self.display_name, path, params, response)
+
+        return response
 
     def download(self, path, **kwargs):
-        return self.garth.download(path, **kwargs)
+        return self._send(self.garth.download, path, **kwargs)
+
+    def stream(self, path, **kwargs):
+        """Return a streamed requests.Response, the caller must close it."""
+
+        def request(path, **kwargs):
+            return self.garth.get(
+                "connectapi", path, api=True, stream=True, **kwargs
+            )
+
+        return self._send(request, path, **kwargs)
 
     def login(self, /, tokenstore: Optional[str] = None):
         """Log in using Garth."""
@@ -174,11 +436,12 @@ class Garmin:
         else:
             self.garth.login(self.username, self.password)
 
-        self.display_name = self.garth.profile["displayName"]
-        self.full_name = self.garth.profile["fullName"]
-
         settings = self.garth.connectapi(self.garmin_connect_user_settings_url)
-        self.unit_system = settings["userData"]["measurementSystem"]
+        self.login_state = LoginState(
+            self.garth.profile["displayName"],
+            self.garth.profile["fullName"],
+            settings["userData"]["measurementSystem"],
+        )
 
         return True
 
@@ -200,28 +463,24 @@ class Garmin:
 
         return self.get_user_summary(cdate)
 
-    def get_user_summary(self, cdate: str) -> Dict[str, Any]:
-        """Return user activity summary for 'cdate' format 'YYYY-MM-DD'."""
-
-        url = f"{self.garmin_connect_daily_summary_url}/{self.display_name}"
-        params = {"calendarDate": str(cdate)}
-        logger.debug("Requesting user summary")
-
-        response = self.connectapi(url, params=params)
+    def get_user_summary(
+        self, cdate: str, typed: bool = False
+    ) -> Union[Dict[str, Any], UserSummary]:
+        """
+        Return user activity summary for 'cdate' format 'YYYY-MM-DD', as
+        a garminconnect.models.UserSummary with 'typed'.
+        """
 
-        if response["privacyProtected"] is True:
-            raise GarminConnectAuthenticationError("Authentication error")
+        call = self._user_summary_call(cdate)
+        response = self.connectapi(call.path, **call.kwargs)
 
-        return response
+        return self._user_summary_result(response, typed)
 
     def get_steps_data(self, cdate):
         """Fetch available steps data 'cDate' format 'YYYY-MM-DD'."""
 
-        url = f"{self.garmin_connect_user_summary_chart}/{self.display_name}"
-        params = {"date": str(cdate)}
-        logger.debug("Requesting steps data")
-
-        return self.connectapi(url, params=params)
+        call = self._steps_data_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_floors(self, cdate):
         """Fetch available floors data 'cDate' format 'YYYY-MM-DD'."""
@@ -242,11 +501,8 @@ class Garmin:
     def get_heart_rates(self, cdate):
         """Fetch available heart rates data 'cDate' format 'YYYY-MM-DD'."""
 
-        url = f"{self.garmin_connect_heartrates_daily_url}/{self.display_name}"
-        params = {"date": str(cdate)}
-        logger.debug("Requesting heart rates")
-
-        return self.connectapi(url, params=params)
+        call = self._heart_rates_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_stats_and_body(self, cdate):
         """Return activity data and body composition (compat for garminconnect)."""
@@ -256,6 +512,39 @@ class Garmin:
             **self.get_body_composition(cdate)["totalAverage"],
         }
 
+    def get_daily_snapshot(
+        self, cdate: str, include=None, max_workers: int = 8
+    ) -> DailySnapshot:
+        """
+        Fetch the 'include'd fields (names of SNAPSHOT_PARTS, default all)
+        of 'cdate' format 'YYYY-MM-DD' concurrently into a DailySnapshot.
+        Failed requests leave their field None and are kept in 'errors'.
+        """
+
+        include = tuple(self.SNAPSHOT_PARTS if include is None else include)
+        unknown = set(include) - set(self.SNAPSHOT_PARTS)
+        if unknown:
+            raise ValueError(
+                f"include must be in {tuple(self.SNAPSHOT_PARTS)!r}, "
+                f"got {sorted(unknown)!r}"
+            )
+
+        cdate = str(cdate)
+        snapshot = DailySnapshot(cdate)
+        logger.debug(f"Requesting {len(include)} daily metrics for {cdate}")
+        calls = (
+            (part, getattr(self, self.SNAPSHOT_PARTS[part]), (cdate,))
+            for part in include
+        )
+        self.configure_pool(max_workers)
+        for part, result, error in fan_out(calls, max_workers):
+            if error is None:
+                setattr(snapshot, part, result)
+            else:
+                snapshot.errors[part] = error
+
+        return snapshot
+
     def get_body_composition(
         self, startdate: str, enddate=None
     ) -> Dict[str, Any]:
@@ -264,13 +553,8 @@ class Garmin:
         'YYYY-MM-DD' through enddate 'YYYY-MM-DD'.
         """
 
-        if enddate is None:
-            enddate = startdate
-        url = f"{self.garmin_connect_weight_url}/weight/dateRange"
-        params = {"startDate": str(startdate), "endDate": str(enddate)}
-        logger.debug("Requesting body composition")
-
-        return self.connectapi(url, params=params)
+        call = self._body_composition_call(startdate, enddate)
+        return self.connectapi(call.path, **call.kwargs)
 
     def add_body_composition(
         self,
@@ -288,33 +572,49 @@ class Garmin:
         visceral_fat_rating: Optional[float] = None,
         bmi: Optional[float] = None,
     ):
-        dt = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
-        fitEncoder = fit.FitEncoderWeight()
-        fitEncoder.write_file_info()
-        fitEncoder.write_file_creator()
-        fitEncoder.write_device_info(dt)
-        fitEncoder.write_weight_scale(
-            dt,
-            weight=weight,
-            percent_fat=percent_fat,
-            percent_hydration=percent_hydration,
-            visceral_fat_mass=visceral_fat_mass,
-            bone_mass=bone_mass,
-            muscle_mass=muscle_mass,
-            basal_met=basal_met,
-            active_met=active_met,
-            physique_rating=physique_rating,
-            metabolic_age=metabolic_age,
-            visceral_fat_rating=visceral_fat_rating,
-            bmi=bmi,
+        measurement = {
+            "timestamp": timestamp,
+            "weight": weight,
+            "percent_fat": percent_fat,
+            "percent_hydration": percent_hydration,
+            "visceral_fat_mass": visceral_fat_mass,
+            "bone_mass": bone_mass,
+            "muscle_mass": muscle_mass,
+            "basal_met": basal_met,
+            "active_met": active_met,
+            "physique_rating": physique_rating,
+            "metabolic_age": metabolic_age,
+            "visceral_fat_rating": visceral_fat_rating,
+            "bmi": bmi,
+        }
+
+        return self._upload(
+            "body_composition.fit", _encode_body_composition([measurement])
         )
-        fitEncoder.finish()
 
-        url = self.garmin_connect_upload
-        files = {
-            "file": ("body_composition.fit", fitEncoder.getvalue()),
-        }
-        return self.garth.post("connectapi", url, files=files, api=True)
+    def add_body_compositions(
+        self, measurements: List[Dict[str, Any]], batch_size: int = 500
+    ) -> List[Any]:
+        """
+        Add many weigh-ins, packing up to 'batch_size' of them into each
+        uploaded FIT file. Each measurement is a dict of the keyword
+        arguments of add_body_composition. Returns one response per upload.
+        """
+
+        measurements = sorted(
+            measurements, key=lambda m: m.get("timestamp") or ""
+        )
+        responses = []
+        for i in range(0, len(measurements), batch_size):
+            batch = measurements[i : i + batch_size]
+            logger.debug(f"Uploading {len(batch)} body compositions")
+            responses.append(
+                self._upload(
+                    "body_composition.fit", _encode_body_composition(batch)
+                )
+            )
+
+        return responses
 
     def add_weigh_in(
         self, weight: int, unitKey: str = "kg", timestamp: str = ""
@@ -398,13 +698,8 @@ class Garmin:
         'YYYY-MM-DD' through enddate 'YYYY-MM-DD'
         """
 
-        if enddate is None:
-            enddate = startdate
-        url = self.garmin_connect_daily_body_battery_url
-        params = {"startDate": str(startdate), "endDate": str(enddate)}
-        logger.debug("Requesting body battery data")
-
-        return self.connectapi(url, params=params)
+        call = self._body_battery_call(startdate, enddate)
+        return self.connectapi(call.path, **call.kwargs)
 
     def set_blood_pressure(
         self,
@@ -471,26 +766,110 @@ class Garmin:
     def get_respiration_data(self, cdate: str) -> Dict[str, Any]:
         """Return available respiration data 'cdate' format 'YYYY-MM-DD'."""
 
-        url = f"{self.garmin_connect_daily_respiration_url}/{cdate}"
-        logger.debug("Requesting respiration data")
-
-        return self.connectapi(url)
+        call = self._respiration_data_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_spo2_data(self, cdate: str) -> Dict[str, Any]:
         """Return available SpO2 data 'cdate' format 'YYYY-MM-DD'."""
 
-        url = f"{self.garmin_connect_daily_spo2_url}/{cdate}"
-        logger.debug("Requesting SpO2 data")
-
-        return self.connectapi(url)
+        call = self._spo2_data_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_all_day_stress(self, cdate: str) -> Dict[str, Any]:
         """Return available all day stress data 'cdate' format 'YYYY-MM-DD'."""
 
-        url = f"{self.garmin_all_day_stress_url}/{cdate}"
-        logger.debug("Requesting all day stress data")
+        call = self._all_day_stress_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url)
+    def fetch_range(
+        self,
+        metric: str,
+        start: Union[str, date],
+        end: Union[str, date],
+        max_workers: int = 4,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Fetch a per-day 'metric' (e.g. "get_sleep_data") for every day from
+        'start' through 'end' format 'YYYY-MM-DD', running up to
+        'max_workers' requests concurrently over the shared garth session.
+        Yields ('YYYY-MM-DD', result) tuples in date order as they complete.
+        """
+
+        if metric not in self.RANGE_METRICS:
+            raise ValueError(
+                f"metric must be one of {self.RANGE_METRICS!r}, got {metric!r}"
+            )
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        first, last = _to_date(start), _to_date(end)
+
+        self.configure_pool(max_workers)
+        logger.debug(f"Requesting {metric} from {first} to {last}")
+
+        # Validate above before the first next(), not on it
+        return self._iter_range(
+            getattr(self, metric), _date_range(first, last), max_workers
+        )
+
+    def _iter_range(
+        self, getter, days: Iterator[date], max_workers: int
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yield (cdate, getter(cdate)) for 'days', keeping a window busy."""
+
+        # Keep a bounded window in flight so long ranges don't queue
+        # thousands of futures or hold their results in memory
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            try:
+                for day in days:
+                    cdate = day.isoformat()
+                    pending.append((cdate, executor.submit(getter, cdate)))
+                    if len(pending) >= max_workers * 2:
+                        cdate, future = pending.popleft()
+                        yield cdate, future.result()
+                while pending:
+                    cdate, future = pending.popleft()
+                    yield cdate, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def get_range(
+        self,
+        getter: str,
+        startdate: Union[str, date],
+        enddate: Union[str, date],
+        max_workers: int = 4,
+        max_days: Optional[int] = None,
+    ) -> Any:
+        """
+        Fetch a range endpoint (e.g. "get_daily_steps", see
+        planner.RANGE_ENDPOINTS) for any span from 'startdate' through
+        'enddate' format 'YYYY-MM-DD'. The span is split into the fewest
+        windows the server accepts ('max_days' overrides the known limit),
+        or into windows on a fixed grid of the endpoint's aggregation
+        buckets, which are requested in parallel and stitched back in date
+        order.
+        """
+
+        if getter not in planner.RANGE_ENDPOINTS:
+            raise ValueError(
+                f"getter must be one of {tuple(planner.RANGE_ENDPOINTS)!r}, "
+                f"got {getter!r}"
+            )
+        endpoint = planner.RANGE_ENDPOINTS[getter]
+        if max_days is not None:
+            endpoint = replace(endpoint, max_days=max_days)
+
+        self.configure_pool(max_workers)
+        return planner.fetch(
+            getattr(self, getter),
+            endpoint,
+            startdate,
+            enddate,
+            max_workers,
+            endpoint.align,
+        )
 
     def get_personal_record(self) -> Dict[str, Any]:
         """Return personal records for current user."""
@@ -557,58 +936,65 @@ class Garmin:
 
         return self.connectapi(url, params=params)
 
-    def get_sleep_data(self, cdate: str) -> Dict[str, Any]:
-        """Return sleep data for current user."""
+    def get_sleep_data(
+        self, cdate: str, typed: bool = False
+    ) -> Union[Dict[str, Any], SleepSummary, None]:
+        """
+        Return sleep data for current user, or only its dailySleepDTO as
+        a garminconnect.models.SleepSummary with 'typed'.
+        """
 
-        url = f"{self.garmin_connect_daily_sleep_url}/{self.display_name}"
-        params = {"date": str(cdate), "nonSleepBufferMinutes": 60}
-        logger.debug("Requesting sleep data")
+        call = self._sleep_data_call(cdate)
+        response = self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url, params=params)
+        return self._sleep_data_result(response, typed)
 
     def get_stress_data(self, cdate: str) -> Dict[str, Any]:
         """Return stress data for current user."""
 
-        url = f"{self.garmin_connect_daily_stress_url}/{cdate}"
-        logger.debug("Requesting stress data")
-
-        return self.connectapi(url)
+        call = self._stress_data_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_rhr_day(self, cdate: str) -> Dict[str, Any]:
         """Return resting heartrate data for current user."""
 
-        url = f"{self.garmin_connect_rhr_url}/{self.display_name}"
-        params = {
-            "fromDate": str(cdate),
-            "untilDate": str(cdate),
-            "metricId": 60,
-        }
-        logger.debug("Requesting resting heartrate data")
+        call = self._rhr_day_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url, params=params)
-
-    def get_hrv_data(self, cdate: str) -> Dict[str, Any]:
-        """Return Heart Rate Variability (hrv) data for current user."""
+    def get_hrv_data(
+        self, cdate: str, typed: bool = False
+    ) -> Union[Dict[str, Any], HrvSummary, None]:
+        """
+        Return Heart Rate Variability (hrv) data for current user, or only
+        its hrvSummary as a garminconnect.models.HrvSummary with 'typed'.
+        """
 
-        url = f"{self.garmin_connect_hrv_url}/{cdate}"
-        logger.debug("Requesting Heart Rate Variability (hrv) data")
+        call = self._hrv_data_call(cdate)
+        response = self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url)
+        return self._hrv_data_result(response, typed)
 
     def get_training_readiness(self, cdate: str) -> Dict[str, Any]:
         """Return training readiness data for current user."""
 
-        url = f"{self.garmin_connect_training_readiness_url}/{cdate}"
-        logger.debug("Requesting training readiness data")
+        call = self._training_readiness_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url)
-
-    def get_endurance_score(self, startdate: str, enddate=None):
+    def get_endurance_score(
+        self,
+        startdate: str,
+        enddate=None,
+        resolution: Optional[str] = None,
+        max_workers: int = 4,
+    ):
         """
         Return endurance score by day for 'startdate' format 'YYYY-MM-DD'
         through enddate 'YYYY-MM-DD'.
         Using a single day returns the precise values for that day.
         Using a range returns the aggregated weekly values for that week.
+        Pass 'resolution' "day", "week" or "month" to pick the server
+        aggregation instead; long ranges are then fetched in parallel
+        windows aligned to that aggregation and stitched together.
         """
 
         if enddate is None:
@@ -617,18 +1003,70 @@ class Garmin:
             logger.debug("Requesting endurance score data for a single day")
 
             return self.connectapi(url, params=params)
+        elif resolution is None:
+            return self._endurance_score_stats(startdate, enddate, "weekly")
         else:
-            url = f"{self.garmin_connect_endurance_score_url}/stats"
-            params = {
-                "startDate": str(startdate),
-                "endDate": str(enddate),
-                "aggregation": "weekly",
-            }
-            logger.debug("Requesting endurance score data for a range of days")
+            return self._fetch_resolution(
+                "get_endurance_score",
+                self._endurance_score_stats,
+                startdate,
+                enddate,
+                resolution,
+                max_workers,
+            )
 
-            return self.connectapi(url, params=params)
+    def _endurance_score_stats(self, startdate, enddate, aggregation):
+        url = f"{self.garmin_connect_endurance_score_url}/stats"
+        params = {
+            "startDate": str(startdate),
+            "endDate": str(enddate),
+            "aggregation": aggregation,
+        }
+        logger.debug("Requesting endurance score data for a range of days")
+
+        return self.connectapi(url, params=params)
 
-    def get_race_predictions(self, startdate=None, enddate=None, _type=None):
+    def _fetch_resolution(
+        self, getter, fetch, startdate, enddate, resolution, max_workers
+    ):
+        """
+        Fetch 'startdate' through 'enddate' with 'fetch(start, end,
+        aggregation)' using the coarsest server aggregation that satisfies
+        'resolution', in windows on a fixed grid of its buckets (see
+        planner.plan). Whole windows of past dates repeat between
+        overlapping queries, so a configured cache serves them.
+        """
+
+        bucket, aggregation = planner.aggregation(getter, resolution)
+        if getter == "get_race_predictions":
+            endpoint = planner.RACE_PREDICTIONS
+        else:
+            endpoint = planner.RANGE_ENDPOINTS[getter]
+        logger.debug(f"Using {aggregation} {getter} for {resolution} points")
+
+        def fetch_window(start, end):
+            # Windows are fetched on worker threads, through private helpers
+            with record_as(getter):
+                return fetch(start, end, aggregation)
+
+        self.configure_pool(max_workers)
+        return planner.fetch(
+            fetch_window,
+            endpoint,
+            startdate,
+            enddate,
+            max_workers,
+            bucket,
+        )
+
+    def get_race_predictions(
+        self,
+        startdate=None,
+        enddate=None,
+        _type=None,
+        resolution: Optional[str] = None,
+        max_workers: int = 4,
+    ):
         """
         Return race predictions for the 5k, 10k, half marathon and marathon.
         Accepts either 0 parameters or all three:
@@ -641,12 +1079,31 @@ class Garmin:
         'enddate' the date of the last race predictions
         '_type' either 'daily' (the predictions for each day in the range) or
         'monthly' (the aggregated monthly prediction for each month in the range)
+        'resolution' instead of '_type': "day", "week" or "month" picks the
+        coarsest type that satisfies it, and ranges longer than a year are
+        fetched in parallel yearly windows and stitched together
         """
 
         valid = {"daily", "monthly", None}
         if _type not in valid:
             raise ValueError("results: _type must be one of %r." % valid)
 
+        if resolution is not None:
+            if _type is not None or startdate is None or enddate is None:
+                raise ValueError(
+                    "resolution requires startdate and enddate without _type"
+                )
+            return self._fetch_resolution(
+                "get_race_predictions",
+                lambda start, end, _type: self.get_race_predictions(
+                    start, end, _type
+                ),
+                startdate,
+                enddate,
+                resolution,
+                max_workers,
+            )
+
         if _type is None and startdate is None and enddate is None:
             url = (
                 self.garmin_connect_race_predictor_url
@@ -675,15 +1132,21 @@ class Garmin:
     def get_training_status(self, cdate: str) -> Dict[str, Any]:
         """Return training status data for current user."""
 
-        url = f"{self.garmin_connect_training_status_url}/{cdate}"
-        logger.debug("Requesting training status data")
+        call = self._training_status_call(cdate)
+        return self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url)
-
-    def get_hill_score(self, startdate: str, enddate=None):
+    def get_hill_score(
+        self,
+        startdate: str,
+        enddate=None,
+        resolution: Optional[str] = None,
+        max_workers: int = 4,
+    ):
         """
         Return hill score by day from 'startdate' format 'YYYY-MM-DD'
-        to enddate 'YYYY-MM-DD'
+        to enddate 'YYYY-MM-DD'. Pass 'resolution' "day", "week" or
+        "month" to pick the server aggregation; long ranges are then
+        fetched in parallel windows aligned to it and stitched together.
         """
 
         if enddate is None:
@@ -693,24 +1156,34 @@ class Garmin:
 
             return self.connectapi(url, params=params)
 
+        elif resolution is None:
+            return self._hill_score_stats(startdate, enddate, "daily")
         else:
-            url = f"{self.garmin_connect_hill_score_url}/stats"
-            params = {
-                "startDate": str(startdate),
-                "endDate": str(enddate),
-                "aggregation": "daily",
-            }
-            logger.debug("Requesting hill score data for a range of days")
+            return self._fetch_resolution(
+                "get_hill_score",
+                self._hill_score_stats,
+                startdate,
+                enddate,
+                resolution,
+                max_workers,
+            )
 
-            return self.connectapi(url, params=params)
+    def _hill_score_stats(self, startdate, enddate, aggregation):
+        url = f"{self.garmin_connect_hill_score_url}/stats"
+        params = {
+            "startDate": str(startdate),
+            "endDate": str(enddate),
+            "aggregation": aggregation,
+        }
+        logger.debug("Requesting hill score data for a range of days")
+
+        return self.connectapi(url, params=params)
 
     def get_devices(self) -> Dict[str, Any]:
         """Return available devices for the current user account."""
 
-        url = self.garmin_connect_devices_url
-        logger.debug("Requesting devices")
-
-        return self.connectapi(url)
+        call = self._devices_call()
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_device_settings(self, device_id: str) -> Dict[str, Any]:
         """Return device settings for device with 'device_id'."""
@@ -742,14 +1215,16 @@ class Garmin:
 
         return self.connectapi(url)
 
-    def get_activities(self, start, limit):
-        """Return available activities."""
+    def get_activities(self, start, limit, typed: bool = False):
+        """
+        Return available activities, as garminconnect.models
+        ActivitySummary instances with 'typed'.
+        """
 
-        url = self.garmin_connect_activities
-        params = {"start": str(start), "limit": str(limit)}
-        logger.debug("Requesting activities")
+        call = self._activities_call(start, limit)
+        activities = self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url, params=params)
+        return ActivitySummary.from_list(activities) if typed else activities
 
     def get_activities_fordate(self, fordate: str):
         """Return available activities for date."""
@@ -776,6 +1251,16 @@ class Garmin:
 
         return None
 
+    def _upload(self, file_name: str, data: bytes):
+        def request(path, **kwargs):
+            return self.garth.post("connectapi", path, api=True, **kwargs)
+
+        return self._send(
+            request,
+            self.garmin_connect_upload,
+            files={"file": (file_name, data)},
+        )
+
     def upload_activity(self, activity_path: str):
         """Upload activity in fit format from file."""
         # This code is borrowed from python-garminconnect-enhanced ;-)
@@ -787,17 +1272,40 @@ class Garmin:
         )
 
         if allowed_file_extension:
-            files = {
-                "file": (file_base_name, open(activity_path, "rb" or "r")),
-            }
-            url = self.garmin_connect_upload
-            return self.garth.post("connectapi", url, files=files, api=True)
+            with open(activity_path, "rb") as f:
+                data = f.read()
+            return self._upload(file_base_name, data)
         else:
             raise GarminConnectInvalidFileFormatError(
                 f"Could not upload {activity_path}"
             )
 
-    def get_activities_by_date(self, startdate, enddate, activitytype=None):
+    def upload_activities(
+        self, activity_paths, max_workers: int = 4, retries: int = 2
+    ) -> List["upload.UploadResult"]:
+        """
+        Upload many activity files concurrently, retrying uploads that fail
+        with a server or connection error up to 'retries' times (429s are
+        retried per request, up to max_retries). Returns one UploadResult
+        per path, in order.
+        """
+
+        self.configure_pool(max_workers)
+        return list(
+            upload.upload_files(
+                self.upload_activity, activity_paths, max_workers, retries
+            )
+        )
+
+    def get_activities_by_date(
+        self,
+        startdate,
+        enddate,
+        activitytype=None,
+        page_size: int = 20,
+        prefetch: int = 4,
+        typed: bool = False,
+    ):
         """
         Fetch available activities between specific dates
         :param startdate: String in the format YYYY-MM-DD
@@ -805,39 +1313,106 @@ class Garmin:
         :param activitytype: (Optional) Type of activity you are searching
                              Possible values are [cycling, running, swimming,
                              multi_sport, fitness_equipment, hiking, walking, other]
+        :param page_size: Number of activities requested per page
+        :param prefetch: Most pages requested concurrently, reached once
+                         full pages show the listing is long
+        :param typed: Return garminconnect.models.ActivitySummary instances
         :return: list of JSON activities
         """
 
-        activities = []
-        start = 0
-        limit = 20
-        # mimicking the behavior of the web interface that fetches
-        # 20 activities at a time
-        # and automatically loads more on scroll
-        url = self.garmin_connect_activities
-        params = {
-            "startDate": str(startdate),
-            "endDate": str(enddate),
-            "start": str(start),
-            "limit": str(limit),
-        }
-        if activitytype:
-            params["activityType"] = str(activitytype)
+        return list(
+            self.iter_activities_by_date(
+                startdate, enddate, activitytype, page_size, prefetch, typed
+            )
+        )
+
+    def iter_activities_by_date(
+        self,
+        startdate,
+        enddate,
+        activitytype=None,
+        page_size: int = 20,
+        prefetch: int = 4,
+        typed: bool = False,
+    ) -> Iterator[Union[Dict[str, Any], ActivitySummary]]:
+        """
+        Yield activities between 'startdate' and 'enddate' format
+        'YYYY-MM-DD' as their pages arrive, keeping up to 'prefetch' pages
+        of 'page_size' activities in flight once full pages arrive.
+        """
 
         logger.debug(
             f"Requesting activities by date from {startdate} to {enddate}"
         )
-        while True:
-            params["start"] = str(start)
+
+        return self.iter_activities(
+            startdate, enddate, activitytype, page_size, prefetch, typed=typed
+        )
+
+    def iter_activities(
+        self,
+        startdate=None,
+        enddate=None,
+        activitytype=None,
+        page_size: int = 20,
+        prefetch: int = 1,
+        cursor: Optional[Cursor] = None,
+        typed: bool = False,
+    ) -> Iterator[Union[Dict[str, Any], ActivitySummary]]:
+        """
+        Stream activities, newest first, page by page.
+        :param startdate: (Optional) String in the format YYYY-MM-DD
+        :param enddate: (Optional) String in the format YYYY-MM-DD
+        :param activitytype: (Optional) Type of activity you are searching
+        :param page_size: Number of activities requested per page
+        :param prefetch: Most pages requested concurrently, reached once
+                         full pages show the listing is long
+        :param cursor: (Optional) Cursor to resume from, updated in place
+                       with the offset and activityId of each yielded activity
+        :param typed: Yield garminconnect.models.ActivitySummary instances
+        :return: generator of JSON activities
+        """
+
+        # the web interface fetches 20 activities at a time and
+        # automatically loads more on scroll
+        url = self.garmin_connect_activities
+        params = self._activity_search_params(startdate, enddate, activitytype)
+        # Pages are fetched on worker threads, away from the getter
+        name = entry_name(self, "iter_activities")
+
+        def fetch_page(start, limit):
             logger.debug(f"Requesting activities {start} to {start+limit}")
-            act = self.connectapi(url, params=params)
-            if act:
-                activities.extend(act)
-                start = start + limit
-            else:
-                break
+            with record_as(name):
+                return self.connectapi(
+                    url,
+                    params={
+                        **params,
+                        "start": str(start),
+                        "limit": str(limit),
+                    },
+                )
 
-        return activities
+        self.configure_pool(prefetch)
+        activities = iter_items(
+            fetch_page,
+            cursor if cursor is not None else Cursor(),
+            "activityId",
+            page_size,
+            prefetch,
+        )
+
+        if not typed:
+            return activities
+
+        # A generator, so closing it early also closes the pages
+        def summaries():
+            try:
+                for activity in activities:
+                    yield ActivitySummary.from_dict(activity)
+            finally:
+                activities.close()
+
+        return summaries()
 
     def get_progress_summary_between_dates(
         self, startdate, enddate, metric="distance"
@@ -882,29 +1457,47 @@ class Garmin:
         :return: list of goals in JSON format
         """
 
-        goals = []
+        return list(self.iter_goals(status, cursor=Cursor(start), limit=limit))
+
+    def iter_goals(
+        self,
+        status="active",
+        limit: int = 30,
+        cursor: Optional[Cursor] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream goals based on status page by page
+        :param status: Status of goals (valid options are "active", "future", or "past")
+        :param limit: Pagination limit when retrieving goals
+        :param cursor: (Optional) Cursor to resume from, updated in place;
+                       goal indexes start at 1
+        :return: generator of goals in JSON format
+        """
+
         url = self.garmin_connect_goals_url
-        params = {
-            "status": status,
-            "start": str(start),
-            "limit": str(limit),
-            "sortOrder": "asc",
-        }
+        name = entry_name(self, "iter_goals")
 
-        logger.debug(f"Requesting {status} goals")
-        while True:
-            params["start"] = str(start)
+        def fetch_page(start, limit):
             logger.debug(
                 f"Requesting {status} goals {start} to {start + limit - 1}"
             )
-            goals_json = self.connectapi(url, params=params)
-            if goals_json:
-                goals.extend(goals_json)
-                start = start + limit
-            else:
-                break
+            params = {
+                "status": status,
+                "start": str(start),
+                "limit": str(limit),
+                "sortOrder": "asc",
+            }
+            with record_as(name):
+                return self.connectapi(url, params=params)
 
-        return goals
+        logger.debug(f"Requesting {status} goals")
+
+        return iter_items(
+            fetch_page,
+            cursor if cursor is not None else Cursor(1),
+            "id",
+            limit,
+        )
 
     def get_gear(self, userProfileNumber):
         """Return all user gear."""
@@ -935,52 +1528,118 @@ class Garmin:
         )
         return self.garth.request(method_override, "connectapi", url, api=True)
 
-    class ActivityDownloadFormat(Enum):
-        """Activity variables."""
-
-        ORIGINAL = auto()
-        TCX = auto()
-        GPX = auto()
-        KML = auto()
-        CSV = auto()
-
     class ActivityUploadFormat(Enum):
         FIT = auto()
         GPX = auto()
         TCX = auto()
 
     def download_activity(
-        self, activity_id, dl_fmt=ActivityDownloadFormat.TCX
+        self, activity_id, dl_fmt=ConnectEndpoints.ActivityDownloadFormat.TCX
     ):
         """
         Downloads activity in requested format and returns the raw bytes. For
         "Original" will return the zip file content, up to user to extract it.
         "CSV" will return a csv of the splits.
         """
-        activity_id = str(activity_id)
-        urls = {
-            Garmin.ActivityDownloadFormat.ORIGINAL: f"{self.garmin_connect_fit_download}/{activity_id}",  # noqa
-            Garmin.ActivityDownloadFormat.TCX: f"{self.garmin_connect_tcx_download}/{activity_id}",  # noqa
-            Garmin.ActivityDownloadFormat.GPX: f"{self.garmin_connect_gpx_download}/{activity_id}",  # noqa
-            Garmin.ActivityDownloadFormat.KML: f"{self.garmin_connect_kml_download}/{activity_id}",  # noqa
-            Garmin.ActivityDownloadFormat.CSV: f"{self.garmin_connect_csv_download}/{activity_id}",  # noqa
-        }
-        if dl_fmt not in urls:
-            raise ValueError(f"Unexpected value {dl_fmt} for dl_fmt")
-        url = urls[dl_fmt]
+        url = self._activity_download_url(activity_id, dl_fmt)
 
         logger.debug("Downloading activities from %s", url)
 
         return self.download(url)
 
+    def download_activity_to(
+        self,
+        activity_id,
+        path: str,
+        dl_fmt=ConnectEndpoints.ActivityDownloadFormat.TCX,
+    ) -> int:
+        """
+        Stream activity in requested format into the file 'path' without
+        buffering it in memory. The file only appears once complete.
+        Returns the number of bytes written.
+        """
+        url = self._activity_download_url(activity_id, dl_fmt)
+
+        logger.debug("Streaming activity from %s to %s", url, path)
+
+        return export.stream_to_file(self.stream(url), path)
+
+    def iter_activity_files(
+        self, activity_id, extensions=archive.ACTIVITY_EXTENSIONS
+    ) -> Iterator["archive.ArchiveMember"]:
+        """
+        Download the ORIGINAL zip of an activity and yield its FIT/TCX/GPX
+        members as archive.ArchiveMember, whose read() returns a
+        memoryview into the downloaded bytes for stored members.
+        """
+
+        data = self.download_activity(
+            activity_id, self.ActivityDownloadFormat.ORIGINAL
+        )
+
+        return archive.iter_members(data, extensions)
+
+    def extract_activity(
+        self,
+        activity_id,
+        directory: str,
+        extensions=archive.ACTIVITY_EXTENSIONS,
+    ) -> List[str]:
+        """
+        Download the ORIGINAL zip of an activity and write its members into
+        'directory' straight from the downloaded buffer, without a
+        temporary zip file. Returns the paths written.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for member in self.iter_activity_files(activity_id, extensions):
+            path = os.path.join(directory, os.path.basename(member.name))
+            archive.extract_member(member, path)
+            paths.append(path)
+
+        return paths
+
+    def export_activities(
+        self,
+        directory: str,
+        activity_ids=None,
+        startdate=None,
+        enddate=None,
+        dl_fmt=ConnectEndpoints.ActivityDownloadFormat.ORIGINAL,
+        max_workers: int = 4,
+    ) -> List["export.ExportResult"]:
+        """
+        Download many activities into 'directory', either the given
+        'activity_ids' or all activities between 'startdate' and 'enddate'
+        format 'YYYY-MM-DD'. Files already recorded in the directory's
+        manifest are skipped, so an interrupted export can be rerun.
+        """
+
+        if activity_ids is None:
+            if startdate is None or enddate is None:
+                raise ValueError(
+                    "Provide either activity_ids or startdate and enddate"
+                )
+            activity_ids = (
+                activity["activityId"]
+                for activity in self.iter_activities_by_date(
+                    startdate, enddate
+                )
+            )
+
+        self.configure_pool(max_workers)
+        exporter = export.ActivityExporter(
+            self, directory, dl_fmt, max_workers
+        )
+
+        return list(exporter.export(activity_ids))
+
     def get_activity_splits(self, activity_id):
         """Return activity splits."""
 
-        activity_id = str(activity_id)
-        url = f"{self.garmin_connect_activity}/{activity_id}/splits"
-        logger.debug("Requesting splits for activity id %s", activity_id)
-
-        return self.connectapi(url)
+        call = self._activity_part_call(activity_id, "splits")
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_activity_split_summaries(self, activity_id):
         """Return activity split summaries."""
@@ -996,11 +1655,8 @@ class Garmin:
     def get_activity_weather(self, activity_id):
         """Return activity weather."""
 
-        activity_id = str(activity_id)
-        url = f"{self.garmin_connect_activity}/{activity_id}/weather"
-        logger.debug("Requesting weather for activity id %s", activity_id)
-
-        return self.connectapi(url)
+        call = self._activity_part_call(activity_id, "weather")
+        return self.connectapi(call.path, **call.kwargs)
 
     def get_activity_hr_in_timezones(self, activity_id):
         """Return activity heartrate in timezones."""
@@ -1027,15 +1683,37 @@ class Garmin:
     def get_activity_details(self, activity_id, maxchart=2000, maxpoly=4000):
         """Return activity details."""
 
-        activity_id = str(activity_id)
-        params = {
-            "maxChartSize": str(maxchart),
-            "maxPolylineSize": str(maxpoly),
-        }
-        url = f"{self.garmin_connect_activity}/{activity_id}/details"
-        logger.debug("Requesting details for activity id %s", activity_id)
+        call = self._activity_details_call(activity_id, maxchart, maxpoly)
+        return self.connectapi(call.path, **call.kwargs)
 
-        return self.connectapi(url, params=params)
+    def iter_activity_details(
+        self, activity_id, maxchart=2000, maxpoly=4000, chunk_size=64 * 1024
+    ):
+        """
+        Stream activity details, yielding ("descriptors", list),
+        ("sample", metrics), ("polyline", point) and ("field", (key, value))
+        events while the response body is parsed chunk by chunk, so memory
+        stays flat at any 'maxchart' or 'maxpoly' resolution.
+        """
+
+        call = self._activity_details_call(activity_id, maxchart, maxpoly)
+        response = self.stream(call.path, **call.kwargs)
+        try:
+            yield from iter_details(response.iter_content(chunk_size))
+        finally:
+            response.close()
+
+    def get_activity_metrics(
+        self, activity_id, maxchart=2000, maxpoly=4000, keys=None
+    ):
+        """
+        Return activity detail metrics decoded into one float64 column per
+        metric key, e.g. "directHeartRate", with NaN for missing samples.
+        """
+
+        return decode_details(
+            self.get_activity_details(activity_id, maxchart, maxpoly), keys
+        )
 
     def get_activity_exercise_sets(self, activity_id):
         """Return activity exercise sets."""
@@ -1060,13 +1738,54 @@ class Garmin:
 
         return self.connectapi(url, params=params)
 
+    def get_activity_bundle(
+        self, activity_ids, parts=None, max_workers: int = 8
+    ) -> List[ActivityBundle]:
+        """
+        Fetch the 'parts' (names of ACTIVITY_PARTS, default all) of every
+        activity in 'activity_ids' concurrently, sharing this instance's
+        rate limiter. Returns one ActivityBundle per activity in input
+        order, with the error of each part that failed in its 'errors'.
+        """
+
+        parts = tuple(self.ACTIVITY_PARTS if parts is None else parts)
+        unknown = set(parts) - set(self.ACTIVITY_PARTS)
+        if unknown:
+            raise ValueError(
+                f"parts must be in {tuple(self.ACTIVITY_PARTS)!r}, "
+                f"got {sorted(unknown)!r}"
+            )
+
+        bundles = {
+            str(activity_id): ActivityBundle(str(activity_id))
+            for activity_id in activity_ids
+        }
+        logger.debug(
+            f"Requesting {len(parts)} parts of {len(bundles)} activities"
+        )
+        calls = (
+            (
+                (activity_id, part),
+                getattr(self, self.ACTIVITY_PARTS[part]),
+                (activity_id,),
+            )
+            for activity_id in bundles
+            for part in parts
+        )
+        self.configure_pool(max_workers)
+        for (activity_id, part), result, error in fan_out(calls, max_workers):
+            if error is None:
+                bundles[activity_id].parts[part] = result
+            else:
+                bundles[activity_id].errors[part] = error
+
+        return list(bundles.values())
+
     def get_user_profile(self):
         """Get all users settings."""
 
-        url = self.garmin_connect_user_settings_url
-        logger.debug("Requesting user profile.")
-
-        return self.connectapi(url)
+        call = self._user_profile_call()
+        return self.connectapi(call.path, **call.kwargs)
 
     def logout(self):
         """Log user out of session."""
@@ -1090,3 +1809,13 @@ class GarminConnectAuthenticationError(Exception):
 
 class GarminConnectInvalidFileFormatError(Exception):
     """Raised when an invalid file format is passed to upload."""
+
+
+def __getattr__(name):
+    # Optional clients are imported on first use so their dependencies
+    # stay optional
+    if name == "AsyncGarmin":
+        from .aio import AsyncGarmin
+
+        return AsyncGarmin
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
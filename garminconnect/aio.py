@@ -0,0 +1,370 @@
+"""Asyncio client for Garmin Connect."""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from garth.http import USER_AGENT
+
+from . import (
+    Garmin,
+    GarminConnectAuthenticationError,
+    GarminConnectConnectionError,
+    GarminConnectTooManyRequestsError,
+    LoginState,
+)
+from .endpoints import Call, ConnectEndpoints
+from .instrumentation import CallRecord, caller_name
+from .models import ActivitySummary, HrvSummary, SleepSummary, UserSummary
+from .pagination import apaginate
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGarmin(ConnectEndpoints):
+    """
+    Asyncio counterpart of Garmin backed by a pooled httpx.AsyncClient.
+    Authentication and token storage are delegated to garth, so the token
+    directory written by Garmin.login(tokenstore) is shared as is. The
+    getters send the same requests as Garmin's, see ConnectEndpoints.
+    """
+
+    # Request methods that are transport rather than endpoints
+    TRANSPORT = frozenset({"request", "connectapi", "download"})
+
+    def __init__(
+        self,
+        email=None,
+        password=None,
+        is_cn=False,
+        max_connections: int = 20,
+        timeout: float = 10,
+        transport=None,
+    ):
+        """Create a new class instance."""
+        if httpx is None:
+            raise ImportError(
+                "AsyncGarmin requires httpx, install garminconnect[async]"
+            )
+
+        # The sync client owns the garth tokens
+        self.sync = Garmin(email, password, is_cn)
+        self.garth = self.sync.garth
+        self.instrumentation = self.sync.instrumentation
+        self.http = httpx.AsyncClient(
+            base_url=f"https://connectapi.{self.garth.domain}",
+            headers=USER_AGENT,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+        self._refresh_lock = asyncio.Lock()
+
+        self.display_name = None
+        self.full_name = None
+        self.unit_system = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the pooled connections."""
+
+        await self.http.aclose()
+
+    async def _authorization(self) -> str:
+        async with self._refresh_lock:
+            token = self.garth.oauth2_token
+            if token is None or token.expired:
+                # Locked in the sync client too, which may share the token
+                await asyncio.to_thread(self.sync.refresh_oauth2)
+            return str(self.garth.oauth2_token)
+
+    async def request(self, method: str, path: str, **kwargs):
+        endpoint = caller_name(self, self.TRANSPORT, method.lower())
+        record = CallRecord(endpoint, path, 0.0)
+        started = time.perf_counter()
+        try:
+            headers = {"Authorization": await self._authorization()}
+            response = await self.http.request(
+                method, path, headers=headers, **kwargs
+            )
+            record.status = response.status_code
+            record.size = len(response.content)
+
+            if response.status_code == 429:
+                raise GarminConnectTooManyRequestsError("Too many requests")
+            if response.status_code == 401:
+                raise GarminConnectAuthenticationError("Authentication error")
+            if response.is_error:
+                raise GarminConnectConnectionError(
+                    f"Error {response.status_code} requesting {path}"
+                )
+        except Exception as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.seconds = time.perf_counter() - started
+            self.instrumentation.record(record)
+
+        return response
+
+    async def connectapi(self, path, method="GET", **kwargs):
+        response = await self.request(method, path, **kwargs)
+        if response.status_code == 204:
+            return None
+
+        return response.json()
+
+    async def download(self, path, **kwargs):
+        response = await self.request("GET", path, **kwargs)
+
+        return response.content
+
+    async def _get(self, call: Call):
+        return await self.connectapi(call.path, **call.kwargs)
+
+    async def login(self, /, tokenstore: Optional[str] = None):
+        """Log in using the garth tokens stored in 'tokenstore'."""
+        tokenstore = tokenstore or os.getenv("GARMINTOKENS")
+
+        if tokenstore:
+            self.garth.load(tokenstore)
+        else:
+            await asyncio.to_thread(
+                self.garth.login, self.sync.username, self.sync.password
+            )
+
+        profile = await self.connectapi("/userprofile-service/socialProfile")
+        self.display_name = profile["displayName"]
+        self.full_name = profile["fullName"]
+
+        settings = await self._get(self._user_profile_call())
+        self.unit_system = settings["userData"]["measurementSystem"]
+        self.sync.login_state = LoginState(
+            self.display_name, self.full_name, self.unit_system
+        )
+
+        return True
+
+    def get_full_name(self):
+        """Return full name."""
+
+        return self.full_name
+
+    def get_unit_system(self):
+        """Return unit system."""
+
+        return self.unit_system
+
+    async def get_stats(self, cdate: str) -> Dict[str, Any]:
+        """Return user activity summary for 'cdate' format 'YYYY-MM-DD'."""
+
+        return await self.get_user_summary(cdate)
+
+    async def get_user_summary(
+        self, cdate: str, typed: bool = False
+    ) -> Union[Dict[str, Any], UserSummary]:
+        """
+        Return user activity summary for 'cdate' format 'YYYY-MM-DD', as
+        a garminconnect.models.UserSummary with 'typed'.
+        """
+
+        response = await self._get(self._user_summary_call(cdate))
+
+        return self._user_summary_result(response, typed)
+
+    async def get_steps_data(self, cdate):
+        """Fetch available steps data 'cDate' format 'YYYY-MM-DD'."""
+
+        return await self._get(self._steps_data_call(cdate))
+
+    async def get_heart_rates(self, cdate):
+        """Fetch available heart rates data 'cDate' format 'YYYY-MM-DD'."""
+
+        return await self._get(self._heart_rates_call(cdate))
+
+    async def get_body_composition(
+        self, startdate: str, enddate=None
+    ) -> Dict[str, Any]:
+        """
+        Return available body composition data for 'startdate' format
+        'YYYY-MM-DD' through enddate 'YYYY-MM-DD'.
+        """
+
+        return await self._get(self._body_composition_call(startdate, enddate))
+
+    async def get_body_battery(
+        self, startdate: str, enddate=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return body battery values by day for 'startdate' format
+        'YYYY-MM-DD' through enddate 'YYYY-MM-DD'
+        """
+
+        return await self._get(self._body_battery_call(startdate, enddate))
+
+    async def get_respiration_data(self, cdate: str) -> Dict[str, Any]:
+        """Return available respiration data 'cdate' format 'YYYY-MM-DD'."""
+
+        return await self._get(self._respiration_data_call(cdate))
+
+    async def get_spo2_data(self, cdate: str) -> Dict[str, Any]:
+        """Return available SpO2 data 'cdate' format 'YYYY-MM-DD'."""
+
+        return await self._get(self._spo2_data_call(cdate))
+
+    async def get_all_day_stress(self, cdate: str) -> Dict[str, Any]:
+        """Return available all day stress data 'cdate' format 'YYYY-MM-DD'."""
+
+        return await self._get(self._all_day_stress_call(cdate))
+
+    async def get_sleep_data(
+        self, cdate: str, typed: bool = False
+    ) -> Union[Dict[str, Any], SleepSummary, None]:
+        """
+        Return sleep data for current user, or only its dailySleepDTO as
+        a garminconnect.models.SleepSummary with 'typed'.
+        """
+
+        response = await self._get(self._sleep_data_call(cdate))
+
+        return self._sleep_data_result(response, typed)
+
+    async def get_stress_data(self, cdate: str) -> Dict[str, Any]:
+        """Return stress data for current user."""
+
+        return await self._get(self._stress_data_call(cdate))
+
+    async def get_rhr_day(self, cdate: str) -> Dict[str, Any]:
+        """Return resting heartrate data for current user."""
+
+        return await self._get(self._rhr_day_call(cdate))
+
+    async def get_hrv_data(
+        self, cdate: str, typed: bool = False
+    ) -> Union[Dict[str, Any], HrvSummary, None]:
+        """
+        Return Heart Rate Variability (hrv) data for current user, or only
+        its hrvSummary as a garminconnect.models.HrvSummary with 'typed'.
+        """
+
+        response = await self._get(self._hrv_data_call(cdate))
+
+        return self._hrv_data_result(response, typed)
+
+    async def get_training_readiness(self, cdate: str) -> Dict[str, Any]:
+        """Return training readiness data for current user."""
+
+        return await self._get(self._training_readiness_call(cdate))
+
+    async def get_training_status(self, cdate: str) -> Dict[str, Any]:
+        """Return training status data for current user."""
+
+        return await self._get(self._training_status_call(cdate))
+
+    async def get_devices(self) -> Dict[str, Any]:
+        """Return available devices for the current user account."""
+
+        return await self._get(self._devices_call())
+
+    async def get_activities(self, start, limit, typed: bool = False):
+        """
+        Return available activities, as garminconnect.models
+        ActivitySummary instances with 'typed'.
+        """
+
+        activities = await self._get(self._activities_call(start, limit))
+
+        return ActivitySummary.from_list(activities) if typed else activities
+
+    async def get_activities_by_date(
+        self,
+        startdate,
+        enddate,
+        activitytype=None,
+        page_size: int = 20,
+        typed: bool = False,
+    ):
+        """
+        Fetch available activities between specific dates
+        :param startdate: String in the format YYYY-MM-DD
+        :param enddate: String in the format YYYY-MM-DD
+        :param activitytype: (Optional) Type of activity you are searching
+        :param page_size: Number of activities requested per page
+        :param typed: Return garminconnect.models.ActivitySummary instances
+        :return: list of JSON activities
+        """
+
+        url = self.garmin_connect_activities
+        params = self._activity_search_params(startdate, enddate, activitytype)
+        logger.debug(
+            f"Requesting activities by date from {startdate} to {enddate}"
+        )
+
+        async def fetch_page(start, limit):
+            logger.debug(f"Requesting activities {start} to {start+limit}")
+            return await self.connectapi(
+                url,
+                params={**params, "start": str(start), "limit": str(limit)},
+            )
+
+        activities = []
+        async for page in apaginate(fetch_page, 0, page_size):
+            activities.extend(page)
+
+        return ActivitySummary.from_list(activities) if typed else activities
+
+    async def get_activity_splits(self, activity_id):
+        """Return activity splits."""
+
+        return await self._get(self._activity_part_call(activity_id, "splits"))
+
+    async def get_activity_weather(self, activity_id):
+        """Return activity weather."""
+
+        return await self._get(
+            self._activity_part_call(activity_id, "weather")
+        )
+
+    async def get_activity_details(
+        self, activity_id, maxchart=2000, maxpoly=4000
+    ):
+        """Return activity details."""
+
+        return await self._get(
+            self._activity_details_call(activity_id, maxchart, maxpoly)
+        )
+
+    async def download_activity(
+        self,
+        activity_id,
+        dl_fmt=ConnectEndpoints.ActivityDownloadFormat.TCX,
+    ):
+        """
+        Downloads activity in requested format and returns the raw bytes. For
+        "Original" will return the zip file content, up to user to extract it.
+        """
+        url = self._activity_download_url(activity_id, dl_fmt)
+
+        logger.debug("Downloading activities from %s", url)
+
+        return await self.download(url)
+
+    async def get_user_profile(self):
+        """Get all users settings."""
+
+        return await self._get(self._user_profile_call())
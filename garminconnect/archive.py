@@ -0,0 +1,181 @@
+"""In-memory extraction of ORIGINAL activity zip archives."""
+
+import io
+import logging
+import os
+import struct
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_EXTENSIONS = (".fit", ".tcx", ".gpx", ".kml")
+
+# Fixed part of a local file header, see the zip APPNOTE section 4.3.7
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+@dataclass
+class ArchiveMember:
+    """A file inside a zip buffer, 'data' being its raw (compressed) bytes."""
+
+    name: str
+    size: int
+    crc: int
+    compress_type: int
+    data: memoryview
+
+    @property
+    def stored(self) -> bool:
+        return self.compress_type == zipfile.ZIP_STORED
+
+    def read(self) -> memoryview:
+        """
+        Return the member's content. Stored members are a view into the
+        downloaded buffer; deflated ones are inflated once into new memory.
+        """
+
+        if self.stored:
+            content = self.data
+        elif self.compress_type == zipfile.ZIP_DEFLATED:
+            content = memoryview(zlib.decompress(self.data, -zlib.MAX_WBITS))
+        else:
+            raise zipfile.BadZipFile(
+                f"Unsupported compression {self.compress_type} for {self.name}"
+            )
+        self._check(zlib.crc32(content), len(content))
+
+        return content
+
+    def iter_chunks(self, chunk_size: int = 256 * 1024) -> Iterator[Buffer]:
+        """Yield the member's content in chunks without inflating it all."""
+
+        if self.stored:
+            chunks = (
+                self.data[i : i + chunk_size]
+                for i in range(0, len(self.data), chunk_size)
+            )
+        elif self.compress_type == zipfile.ZIP_DEFLATED:
+            chunks = _inflate(self.data, chunk_size)
+        else:
+            raise zipfile.BadZipFile(
+                f"Unsupported compression {self.compress_type} for {self.name}"
+            )
+
+        crc = size = 0
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            yield chunk
+        self._check(crc, size)
+
+    def _check(self, crc: int, size: int):
+        if crc != self.crc or size != self.size:
+            raise zipfile.BadZipFile(f"Bad CRC or size for {self.name}")
+
+
+class _BufferFile:
+    """Seekable read-only file over a memoryview for zipfile's directory."""
+
+    def __init__(self, view: memoryview):
+        self.view = view
+        self.pos = 0
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos}.get(
+            whence, len(self.view)
+        )
+        self.pos = base + offset
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self.view) if size < 0 else self.pos + size
+        data = bytes(self.view[self.pos : end])
+        self.pos += len(data)
+        return data
+
+
+def _inflate(data: memoryview, chunk_size: int) -> Iterator[bytes]:
+    inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+    for i in range(0, len(data), chunk_size):
+        chunk = inflater.decompress(data[i : i + chunk_size], chunk_size)
+        while chunk:
+            yield chunk
+            chunk = inflater.decompress(inflater.unconsumed_tail, chunk_size)
+    tail = inflater.flush()
+    if tail:
+        yield tail
+
+
+def iter_members(
+    buffer: Buffer, extensions: Optional[Iterable[str]] = ACTIVITY_EXTENSIONS
+) -> Iterator[ArchiveMember]:
+    """
+    Yield the members of the zip in 'buffer' whose names end with one of
+    'extensions' (all files when None), each referencing its bytes in
+    'buffer' through a memoryview rather than a copy.
+    """
+
+    view = memoryview(buffer)
+    if extensions is not None:
+        extensions = tuple(extension.lower() for extension in extensions)
+
+    # zipfile only reads the central directory here, the member data is
+    # sliced from the buffer below
+    with zipfile.ZipFile(_BufferFile(view)) as archive:
+        infos = archive.infolist()
+
+    for info in infos:
+        if info.is_dir():
+            continue
+        if extensions and not info.filename.lower().endswith(extensions):
+            continue
+        if info.flag_bits & 0x1:
+            raise zipfile.BadZipFile(f"{info.filename} is encrypted")
+
+        offset = info.header_offset
+        signature, name_length, extra_length = _LOCAL_HEADER.unpack_from(
+            view, offset
+        )
+        if signature != _LOCAL_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+        start = offset + _LOCAL_HEADER.size + name_length + extra_length
+
+        yield ArchiveMember(
+            info.filename,
+            info.file_size,
+            info.CRC,
+            info.compress_type,
+            view[start : start + info.compress_size],
+        )
+
+
+def extract_member(
+    member: ArchiveMember, path: str, chunk_size: int = 256 * 1024
+) -> int:
+    """
+    Write 'member' to 'path' chunk by chunk via a temporary file renamed
+    into place once complete. Returns the number of bytes written.
+    """
+
+    part = f"{path}.part"
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            for chunk in member.iter_chunks(chunk_size):
+                size += f.write(chunk)
+        os.replace(part, path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+
+    return size
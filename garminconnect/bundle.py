@@ -0,0 +1,97 @@
+"""Concurrent fan-out of independent getter calls into structured results."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+Call = Tuple[Hashable, Callable[..., Any], tuple]
+
+
+def fan_out(
+    calls: Iterable[Call], max_workers: int = 8
+) -> Iterator[Tuple[Hashable, Any, Exception]]:
+    """
+    Run every (key, function, args) call on a thread pool and yield
+    (key, result, None) or (key, None, error) as each one finishes. A
+    failing call never affects the others.
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(function, *args): key
+            for key, function, args in calls
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                yield key, future.result(), None
+            except Exception as e:
+                logger.debug(f"{key} failed: {e}")
+                yield key, None, e
+
+
+@dataclass
+class ActivityBundle:
+    """
+    The sub-resources of one activity by part name (e.g. "splits"), and the
+    exception of every part that could not be fetched.
+    """
+
+    activity_id: str
+    parts: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    def __getitem__(self, part: str) -> Any:
+        return self.parts[part]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class DailySnapshot:
+    """
+    One day of wellness data, one field per per-day endpoint. Fields left
+    out of 'include' or whose request failed are None; failures are kept
+    in 'errors' by field name.
+    """
+
+    cdate: str
+    stats: Optional[Dict[str, Any]] = None
+    body_composition: Optional[Dict[str, Any]] = None
+    heart_rates: Optional[Dict[str, Any]] = None
+    rhr: Optional[Dict[str, Any]] = None
+    sleep: Optional[Dict[str, Any]] = None
+    hrv: Optional[Dict[str, Any]] = None
+    stress: Optional[Dict[str, Any]] = None
+    body_battery: Optional[Any] = None
+    spo2: Optional[Dict[str, Any]] = None
+    respiration: Optional[Dict[str, Any]] = None
+    hydration: Optional[Dict[str, Any]] = None
+    steps: Optional[Any] = None
+    floors: Optional[Dict[str, Any]] = None
+    training_readiness: Optional[Any] = None
+    training_status: Optional[Dict[str, Any]] = None
+    max_metrics: Optional[Any] = None
+    blood_pressure: Optional[Dict[str, Any]] = None
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
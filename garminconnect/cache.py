@@ -0,0 +1,206 @@
+"""Persistent on-disk cache for Garmin Connect API responses."""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# TTL meaning "never expires", used for days that are over
+IMMUTABLE = float("inf")
+
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """
+    TTL rule for an endpoint family matched by a regex on the URL path.
+    'ttl' applies to undated requests and requests touching today or later,
+    'past_ttl' to requests whose dates all lie before today.
+    """
+
+    pattern: str
+    ttl: float
+    past_ttl: float = IMMUTABLE
+
+    def matches(self, path: str) -> bool:
+        return re.search(self.pattern, path) is not None
+
+
+DEFAULT_RULES = (
+    CacheRule(r"^/wellness-service/", ttl=300),
+    CacheRule(r"^/hrv-service/", ttl=300),
+    CacheRule(r"^/usersummary-service/", ttl=300),
+    CacheRule(r"^/userstats-service/", ttl=300),
+    CacheRule(r"^/metrics-service/", ttl=300),
+    CacheRule(r"^/weight-service/", ttl=300, past_ttl=86400),
+    CacheRule(r"^/bloodpressure-service/", ttl=300, past_ttl=86400),
+    CacheRule(r"^/userprofile-service/", ttl=600, past_ttl=600),
+    CacheRule(r"^/device-service/", ttl=600, past_ttl=600),
+    CacheRule(r"^/activity-service/activity/activityTypes", ttl=86400),
+)
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of JSON responses stored in a SQLite file.
+
+    Entries are keyed by namespace (the account), URL path and params. Any
+    object with the same get/set methods can be passed to Garmin(cache=...).
+    """
+
+    def __init__(
+        self,
+        path: str = "~/.garminconnect/cache.sqlite",
+        max_bytes: int = 256 * 1024 * 1024,
+        rules: Sequence[CacheRule] = DEFAULT_RULES,
+        today: Callable[[], date] = date.today,
+    ):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.rules = tuple(rules)
+        self.today = today
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed"
+            " ON responses (accessed)"
+        )
+        self._db.commit()
+        (self._size,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    @staticmethod
+    def key(namespace, path: str, params: Optional[Dict[str, Any]]) -> str:
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return json.dumps([namespace, path, items], separators=(",", ":"))
+
+    def ttl(self, path: str, params: Optional[Dict[str, Any]]) -> float:
+        """Return how long a response may be cached, 0 for not at all."""
+
+        for rule in self.rules:
+            if rule.matches(path):
+                break
+        else:
+            return 0
+
+        text = " ".join([path, *(str(v) for v in (params or {}).values())])
+        dates = DATE_PATTERN.findall(text)
+        if dates and max(dates) < self.today().isoformat():
+            return rule.past_ttl
+
+        return rule.ttl
+
+    def get(
+        self, namespace, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[bool, Any]:
+        """Return (True, response) on a fresh hit, else (False, None)."""
+
+        key = self.key(namespace, path, params)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return False, None
+            self._db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+            self.hits += 1
+
+        return True, json.loads(row[0])
+
+    def set(
+        self,
+        namespace,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        value: Any,
+    ):
+        """Store 'value' if the endpoint rules allow caching it."""
+
+        ttl = self.ttl(path, params)
+        if ttl <= 0:
+            return
+
+        key = self.key(namespace, path, params)
+        blob = json.dumps(value, separators=(",", ":")).encode()
+        if len(blob) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._size -= row[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now),
+            )
+            self._size += len(blob)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            key, size = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= size
+            self.evictions += 1
+            logger.debug("Evicted cached response %s", key)
+
+    def clear(self):
+        """Drop all cached responses."""
+
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+
+        with self._lock:
+            (entries,) = self._db.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,238 @@
+"""Columnar decoding of get_activity_details metric streams."""
+
+import codecs
+import json
+import logging
+import math
+import re
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - exercised without numpy
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+NAN = math.nan
+
+# Paths of the streamed response emitted as events, "*" is an array item
+STREAM_EVENTS = {
+    ("metricDescriptors",): "descriptors",
+    ("activityDetailMetrics", "*"): "sample",
+    ("geoPolylineDTO", "polyline", "*"): "polyline",
+}
+# Containers leading to those paths, which are walked instead of decoded
+STREAM_CONTAINERS = {
+    (),
+    ("activityDetailMetrics",),
+    ("geoPolylineDTO",),
+    ("geoPolylineDTO", "polyline"),
+}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def descriptor_keys(details: Dict[str, Any]) -> List[str]:
+    """Return the metric keys of 'details' ordered by their column index."""
+
+    keys = [None] * len(details.get("metricDescriptors") or ())
+    for descriptor in details.get("metricDescriptors") or ():
+        keys[descriptor["metricsIndex"]] = descriptor["key"]
+
+    return keys
+
+
+def _rows(details: Dict[str, Any], width: int) -> List[List[Any]]:
+    rows = [
+        sample["metrics"]
+        for sample in details.get("activityDetailMetrics") or ()
+    ]
+    # Samples are normally full width; pad the odd short one with nulls
+    if any(len(row) != width for row in rows):
+        rows = [(list(row) + [None] * width)[:width] for row in rows]
+
+    return rows
+
+
+def _column(values) -> array:
+    return array("d", [NAN if value is None else value for value in values])
+
+
+def decode_details(
+    details: Dict[str, Any],
+    keys: Optional[Iterable[str]] = None,
+    use_numpy: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Turn a get_activity_details response into one contiguous float64 column
+    per metric key (e.g. "directHeartRate", "directLatitude",
+    "directTimestamp"), with missing samples as NaN. Columns are NumPy
+    arrays when NumPy is installed (or 'use_numpy' is True) and
+    array('d') otherwise. Pass 'keys' to decode only some metrics.
+    """
+
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError("numpy is required for use_numpy=True")
+
+    all_keys = descriptor_keys(details)
+    wanted = all_keys if keys is None else list(keys)
+    missing = set(wanted) - set(all_keys)
+    if missing:
+        raise KeyError(f"Unknown metric keys: {sorted(missing)!r}")
+    indexes = [all_keys.index(key) for key in wanted]
+
+    rows = _rows(details, len(all_keys))
+    logger.debug(f"Decoding {len(rows)} samples of {len(wanted)} metrics")
+
+    if use_numpy:
+        # None becomes NaN when converting to a float dtype
+        matrix = numpy.array(rows, dtype=numpy.float64).reshape(
+            len(rows), len(all_keys)
+        )
+        return {
+            key: numpy.ascontiguousarray(matrix[:, index])
+            for key, index in zip(wanted, indexes)
+        }
+
+    columns = list(zip(*rows)) if rows else [()] * len(all_keys)
+
+    return {
+        key: _column(columns[index]) for key, index in zip(wanted, indexes)
+    }
+
+
+def decode_details_naive(
+    details: Dict[str, Any], keys: Optional[Iterable[str]] = None
+) -> Dict[str, List[float]]:
+    """Reference decoder walking every sample dict, used by benchmarks."""
+
+    all_keys = descriptor_keys(details)
+    wanted = all_keys if keys is None else list(keys)
+    indexes = {key: all_keys.index(key) for key in wanted}
+    columns = {key: [] for key in wanted}
+    for sample in details.get("activityDetailMetrics") or ():
+        metrics = sample["metrics"]
+        for key, index in indexes.items():
+            value = metrics[index] if index < len(metrics) else None
+            columns[key].append(NAN if value is None else float(value))
+
+    return columns
+
+
+class _Reader:
+    """Text buffer over byte chunks holding only the unparsed remainder."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 1) -> bool:
+        """Read until at least 'size' more characters are buffered."""
+
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        target = len(self.buffer) + size
+        while len(self.buffer) < target:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.buffer += self.decoder.decode(b"", final=True)
+                self.eof = True
+                break
+            self.buffer += self.decoder.decode(chunk)
+
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, "" at the end."""
+
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        char = self.peek()
+        if char not in expected:
+            raise ValueError(
+                f"Expected one of {expected!r} but got {char!r} in stream"
+            )
+        self.pos += 1
+
+        return char
+
+    def value(self) -> Any:
+        """Decode the complete JSON value at the current position."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Grow geometrically so a large value isn't rescanned
+                # once per chunk
+                if not self.fill(len(self.buffer) - self.pos + 1):
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next
+            # chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _walk(reader: _Reader, path: Tuple[str, ...]) -> Iterator[Tuple]:
+    event = STREAM_EVENTS.get(path)
+    if event is not None:
+        value = reader.value()
+        yield event, value["metrics"] if event == "sample" else value
+        return
+
+    char = reader.peek()
+    if path not in STREAM_CONTAINERS or char not in "{[":
+        yield "field", (".".join(path), reader.value())
+        return
+
+    closing = "}" if reader.take(char) == "{" else "]"
+    if reader.peek() == closing:
+        reader.take(closing)
+        return
+    while True:
+        if closing == "}":
+            key = reader.value()
+            reader.take(":")
+            yield from _walk(reader, path + (key,))
+        else:
+            yield from _walk(reader, path + ("*",))
+        if reader.take(f",{closing}") == closing:
+            return
+
+
+def iter_details(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a get_activity_details response body given as
+    byte chunks, yielding (event, value) tuples as they are read:
+    ("descriptors", metricDescriptors), ("sample", metrics list) per
+    activityDetailMetrics entry, ("polyline", point) per geoPolylineDTO
+    point and ("field", (dotted key, value)) for everything else. Only the
+    value being parsed is held in memory, never the whole response.
+    """
+
+    reader = _Reader(chunks)
+    if reader.peek() != "{":
+        raise ValueError("Activity details must be a JSON object")
+    yield from _walk(reader, ())
+    if reader.peek():
+        raise ValueError("Unexpected data after activity details")
@@ -0,0 +1,308 @@
+"""
+Connect API endpoints shared by the sync and asyncio clients: the URL
+table, the request each getter makes and how its response is checked.
+"""
+
+import logging
+from enum import Enum, auto
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+from .models import HrvSummary, SleepSummary, UserSummary
+
+logger = logging.getLogger(__name__)
+
+
+class Call(NamedTuple):
+    """A GET of the Connect API: its path and query parameters, if any."""
+
+    path: str
+    params: Optional[Dict[str, Any]] = None
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        return {} if self.params is None else {"params": self.params}
+
+
+class ConnectEndpoints:
+    """
+    Mixin of Garmin and AsyncGarmin building their requests, so both
+    clients send the same paths and parameters. Needs 'display_name'.
+    """
+
+    # Connect API endpoints, shared by every instance of either client
+    garmin_connect_user_settings_url = (
+        "/userprofile-service/userprofile/user-settings"
+    )
+    garmin_connect_devices_url = "/device-service/deviceregistration/devices"
+    garmin_connect_device_url = "/device-service/deviceservice"
+    garmin_connect_weight_url = "/weight-service"
+    garmin_connect_daily_summary_url = "/usersummary-service/usersummary/daily"
+    garmin_connect_metrics_url = "/metrics-service/metrics/maxmet/daily"
+    garmin_connect_daily_hydration_url = (
+        "/usersummary-service/usersummary/hydration/daily"
+    )
+    garmin_connect_daily_stats_steps_url = (
+        "/usersummary-service/stats/steps/daily"
+    )
+    garmin_connect_personal_record_url = (
+        "/personalrecord-service/personalrecord/prs"
+    )
+    garmin_connect_earned_badges_url = "/badge-service/badge/earned"
+    garmin_connect_adhoc_challenges_url = (
+        "/adhocchallenge-service/adHocChallenge/historical"
+    )
+    garmin_connect_badge_challenges_url = (
+        "/badgechallenge-service/badgeChallenge/completed"
+    )
+    garmin_connect_available_badge_challenges_url = (
+        "/badgechallenge-service/badgeChallenge/available"
+    )
+    garmin_connect_non_completed_badge_challenges_url = (
+        "/badgechallenge-service/badgeChallenge/non-completed"
+    )
+    garmin_connect_inprogress_virtual_challenges_url = (
+        "/badgechallenge-service/virtualChallenge/inProgress"
+    )
+    garmin_connect_daily_sleep_url = (
+        "/wellness-service/wellness/dailySleepData"
+    )
+    garmin_connect_daily_stress_url = "/wellness-service/wellness/dailyStress"
+    garmin_connect_hill_score_url = "/metrics-service/metrics/hillscore"
+    garmin_connect_daily_body_battery_url = (
+        "/wellness-service/wellness/bodyBattery/reports/daily"
+    )
+    garmin_connect_blood_pressure_endpoint = (
+        "/bloodpressure-service/bloodpressure/range"
+    )
+    garmin_connect_set_blood_pressure_endpoint = (
+        "/bloodpressure-service/bloodpressure"
+    )
+    garmin_connect_endurance_score_url = (
+        "/metrics-service/metrics/endurancescore"
+    )
+    garmin_connect_goals_url = "/goal-service/goal/goals"
+    garmin_connect_rhr_url = "/userstats-service/wellness/daily"
+    garmin_connect_hrv_url = "/hrv-service/hrv"
+    garmin_connect_training_readiness_url = (
+        "/metrics-service/metrics/trainingreadiness"
+    )
+    garmin_connect_race_predictor_url = (
+        "/metrics-service/metrics/racepredictions"
+    )
+    garmin_connect_training_status_url = (
+        "/metrics-service/metrics/trainingstatus/aggregated"
+    )
+    garmin_connect_user_summary_chart = (
+        "/wellness-service/wellness/dailySummaryChart"
+    )
+    garmin_connect_floors_chart_daily_url = (
+        "/wellness-service/wellness/floorsChartData/daily"
+    )
+    garmin_connect_heartrates_daily_url = (
+        "/wellness-service/wellness/dailyHeartRate"
+    )
+    garmin_connect_daily_respiration_url = (
+        "/wellness-service/wellness/daily/respiration"
+    )
+    garmin_connect_daily_spo2_url = "/wellness-service/wellness/daily/spo2"
+    garmin_all_day_stress_url = "/wellness-service/wellness/dailyStress"
+    garmin_connect_activities = (
+        "/activitylist-service/activities/search/activities"
+    )
+    garmin_connect_activity = "/activity-service/activity"
+    garmin_connect_activity_types = "/activity-service/activity/activityTypes"
+    garmin_connect_activity_fordate = "/mobile-gateway/heartRate/forDate"
+    garmin_connect_fitnessstats = "/fitnessstats-service/activity"
+    garmin_connect_fit_download = "/download-service/files/activity"
+    garmin_connect_tcx_download = "/download-service/export/tcx/activity"
+    garmin_connect_gpx_download = "/download-service/export/gpx/activity"
+    garmin_connect_kml_download = "/download-service/export/kml/activity"
+    garmin_connect_csv_download = "/download-service/export/csv/activity"
+    garmin_connect_upload = "/upload-service/upload"
+    garmin_connect_gear = "/gear-service/gear/filterGear"
+    garmin_connect_gear_baseurl = "/gear-service/gear/"
+
+    class ActivityDownloadFormat(Enum):
+        """Activity variables."""
+
+        ORIGINAL = auto()
+        TCX = auto()
+        GPX = auto()
+        KML = auto()
+        CSV = auto()
+
+    display_name: Optional[str]
+
+    def _user_summary_call(self, cdate: str) -> Call:
+        logger.debug("Requesting user summary")
+        return Call(
+            f"{self.garmin_connect_daily_summary_url}/{self.display_name}",
+            {"calendarDate": str(cdate)},
+        )
+
+    def _steps_data_call(self, cdate) -> Call:
+        logger.debug("Requesting steps data")
+        return Call(
+            f"{self.garmin_connect_user_summary_chart}/{self.display_name}",
+            {"date": str(cdate)},
+        )
+
+    def _heart_rates_call(self, cdate) -> Call:
+        logger.debug("Requesting heart rates")
+        return Call(
+            f"{self.garmin_connect_heartrates_daily_url}/{self.display_name}",
+            {"date": str(cdate)},
+        )
+
+    def _body_composition_call(self, startdate: str, enddate=None) -> Call:
+        logger.debug("Requesting body composition")
+        return Call(
+            f"{self.garmin_connect_weight_url}/weight/dateRange",
+            {
+                "startDate": str(startdate),
+                "endDate": str(enddate or startdate),
+            },
+        )
+
+    def _body_battery_call(self, startdate: str, enddate=None) -> Call:
+        logger.debug("Requesting body battery data")
+        return Call(
+            self.garmin_connect_daily_body_battery_url,
+            {
+                "startDate": str(startdate),
+                "endDate": str(enddate or startdate),
+            },
+        )
+
+    def _respiration_data_call(self, cdate: str) -> Call:
+        logger.debug("Requesting respiration data")
+        return Call(f"{self.garmin_connect_daily_respiration_url}/{cdate}")
+
+    def _spo2_data_call(self, cdate: str) -> Call:
+        logger.debug("Requesting SpO2 data")
+        return Call(f"{self.garmin_connect_daily_spo2_url}/{cdate}")
+
+    def _all_day_stress_call(self, cdate: str) -> Call:
+        logger.debug("Requesting all day stress data")
+        return Call(f"{self.garmin_all_day_stress_url}/{cdate}")
+
+    def _sleep_data_call(self, cdate: str) -> Call:
+        logger.debug("Requesting sleep data")
+        return Call(
+            f"{self.garmin_connect_daily_sleep_url}/{self.display_name}",
+            {"date": str(cdate), "nonSleepBufferMinutes": 60},
+        )
+
+    def _stress_data_call(self, cdate: str) -> Call:
+        logger.debug("Requesting stress data")
+        return Call(f"{self.garmin_connect_daily_stress_url}/{cdate}")
+
+    def _rhr_day_call(self, cdate: str) -> Call:
+        logger.debug("Requesting resting heartrate data")
+        return Call(
+            f"{self.garmin_connect_rhr_url}/{self.display_name}",
+            {"fromDate": str(cdate), "untilDate": str(cdate), "metricId": 60},
+        )
+
+    def _hrv_data_call(self, cdate: str) -> Call:
+        logger.debug("Requesting Heart Rate Variability (hrv) data")
+        return Call(f"{self.garmin_connect_hrv_url}/{cdate}")
+
+    def _training_readiness_call(self, cdate: str) -> Call:
+        logger.debug("Requesting training readiness data")
+        return Call(f"{self.garmin_connect_training_readiness_url}/{cdate}")
+
+    def _training_status_call(self, cdate: str) -> Call:
+        logger.debug("Requesting training status data")
+        return Call(f"{self.garmin_connect_training_status_url}/{cdate}")
+
+    def _devices_call(self) -> Call:
+        logger.debug("Requesting devices")
+        return Call(self.garmin_connect_devices_url)
+
+    def _user_profile_call(self) -> Call:
+        logger.debug("Requesting user profile.")
+        return Call(self.garmin_connect_user_settings_url)
+
+    def _activities_call(self, start, limit) -> Call:
+        logger.debug("Requesting activities")
+        return Call(
+            self.garmin_connect_activities,
+            {"start": str(start), "limit": str(limit)},
+        )
+
+    def _activity_search_params(
+        self, startdate=None, enddate=None, activitytype=None
+    ) -> Dict[str, str]:
+        """Filters of an activity listing, without the page's start/limit."""
+
+        params = {}
+        if startdate:
+            params["startDate"] = str(startdate)
+        if enddate:
+            params["endDate"] = str(enddate)
+        if activitytype:
+            params["activityType"] = str(activitytype)
+
+        return params
+
+    def _activity_part_call(self, activity_id, part: str) -> Call:
+        activity_id = str(activity_id)
+        logger.debug(f"Requesting {part} for activity id {activity_id}")
+        return Call(f"{self.garmin_connect_activity}/{activity_id}/{part}")
+
+    def _activity_details_call(
+        self, activity_id, maxchart=2000, maxpoly=4000
+    ) -> Call:
+        activity_id = str(activity_id)
+        logger.debug("Requesting details for activity id %s", activity_id)
+        return Call(
+            f"{self.garmin_connect_activity}/{activity_id}/details",
+            {"maxChartSize": str(maxchart), "maxPolylineSize": str(maxpoly)},
+        )
+
+    def _activity_download_url(self, activity_id, dl_fmt) -> str:
+        formats = self.ActivityDownloadFormat
+        urls = {
+            formats.ORIGINAL: self.garmin_connect_fit_download,
+            formats.TCX: self.garmin_connect_tcx_download,
+            formats.GPX: self.garmin_connect_gpx_download,
+            formats.KML: self.garmin_connect_kml_download,
+            formats.CSV: self.garmin_connect_csv_download,
+        }
+        if dl_fmt not in urls:
+            raise ValueError(f"Unexpected value {dl_fmt} for dl_fmt")
+
+        return f"{urls[dl_fmt]}/{activity_id}"
+
+    @staticmethod
+    def _user_summary_result(
+        response: Dict[str, Any], typed: bool
+    ) -> Union[Dict[str, Any], UserSummary]:
+        if response["privacyProtected"] is True:
+            # Imported here, the exceptions are defined by the package
+            from . import GarminConnectAuthenticationError
+
+            raise GarminConnectAuthenticationError("Authentication error")
+
+        return UserSummary.from_dict(response) if typed else response
+
+    @staticmethod
+    def _sleep_data_result(
+        response: Optional[Dict[str, Any]], typed: bool
+    ) -> Union[Dict[str, Any], SleepSummary, None]:
+        if not typed:
+            return response
+        sleep = (response or {}).get("dailySleepDTO")
+
+        return SleepSummary.from_dict(sleep) if sleep else None
+
+    @staticmethod
+    def _hrv_data_result(
+        response: Optional[Dict[str, Any]], typed: bool
+    ) -> Union[Dict[str, Any], HrvSummary, None]:
+        if not typed:
+            return response
+        summary = (response or {}).get("hrvSummary")
+
+        return HrvSummary.from_dict(summary) if summary else None
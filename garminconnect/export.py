@@ -0,0 +1,174 @@
+"""Resumable bulk export of activity files to disk."""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.jsonl"
+
+EXTENSIONS = {
+    "ORIGINAL": "zip",
+    "TCX": "tcx",
+    "GPX": "gpx",
+    "KML": "kml",
+    "CSV": "csv",
+}
+
+
+class IncompleteDownloadError(Exception):
+    """Raised when a download ends before Content-Length bytes arrived."""
+
+
+def stream_to_file(response, path: str, chunk_size: int = 64 * 1024) -> int:
+    """
+    Write the body of the streamed 'response' to 'path' in chunks via a
+    temporary file that is renamed into place once its size checks out.
+    Returns the number of bytes written.
+    """
+
+    part = f"{path}.part"
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+                size += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Content-Length counts encoded bytes, so only compare plain bodies
+        expected = response.headers.get("Content-Length")
+        if expected is not None and not response.headers.get(
+            "Content-Encoding"
+        ):
+            if size != int(expected):
+                raise IncompleteDownloadError(
+                    f"Got {size} of {expected} bytes for {path}"
+                )
+        os.replace(part, path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    finally:
+        response.close()
+
+    return size
+
+
+@dataclass
+class ExportResult:
+    """Outcome of exporting one activity."""
+
+    activity_id: str
+    path: str
+    status: str
+    size: int = 0
+    error: Optional[str] = None
+
+
+class ActivityExporter:
+    """
+    Download activity files into 'directory' with a bounded worker pool.
+
+    Every finished file is appended to 'manifest.jsonl' with its size, and
+    files whose manifest entry matches the file on disk are skipped.
+    """
+
+    def __init__(self, garmin, directory: str, dl_fmt, max_workers: int = 4):
+        self.garmin = garmin
+        self.directory = os.path.expanduser(directory)
+        self.dl_fmt = dl_fmt
+        self.max_workers = max_workers
+        self.extension = EXTENSIONS[dl_fmt.name]
+        self.manifest_path = os.path.join(self.directory, MANIFEST)
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        manifest = {}
+        if not os.path.exists(self.manifest_path):
+            return manifest
+        with open(self.manifest_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from an interrupted run
+                    continue
+                manifest[entry["activity_id"]] = entry
+
+        return manifest
+
+    def _record(self, result: ExportResult):
+        entry = asdict(result)
+        del entry["status"], entry["error"]
+        entry["format"] = self.dl_fmt.name
+        with self._lock:
+            self.manifest[result.activity_id] = entry
+            with open(self.manifest_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def path_for(self, activity_id: str) -> str:
+        return os.path.join(self.directory, f"{activity_id}.{self.extension}")
+
+    def is_done(self, activity_id: str) -> bool:
+        entry = self.manifest.get(activity_id)
+        if entry is None or entry.get("format") != self.dl_fmt.name:
+            return False
+        path = self.path_for(activity_id)
+
+        return os.path.exists(path) and os.path.getsize(path) == entry["size"]
+
+    def export_one(self, activity_id) -> ExportResult:
+        activity_id = str(activity_id)
+        path = self.path_for(activity_id)
+        if self.is_done(activity_id):
+            return ExportResult(
+                activity_id, path, "skipped", os.path.getsize(path)
+            )
+
+        try:
+            size = self.garmin.download_activity_to(
+                activity_id, path, self.dl_fmt
+            )
+        except Exception as e:
+            logger.warning(f"Failed to export activity {activity_id}: {e}")
+            return ExportResult(activity_id, path, "failed", error=str(e))
+
+        result = ExportResult(activity_id, path, "downloaded", size)
+        self._record(result)
+
+        return result
+
+    def export(self, activity_ids: Iterable) -> Iterator[ExportResult]:
+        """
+        Export 'activity_ids', yielding results in input order. IDs are
+        taken from the iterable as downloads finish, so a lazy listing is
+        consumed at the pace of the export.
+        """
+
+        # Keep a bounded window in flight instead of submitting every ID
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            try:
+                for activity_id in activity_ids:
+                    pending.append(
+                        executor.submit(self.export_one, activity_id)
+                    )
+                    if len(pending) >= self.max_workers * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,1047 @@
+"""Local stand-in for the Garmin Connect API for load and latency tests."""
+
+import functools
+import io
+import json
+import logging
+import random
+import re
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from garth.auth_tokens import OAuth1Token, OAuth2Token
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_ID_BASE = 10_000_000_000
+ACTIVITY_TYPES = ("running", "cycling", "walking")
+DETAIL_KEYS = (
+    "directTimestamp",
+    "directHeartRate",
+    "directSpeed",
+    "directElevation",
+    "sumDistance",
+    "directLatitude",
+    "directLongitude",
+)
+
+
+@dataclass(frozen=True)
+class FakeAccount:
+    """
+    A synthetic user with 'days' of wellness history ending 'today' and
+    'activities' activities spread evenly over it, each with 'samples'
+    one second track points. Data is derived from 'seed' on request, so
+    large histories cost no memory.
+    """
+
+    display_name: str = "fake_user"
+    full_name: str = "Fake User"
+    unit_system: str = "metric"
+    days: int = 365
+    activities: int = 100
+    samples: int = 600
+    today: date = field(default_factory=date.today)
+    seed: int = 0
+
+    @property
+    def first_day(self) -> date:
+        return self.today - timedelta(days=self.days - 1)
+
+    def rng(self, *key) -> random.Random:
+        return random.Random(f"{self.seed}:{key}")
+
+    def days_between(self, start: str, end: str) -> List[date]:
+        start = max(date.fromisoformat(start), self.first_day)
+        end = min(date.fromisoformat(end), self.today)
+        return [
+            start + timedelta(days=i) for i in range((end - start).days + 1)
+        ]
+
+    def activity_start(self, index: int) -> datetime:
+        step = timedelta(days=self.days) / max(self.activities, 1)
+        start = datetime.combine(self.first_day, datetime.min.time())
+        return start + step * (index + 0.5)
+
+
+@dataclass
+class Faults:
+    """
+    What goes wrong per request: a 'latency' (plus up to 'jitter') in
+    seconds, a 'throttle_rate' share of 429s sent with 'retry_after', and
+    an 'error_rate' share of 'error_statuses'. 'seed' makes the sequence
+    of injected faults reproducible.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: Optional[float] = 0
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (500, 502, 503)
+    seed: Optional[int] = None
+
+
+# GET routes take (account, match, params), POST routes also the body
+Route = Callable[..., Any]
+_ROUTES: List[Tuple[str, re.Pattern, Route]] = []
+
+
+def route(pattern: str, method: str = "GET"):
+    def register(function: Route) -> Route:
+        _ROUTES.append((method, re.compile(pattern + "$"), function))
+        return function
+
+    return register
+
+
+def _days(account: FakeAccount, params: Dict[str, str], start, end):
+    return account.days_between(params.get(start), params.get(end))
+
+
+def _page(items: List[Any], params: Dict[str, str], first: int = 0):
+    start = int(params.get("start", first)) - first
+    return items[start : start + int(params.get("limit", 20))]
+
+
+@route(r"/userprofile-service/userprofile/user-settings")
+def user_settings(account, match, params):
+    return {"userData": {"measurementSystem": account.unit_system}}
+
+
+@route(r"/userprofile-service/socialProfile")
+def social_profile(account, match, params):
+    return {
+        "displayName": account.display_name,
+        "fullName": account.full_name,
+    }
+
+
+@route(r"/usersummary-service/usersummary/daily/[^/]+")
+def user_summary(account, match, params):
+    day = params["calendarDate"]
+    rng = account.rng("summary", day)
+    return {
+        "calendarDate": day,
+        "totalSteps": rng.randint(2000, 20000),
+        "totalKilocalories": rng.randint(1800, 3500),
+        "restingHeartRate": rng.randint(45, 65),
+        "averageStressLevel": rng.randint(15, 60),
+        "privacyProtected": False,
+    }
+
+
+@route(r"/wellness-service/wellness/dailySummaryChart/[^/]+")
+def steps_chart(account, match, params):
+    day = date.fromisoformat(params["date"])
+    rng = account.rng("steps", day)
+    start = datetime.combine(day, datetime.min.time())
+    intervals = []
+    for i in range(96):
+        awake = 28 <= i < 88
+        intervals.append(
+            {
+                "startGMT": f"{start:%Y-%m-%dT%H:%M:%S.0}",
+                "endGMT": f"{start + timedelta(minutes=15):%Y-%m-%dT%H:%M:%S.0}",  # noqa
+                "steps": rng.randint(0, 1500) if awake else 0,
+                "primaryActivityLevel": "active" if awake else "sleeping",
+            }
+        )
+        start += timedelta(minutes=15)
+    return intervals
+
+
+@route(r"/usersummary-service/stats/steps/daily/([\d-]+)/([\d-]+)")
+def daily_steps(account, match, params):
+    return [
+        {
+            "calendarDate": str(day),
+            "totalSteps": account.rng("summary", str(day)).randint(
+                2000, 20000
+            ),
+            "stepGoal": 10000,
+        }
+        for day in account.days_between(*match.groups())
+    ]
+
+
+def _series(rng, day: str, step: int, low: int, high: int):
+    start = int(datetime.fromisoformat(day).timestamp() * 1000)
+    return [
+        [start + i * step * 1000, rng.randint(low, high)]
+        for i in range(86400 // step)
+    ]
+
+
+@route(r"/wellness-service/wellness/dailyHeartRate/[^/]+")
+def heart_rates(account, match, params):
+    day = params["date"]
+    rng = account.rng("heart", day)
+    values = _series(rng, day, 120, 45, 160)
+    return {
+        "calendarDate": day,
+        "restingHeartRate": min(value for _, value in values),
+        "maxHeartRate": max(value for _, value in values),
+        "heartRateValues": values,
+    }
+
+
+@route(r"/wellness-service/wellness/dailySleepData/[^/]+")
+def sleep(account, match, params):
+    day = params["date"]
+    rng = account.rng("sleep", day)
+    deep, light, rem = (rng.randint(3000, 9000) for _ in range(3))
+    return {
+        "dailySleepDTO": {
+            "calendarDate": day,
+            "sleepTimeSeconds": deep + light + rem,
+            "deepSleepSeconds": deep,
+            "lightSleepSeconds": light,
+            "remSleepSeconds": rem,
+        },
+        "restingHeartRate": rng.randint(45, 65),
+    }
+
+
+@route(r"/wellness-service/wellness/dailyStress/([\d-]+)")
+def stress(account, match, params):
+    day = match.group(1)
+    rng = account.rng("stress", day)
+    values = _series(rng, day, 180, 0, 100)
+    return {
+        "calendarDate": day,
+        "avgStressLevel": sum(v for _, v in values) // len(values),
+        "maxStressLevel": max(v for _, v in values),
+        "stressValuesArray": values,
+    }
+
+
+@route(r"/hrv-service/hrv/([\d-]+)")
+def hrv(account, match, params):
+    day = match.group(1)
+    rng = account.rng("hrv", day)
+    return {
+        "hrvSummary": {
+            "calendarDate": day,
+            "lastNightAvg": rng.randint(30, 90),
+            "weeklyAvg": rng.randint(40, 70),
+            "status": "BALANCED",
+        }
+    }
+
+
+@route(r"/wellness-service/wellness/daily/spo2/([\d-]+)")
+def spo2(account, match, params):
+    rng = account.rng("spo2", match.group(1))
+    return {
+        "calendarDate": match.group(1),
+        "averageSpO2": rng.randint(93, 99),
+        "lowestSpO2": rng.randint(85, 93),
+    }
+
+
+@route(r"/wellness-service/wellness/daily/respiration/([\d-]+)")
+def respiration(account, match, params):
+    rng = account.rng("respiration", match.group(1))
+    return {
+        "calendarDate": match.group(1),
+        "avgWakingRespirationValue": rng.randint(12, 18),
+        "avgSleepRespirationValue": rng.randint(10, 16),
+    }
+
+
+@route(r"/metrics-service/metrics/trainingreadiness/([\d-]+)")
+def training_readiness(account, match, params):
+    score = account.rng("readiness", match.group(1)).randint(1, 100)
+    return [{"calendarDate": match.group(1), "score": score}]
+
+
+@route(r"/metrics-service/metrics/trainingstatus/aggregated/([\d-]+)")
+def training_status(account, match, params):
+    return {"mostRecentTrainingStatus": {"calendarDate": match.group(1)}}
+
+
+@route(r"/metrics-service/metrics/maxmet/daily/([\d-]+)/([\d-]+)")
+def max_metrics(account, match, params):
+    return [
+        {
+            "generic": {
+                "calendarDate": str(day),
+                "vo2MaxValue": account.rng("vo2", day).randint(40, 60),
+            }
+        }
+        for day in account.days_between(*match.groups())
+    ]
+
+
+@route(r"/usersummary-service/usersummary/hydration/daily/([\d-]+)")
+def hydration(account, match, params):
+    value = account.rng("hydration", match.group(1)).randint(0, 3000)
+    return {"calendarDate": match.group(1), "valueInML": value}
+
+
+@route(
+    r"/wellness-service/wellness/floorsChartData/daily/([\d-]+)(?:/[\d-]+)?"
+)
+def floors(account, match, params):
+    rng = account.rng("floors", match.group(1))
+    return {"floorValuesArray": [rng.randint(0, 3) for _ in range(96)]}
+
+
+@route(r"/userstats-service/wellness/daily/[^/]+")
+def resting_heart_rate(account, match, params):
+    days = _days(account, params, "fromDate", "untilDate")
+    values = [
+        {
+            "calendarDate": str(day),
+            "value": account.rng("rhr", day).randint(45, 65),
+        }
+        for day in days
+    ]
+    return {
+        "allMetrics": {"metricsMap": {"WELLNESS_RESTING_HEART_RATE": values}}
+    }
+
+
+@route(r"/wellness-service/wellness/bodyBattery/reports/daily")
+def body_battery(account, match, params):
+    return [
+        {
+            "date": str(day),
+            "charged": account.rng("charged", day).randint(20, 80),
+            "drained": account.rng("drained", day).randint(20, 80),
+        }
+        for day in _days(account, params, "startDate", "endDate")
+    ]
+
+
+def _weight(account: FakeAccount, day: date) -> Optional[Dict[str, Any]]:
+    rng = account.rng("weight", day)
+    if rng.random() < 0.5:
+        return None
+    return {"calendarDate": str(day), "weight": rng.randint(70000, 75000)}
+
+
+@route(r"/weight-service/weight/dateRange")
+def body_composition(account, match, params):
+    days = _days(account, params, "startDate", "endDate")
+    weights = [w for w in (_weight(account, day) for day in days) if w]
+    return {
+        "startDate": params["startDate"],
+        "endDate": params["endDate"],
+        "dateWeightList": weights,
+        "totalAverage": {
+            "weight": (
+                sum(w["weight"] for w in weights) / len(weights)
+                if weights
+                else None
+            )
+        },
+    }
+
+
+@route(r"/weight-service/weight/range/([\d-]+)/([\d-]+)")
+def weigh_ins(account, match, params):
+    days = account.days_between(*match.groups())
+    summaries = [
+        {"summaryDate": w["calendarDate"], "latestWeight": w}
+        for w in (_weight(account, day) for day in reversed(days))
+        if w
+    ]
+    return {"dailyWeightSummaries": summaries}
+
+
+@route(r"/weight-service/weight/dayview/([\d-]+)")
+def daily_weigh_ins(account, match, params):
+    weight = _weight(account, date.fromisoformat(match.group(1)))
+    return {"dateWeightList": [weight] if weight else []}
+
+
+@route(r"/bloodpressure-service/bloodpressure/range/([\d-]+)/([\d-]+)")
+def blood_pressure(account, match, params):
+    days = account.days_between(*match.groups())
+    summaries = []
+    for day in reversed(days):
+        rng = account.rng("pressure", day)
+        if day.toordinal() % 3 == 0:
+            measurement = {
+                "systolic": rng.randint(110, 135),
+                "diastolic": rng.randint(70, 85),
+            }
+            summaries.append(
+                {"startDate": str(day), "measurements": [measurement]}
+            )
+    return {"measurementSummaries": summaries}
+
+
+def _buckets(account, params) -> Dict[str, List[date]]:
+    step = params.get("aggregation", "daily")
+    buckets: Dict[str, List[date]] = {}
+    for day in _days(account, params, "startDate", "endDate"):
+        if step == "weekly":
+            key = day - timedelta(days=day.weekday())
+        elif step == "monthly":
+            key = day.replace(day=1)
+        else:
+            key = day
+        buckets.setdefault(str(key), []).append(day)
+    return buckets
+
+
+@route(r"/metrics-service/metrics/endurancescore")
+def endurance_score(account, match, params):
+    day = params["calendarDate"]
+    score = account.rng("endurance", day).randint(4000, 8000)
+    return {"calendarDate": day, "overallScore": score}
+
+
+@route(r"/metrics-service/metrics/endurancescore/stats")
+def endurance_score_stats(account, match, params):
+    return {
+        "groupMap": {
+            key: {
+                "groupAverage": sum(
+                    account.rng("endurance", str(day)).randint(4000, 8000)
+                    for day in days
+                )
+                // len(days)
+            }
+            for key, days in _buckets(account, params).items()
+        }
+    }
+
+
+@route(r"/metrics-service/metrics/hillscore")
+def hill_score(account, match, params):
+    day = params["calendarDate"]
+    score = account.rng("hill", day).randint(20, 80)
+    return {"calendarDate": day, "overallScore": score}
+
+
+@route(r"/metrics-service/metrics/hillscore/stats")
+def hill_score_stats(account, match, params):
+    return {
+        "hillScoreDTOList": [
+            {
+                "calendarDate": key,
+                "overallScore": account.rng("hill", key).randint(20, 80),
+            }
+            for key in _buckets(account, params)
+        ]
+    }
+
+
+def _prediction(account: FakeAccount, day: str) -> Dict[str, Any]:
+    rng = account.rng("race", day)
+    five = rng.randint(1200, 1800)
+    return {
+        "calendarDate": day,
+        "time5K": five,
+        "time10K": int(five * 2.1),
+        "timeHalfMarathon": int(five * 4.7),
+        "timeMarathon": int(five * 9.9),
+    }
+
+
+@route(r"/metrics-service/metrics/racepredictions/latest/[^/]+")
+def race_predictions(account, match, params):
+    return _prediction(account, str(account.today))
+
+
+@route(r"/metrics-service/metrics/racepredictions/(daily|monthly)/[^/]+")
+def race_prediction_range(account, match, params):
+    days = _days(account, params, "fromCalendarDate", "toCalendarDate")
+    if match.group(1) == "monthly":
+        days = [day for day in days if day.day == 1]
+    return [_prediction(account, str(day)) for day in days]
+
+
+@route(r"/device-service/deviceregistration/devices")
+def devices(account, match, params):
+    return [{"deviceId": 1, "productDisplayName": "Fake Watch"}]
+
+
+@route(r"/device-service/deviceservice/device-info/settings/(\d+)")
+def device_settings(account, match, params):
+    return {"deviceId": int(match.group(1)), "alarms": []}
+
+
+@route(r"/device-service/deviceservice/mylastused")
+def last_used_device(account, match, params):
+    return {"userDeviceId": 1, "lastUsedDeviceName": "Fake Watch"}
+
+
+@route(r"/personalrecord-service/personalrecord/prs/[^/]+")
+def personal_records(account, match, params):
+    return [{"typeId": 1, "value": 1200.0}]
+
+
+@route(r"/badge-service/badge/earned")
+def earned_badges(account, match, params):
+    return [{"badgeId": i, "badgeName": f"Badge {i}"} for i in range(10)]
+
+
+@route(
+    r"/(?:adhocchallenge|badgechallenge)-service"
+    r"/(?:adHocChallenge|badgeChallenge|virtualChallenge)/\w[\w-]*"
+)
+def challenges(account, match, params):
+    items = [{"uuid": f"challenge-{i}"} for i in range(45)]
+    return _page(items, params, first=1)
+
+
+@route(r"/goal-service/goal/goals")
+def goals(account, match, params):
+    items = [
+        {"goalId": i, "status": params.get("status")} for i in range(1, 46)
+    ]
+    return _page(items, params, first=1)
+
+
+@route(r"/activity-service/activity/activityTypes")
+def activity_types(account, match, params):
+    return [
+        {"typeId": i, "typeKey": key} for i, key in enumerate(ACTIVITY_TYPES)
+    ]
+
+
+@route(r"/fitnessstats-service/activity")
+def fitness_stats(account, match, params):
+    return [{"date": params.get("startDate"), "countOfActivities": 1}]
+
+
+@functools.lru_cache(maxsize=4096)
+def _activity(account: FakeAccount, index: int) -> Dict[str, Any]:
+    rng = account.rng("activity", index)
+    start = account.activity_start(index)
+    duration = float(account.samples)
+    return {
+        "activityId": ACTIVITY_ID_BASE + index,
+        "activityName": f"Activity {index}",
+        "activityType": {"typeKey": ACTIVITY_TYPES[index % 3]},
+        "startTimeLocal": f"{start:%Y-%m-%d %H:%M:%S}",
+        "startTimeGMT": f"{start:%Y-%m-%d %H:%M:%S}",
+        "duration": duration,
+        "distance": duration * 3.0,
+        "averageHR": rng.randint(110, 160),
+        "calories": rng.randint(100, 900),
+    }
+
+
+def _activity_index(account: FakeAccount, activity_id: str) -> int:
+    index = int(activity_id) - ACTIVITY_ID_BASE
+    if not 0 <= index < account.activities:
+        raise LookupError(f"No activity {activity_id}")
+    return index
+
+
+@route(r"/activitylist-service/activities/search/activities")
+def activities(account, match, params):
+    start = params.get("startDate")
+    end = params.get("endDate")
+    kind = params.get("activityType")
+    indexes = []
+    for index in reversed(range(account.activities)):
+        day = str(account.activity_start(index).date())
+        if start and day < start or end and day > end:
+            continue
+        if kind and ACTIVITY_TYPES[index % 3] != kind:
+            continue
+        indexes.append(index)
+    return [_activity(account, index) for index in _page(indexes, params)]
+
+
+@route(r"/mobile-gateway/heartRate/forDate/([\d-]+)")
+def activities_for_date(account, match, params):
+    payload = [
+        _activity(account, index)
+        for index in range(account.activities)
+        if str(account.activity_start(index).date()) == match.group(1)
+    ]
+    return {"ActivitiesForDay": {"payload": payload}}
+
+
+@route(r"/activity-service/activity/(\d+)")
+def activity(account, match, params):
+    return _activity(account, _activity_index(account, match.group(1)))
+
+
+@route(r"/activity-service/activity/(\d+)/(splits|split_summaries)")
+def splits(account, match, params):
+    _activity_index(account, match.group(1))
+    laps = max(account.samples // 300, 1)
+    return {
+        "activityId": int(match.group(1)),
+        "lapDTOs": [{"lapIndex": i, "distance": 900.0} for i in range(laps)],
+    }
+
+
+@route(r"/activity-service/activity/(\d+)/weather")
+def weather(account, match, params):
+    index = _activity_index(account, match.group(1))
+    return {"temp": account.rng("weather", index).randint(-5, 30)}
+
+
+@route(r"/activity-service/activity/(\d+)/hrTimeInZones")
+def hr_time_in_zones(account, match, params):
+    index = _activity_index(account, match.group(1))
+    rng = account.rng("zones", index)
+    return [
+        {"zoneNumber": zone, "secsInZone": rng.randint(0, 600)}
+        for zone in range(1, 6)
+    ]
+
+
+@route(r"/activity-service/activity/(\d+)/exerciseSets")
+def exercise_sets(account, match, params):
+    _activity_index(account, match.group(1))
+    return {"activityId": int(match.group(1)), "exerciseSets": []}
+
+
+@functools.lru_cache(maxsize=32)
+def _track(account: FakeAccount, index: int) -> List[Tuple]:
+    """(time, lat, lon, heart rate, speed, elevation, distance) samples."""
+
+    rng = account.rng("track", index)
+    start = account.activity_start(index).timestamp()
+    lat, lon, distance = 52.0 + rng.random(), 4.0 + rng.random(), 0.0
+    track = []
+    for i in range(account.samples):
+        speed = 2.5 + rng.random()
+        distance += speed
+        lat += speed / 111_000
+        track.append(
+            (
+                start + i,
+                lat,
+                lon,
+                rng.randint(100, 170),
+                speed,
+                10 + rng.random() * 5,
+                distance,
+            )
+        )
+
+    return track
+
+
+@route(r"/activity-service/activity/(\d+)/details")
+def details(account, match, params):
+    index = _activity_index(account, match.group(1))
+    track = _track(account, index)
+    charts = track[: int(params.get("maxChartSize", 2000))]
+    polyline = track[: int(params.get("maxPolylineSize", 4000))]
+    return {
+        "activityId": ACTIVITY_ID_BASE + index,
+        "measurementCount": len(DETAIL_KEYS),
+        "metricsCount": len(charts),
+        "metricDescriptors": [
+            {"metricsIndex": i, "key": key}
+            for i, key in enumerate(DETAIL_KEYS)
+        ],
+        "activityDetailMetrics": [
+            {
+                "metrics": [
+                    t * 1000,
+                    float(hr),
+                    speed,
+                    elevation,
+                    distance,
+                    lat,
+                    lon,
+                ]
+            }
+            for t, lat, lon, hr, speed, elevation, distance in charts
+        ],
+        "geoPolylineDTO": {
+            "polyline": [
+                {"lat": lat, "lon": lon, "time": t * 1000}
+                for t, lat, lon, *_ in polyline
+            ]
+        },
+    }
+
+
+@route(r"/gear-service/gear/filterGear")
+def gear(account, match, params):
+    return [{"uuid": "fake-gear", "displayName": "Fake Shoes"}]
+
+
+@route(r"/gear-service/gear/stats/([\w-]+)")
+def gear_stats(account, match, params):
+    return {"uuid": match.group(1), "totalActivities": account.activities}
+
+
+@route(r"/gear-service/gear/user/\d+/activityTypes")
+def gear_defaults(account, match, params):
+    return []
+
+
+# CRC of the FIT SDK, four bits at a time
+_FIT_CRC = (
+    0x0000,
+    0xCC01,
+    0xD801,
+    0x1400,
+    0xF001,
+    0x3C00,
+    0x2800,
+    0xE401,
+    0xA001,
+    0x6C00,
+    0x7800,
+    0xB401,
+    0x5000,
+    0x9C01,
+    0x8801,
+    0x4400,
+)
+_FIT_EPOCH = 631065600
+
+
+def _fit_crc(data: bytes, crc: int = 0) -> int:
+    for byte in data:
+        for nibble in (byte & 0xF, byte >> 4):
+            crc = (crc >> 4) ^ _FIT_CRC[crc & 0xF] ^ _FIT_CRC[nibble]
+    return crc
+
+
+def _fit_activity(account: FakeAccount, index: int) -> bytes:
+    """A FIT file of a file_id message and one record per track sample."""
+
+    # (field number, size, base type) of file_id and record messages
+    file_id = ((0, 1, 0x00), (1, 2, 0x84), (4, 4, 0x86))
+    record = (
+        (253, 4, 0x86),
+        (0, 4, 0x85),
+        (1, 4, 0x85),
+        (3, 1, 0x02),
+        (5, 4, 0x86),
+        (73, 4, 0x86),
+        (78, 4, 0x86),
+    )
+    body = io.BytesIO()
+    for local, number, fields in ((0, 0, file_id), (1, 20, record)):
+        body.write(
+            struct.pack("<BBBHB", 0x40 | local, 0, 0, number, len(fields))
+        )
+        for definition in fields:
+            body.write(bytes(definition))
+
+    start = int(account.activity_start(index).timestamp()) - _FIT_EPOCH
+    body.write(struct.pack("<BBHI", 0, 4, 255, start))
+    semicircles = 2**31 / 180
+    for t, lat, lon, hr, speed, elevation, distance in _track(account, index):
+        body.write(
+            struct.pack(
+                "<BIiiBIII",
+                1,
+                int(t) - _FIT_EPOCH,
+                int(lat * semicircles),
+                int(lon * semicircles),
+                hr,
+                int(distance * 100),
+                int(speed * 1000),
+                int((elevation + 500) * 5),
+            )
+        )
+
+    data = body.getvalue()
+    header = struct.pack("<BBHI4s", 14, 0x20, 2132, len(data), b".FIT")
+    header += struct.pack("<H", _fit_crc(header))
+    content = header + data
+
+    return content + struct.pack("<H", _fit_crc(content))
+
+
+@route(r"/upload-service/upload", "POST")
+def upload(account, match, params, body):
+    return {
+        "detailedImportResult": {
+            "uploadId": zlib.crc32(body),
+            "fileSize": len(body),
+            "successes": [],
+            "failures": [],
+        }
+    }
+
+
+@route(r"/download-service/files/activity/(\d+)")
+def original(account, match, params):
+    return _original(account, _activity_index(account, match.group(1)))
+
+
+# Cached so throughput measurements aren't dominated by FIT synthesis
+@functools.lru_cache(maxsize=32)
+def _original(account: FakeAccount, index: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            f"{ACTIVITY_ID_BASE + index}_ACTIVITY.fit",
+            _fit_activity(account, index),
+        )
+    return buffer.getvalue()
+
+
+@route(r"/download-service/export/(tcx|gpx|kml|csv)/activity/(\d+)")
+def export(account, match, params):
+    index = _activity_index(account, match.group(2))
+    lines = [
+        f"{t},{lat:.6f},{lon:.6f},{hr}"
+        for t, lat, lon, hr, *_ in _track(account, index)
+    ]
+    return f"{match.group(1)}\n" + "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, which Nagle would delay
+    disable_nagle_algorithm = True
+    server: "_HTTPServer"
+
+    def do_GET(self):
+        self.server.fake.handle(self)
+
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    fake: "FakeConnectServer"
+
+
+class _RedirectAdapter(HTTPAdapter):
+    """Send the requests of the mounted prefix to the fake server."""
+
+    def __init__(self, origin: str, target: str, **kwargs):
+        super().__init__(**kwargs)
+        self.origin = origin
+        self.target = target
+
+    def send(self, request, **kwargs):
+        request.url = self.target + request.url[len(self.origin) :]
+        return super().send(request, **kwargs)
+
+
+class FakeConnectServer:
+    """
+    Threaded HTTP server answering the Connect API GET paths of the Garmin
+    class with synthetic data for 'accounts', injecting 'faults'. Use it
+    as a context manager and attach() Garmin instances to it.
+    """
+
+    def __init__(
+        self,
+        accounts: Iterable[FakeAccount] = (),
+        faults: Optional[Faults] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.accounts = {
+            account.display_name: account
+            for account in (list(accounts) or [FakeAccount()])
+        }
+        self.faults = faults or Faults()
+        self.host = host
+        self.port = port
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[_HTTPServer] = None
+        self.statuses: Counter = Counter()
+        self.connections: Set[Tuple[str, int]] = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeConnectServer":
+        self._httpd = _HTTPServer((self.host, self.port), _Handler)
+        self._httpd.fake = self
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        logger.debug(f"Fake Connect API listening on {self.url}")
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeConnectServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": sum(self.statuses.values()),
+                "statuses": dict(self.statuses),
+                "connections": len(self.connections),
+                "peak_in_flight": self.peak_in_flight,
+            }
+
+    def attach(self, garmin, display_name: Optional[str] = None):
+        """
+        Log 'garmin' in as the account 'display_name' (the first account
+        by default) with tokens the server accepts, and route its Connect
+        API requests here. Returns 'garmin'.
+        """
+
+        from . import LoginState
+
+        account = self.accounts[display_name or next(iter(self.accounts))]
+        client = self.mount(garmin).garth
+        expires = int(time.time()) + 10 * 365 * 86400
+        client.oauth1_token = OAuth1Token("fake", "fake")
+        client.oauth2_token = OAuth2Token(
+            scope="",
+            jti="fake",
+            token_type="Bearer",
+            access_token=account.display_name,
+            refresh_token="fake",
+            expires_in=expires - int(time.time()),
+            expires_at=expires,
+            refresh_token_expires_in=expires - int(time.time()),
+            refresh_token_expires_at=expires,
+        )
+        garmin.login_state = LoginState(
+            account.display_name, account.full_name, account.unit_system
+        )
+
+        return garmin
+
+    def mount(self, garmin):
+        """
+        Route the Connect API requests of 'garmin' here without logging
+        it in, e.g. before Garmin.login() with a token directory written
+        by an attached instance. Returns 'garmin'.
+        """
+
+        origin = f"https://connectapi.{garmin.garth.domain}"
+        garmin.garth.sess.mount(
+            origin,
+            _RedirectAdapter(origin, self.url, pool_maxsize=garmin.pool_size),
+        )
+
+        return garmin
+
+    def _fault(self) -> Tuple[Optional[int], float]:
+        faults = self.faults
+        with self._lock:
+            delay = faults.latency + self._random.uniform(0, faults.jitter)
+            draw = self._random.random()
+            if draw < faults.throttle_rate:
+                return 429, delay
+            if draw < faults.throttle_rate + faults.error_rate:
+                return self._random.choice(faults.error_statuses), delay
+        return None, delay
+
+    def handle(self, request: _Handler):
+        with self._lock:
+            self.connections.add(request.client_address)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            status, body, headers = self._respond(request)
+        except Exception:
+            logger.exception(f"Failed to answer {request.path}")
+            status, body, headers = 500, b"", {}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.statuses[status] += 1
+
+        request.send_response(status)
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def _respond(self, request: _Handler) -> Tuple[int, bytes, Dict]:
+        # Read the body first, or it would be taken for the next request
+        length = int(request.headers.get("Content-Length") or 0)
+        content = request.rfile.read(length) if length else b""
+
+        status, delay = self._fault()
+        if delay:
+            time.sleep(delay)
+        if status == 429:
+            headers = {}
+            if self.faults.retry_after is not None:
+                headers["Retry-After"] = str(self.faults.retry_after)
+            return 429, b"", headers
+        if status is not None:
+            return status, b"", {}
+
+        authorization = request.headers.get("Authorization", "")
+        account = self.accounts.get(authorization.partition(" ")[2])
+        if account is None:
+            return 401, b"", {}
+
+        url = urlsplit(request.path)
+        params = dict(parse_qsl(url.query))
+        for method, pattern, function in _ROUTES:
+            match = pattern.match(url.path)
+            if match is None or method != request.command:
+                continue
+            arguments = (content,) if method == "POST" else ()
+            try:
+                result = function(account, match, params, *arguments)
+            except LookupError:
+                break
+            except (KeyError, TypeError, ValueError) as e:
+                return 400, str(e).encode(), {}
+            if isinstance(result, bytes):
+                return 200, result, {"Content-Type": "application/zip"}
+            if isinstance(result, str):
+                return 200, result.encode(), {"Content-Type": "text/plain"}
+            body = json.dumps(result).encode()
+            return 200, body, {"Content-Type": "application/json"}
+
+        return 404, b"", {}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--activities", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG)
+    server = FakeConnectServer(
+        [FakeAccount(days=args.days, activities=args.activities)],
+        Faults(args.latency, 0, args.throttle_rate, 0, args.error_rate),
+        port=args.port,
+    )
+    with server:
+        print(f"Serving {server.url}, token 'Bearer fake_user'")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
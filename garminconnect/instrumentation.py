@@ -0,0 +1,266 @@
+"""Per-endpoint latency, payload, status and retry instrumentation."""
+
+import bisect
+import logging
+import math
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+# Set by record_as() where the getter isn't on the requesting stack
+_endpoint: ContextVar[Optional[str]] = ContextVar("endpoint", default=None)
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    math.inf,
+)
+
+
+@dataclass
+class CallRecord:
+    """
+    One request as sent by the client, named after the public method that
+    issued it. 'retries' counts the 429 responses retried before the
+    final attempt, whose 'status' and 'size' in bytes are recorded.
+    'error' is the exception type name when the call failed.
+    """
+
+    endpoint: str
+    path: str
+    seconds: float
+    status: Optional[int] = None
+    size: int = 0
+    retries: int = 0
+    error: Optional[str] = None
+
+
+class Histogram:
+    """Counts of observations per bucket upper bound."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the 'q' quantile, or the largest
+        observation if that is smaller.
+        """
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(self.bounds, self.counts)),
+        }
+
+
+class EndpointStats:
+    """Running totals of the calls to one endpoint."""
+
+    __slots__ = ("calls", "errors", "retries", "bytes", "statuses", "latency")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram(bounds)
+
+    def add(self, record: CallRecord):
+        self.calls += 1
+        self.errors += record.error is not None
+        self.retries += record.retries
+        self.bytes += record.size
+        if record.status is not None:
+            self.statuses[record.status] = (
+                self.statuses.get(record.status, 0) + 1
+            )
+        self.latency.observe(record.seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.as_dict(),
+        }
+
+
+Hook = Callable[[CallRecord], None]
+
+
+class Instrumentation:
+    """
+    Thread-safe per-endpoint statistics of a client's requests. Hooks are
+    called with every CallRecord after it is counted, on the thread that
+    made the request; a failing hook is logged and otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        hooks: Iterable[Hook] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        if buckets[-1] != math.inf:
+            buckets = tuple(buckets) + (math.inf,)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, EndpointStats] = {}
+        self._hooks: List[Hook] = list(hooks)
+
+    def add_hook(self, hook: Hook):
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Hook):
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def record(self, record: CallRecord):
+        with self._lock:
+            stats = self._stats.get(record.endpoint)
+            if stats is None:
+                stats = self._stats[record.endpoint] = EndpointStats(
+                    self.buckets
+                )
+            stats.add(record)
+            hooks = tuple(self._hooks)
+
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception:
+                logger.exception(f"Instrumentation hook {hook!r} failed")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of the statistics of every endpoint by name."""
+
+        with self._lock:
+            return {
+                endpoint: stats.as_dict()
+                for endpoint, stats in sorted(self._stats.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+@contextmanager
+def record_as(name: str) -> Iterator[None]:
+    """
+    Record the requests made in the block under 'name', for requests made
+    on worker threads or by closures, whose stack doesn't reach the getter.
+    """
+
+    token = _endpoint.set(name)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def entry_name(owner: Any, default: str) -> str:
+    """
+    Name of the public method of 'owner' the caller was entered through:
+    the outermost public one among the methods of 'owner' that directly
+    call each other down to the caller, so get_goals rather than the
+    iter_goals it delegates to.
+    """
+
+    name = default
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_locals.get("self") is owner:
+        if frame.f_code.co_name[0] not in "_<":
+            name = frame.f_code.co_name
+        frame = frame.f_back
+
+    return name
+
+
+def caller_name(owner: Any, skip: Container[str], default: str) -> str:
+    """
+    Name of the innermost public method of 'owner' on the caller's stack
+    that isn't in 'skip', so requests are keyed by the getter that issued
+    them rather than by a URL. A name set with record_as() takes precedence.
+    Returns 'default' when the request was not made from one of owner's
+    public methods.
+    """
+
+    name = _endpoint.get()
+    if name is not None:
+        return name
+
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        name = code.co_name
+        # Private helpers, lambdas, comprehensions and closures aren't
+        # endpoints
+        if (
+            name[0] not in "_<"
+            and name not in skip
+            and "<locals>" not in getattr(code, "co_qualname", "")
+            and frame.f_locals.get("self") is owner
+        ):
+            return name
+        frame = frame.f_back
+
+    return default
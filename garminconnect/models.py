@@ -0,0 +1,181 @@
+"""Compact typed models of the highest-volume Garmin Connect responses."""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T", bound="Model")
+
+
+def _lookup(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+class Model:
+    """
+    Base of the slotted models. Each subclass maps its fields to response
+    keys in KEYS (a tuple of keys for nested values); unmapped response
+    keys are dropped, which is where the memory saving comes from.
+    """
+
+    __slots__ = ()
+    KEYS: Dict[str, Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+        return cls(*(_lookup(data, path) for path in cls.KEYS.values()))
+
+    @classmethod
+    def from_list(cls: Type[T], items: Iterable[Dict[str, Any]]) -> List[T]:
+        return [cls.from_dict(item) for item in items]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def _keys(cls):
+    """Check that a model's KEYS cover its fields, in field order."""
+
+    names = [f.name for f in fields(cls)]
+    if list(cls.KEYS) != names:
+        raise TypeError(f"{cls.__name__}.KEYS must map {names} in order")
+    return cls
+
+
+@_keys
+@dataclass(frozen=True, slots=True)
+class ActivitySummary(Model):
+    """An entry of the activity listings."""
+
+    activity_id: int
+    activity_name: Optional[str]
+    activity_type: Optional[str]
+    start_time_local: Optional[str]
+    start_time_gmt: Optional[str]
+    duration: Optional[float]
+    moving_duration: Optional[float]
+    distance: Optional[float]
+    elevation_gain: Optional[float]
+    average_speed: Optional[float]
+    average_hr: Optional[float]
+    max_hr: Optional[float]
+    calories: Optional[float]
+    steps: Optional[int]
+
+    KEYS = {
+        "activity_id": ("activityId",),
+        "activity_name": ("activityName",),
+        "activity_type": ("activityType", "typeKey"),
+        "start_time_local": ("startTimeLocal",),
+        "start_time_gmt": ("startTimeGMT",),
+        "duration": ("duration",),
+        "moving_duration": ("movingDuration",),
+        "distance": ("distance",),
+        "elevation_gain": ("elevationGain",),
+        "average_speed": ("averageSpeed",),
+        "average_hr": ("averageHR",),
+        "max_hr": ("maxHR",),
+        "calories": ("calories",),
+        "steps": ("steps",),
+    }
+
+
+@_keys
+@dataclass(frozen=True, slots=True)
+class UserSummary(Model):
+    """The daily summary of get_user_summary."""
+
+    calendar_date: str
+    total_steps: Optional[int]
+    daily_step_goal: Optional[int]
+    total_distance_meters: Optional[float]
+    total_kilocalories: Optional[float]
+    active_kilocalories: Optional[float]
+    resting_heart_rate: Optional[int]
+    min_heart_rate: Optional[int]
+    max_heart_rate: Optional[int]
+    average_stress_level: Optional[int]
+    body_battery_highest: Optional[int]
+    body_battery_lowest: Optional[int]
+    floors_ascended: Optional[float]
+    moderate_intensity_minutes: Optional[int]
+    vigorous_intensity_minutes: Optional[int]
+
+    KEYS = {
+        "calendar_date": ("calendarDate",),
+        "total_steps": ("totalSteps",),
+        "daily_step_goal": ("dailyStepGoal",),
+        "total_distance_meters": ("totalDistanceMeters",),
+        "total_kilocalories": ("totalKilocalories",),
+        "active_kilocalories": ("activeKilocalories",),
+        "resting_heart_rate": ("restingHeartRate",),
+        "min_heart_rate": ("minHeartRate",),
+        "max_heart_rate": ("maxHeartRate",),
+        "average_stress_level": ("averageStressLevel",),
+        "body_battery_highest": ("bodyBatteryHighestValue",),
+        "body_battery_lowest": ("bodyBatteryLowestValue",),
+        "floors_ascended": ("floorsAscended",),
+        "moderate_intensity_minutes": ("moderateIntensityMinutes",),
+        "vigorous_intensity_minutes": ("vigorousIntensityMinutes",),
+    }
+
+
+@_keys
+@dataclass(frozen=True, slots=True)
+class SleepSummary(Model):
+    """The dailySleepDTO of get_sleep_data."""
+
+    calendar_date: str
+    sleep_time_seconds: Optional[int]
+    deep_sleep_seconds: Optional[int]
+    light_sleep_seconds: Optional[int]
+    rem_sleep_seconds: Optional[int]
+    awake_sleep_seconds: Optional[int]
+    sleep_start_timestamp_gmt: Optional[int]
+    sleep_end_timestamp_gmt: Optional[int]
+    average_spo2: Optional[float]
+    average_respiration: Optional[float]
+    average_sleep_stress: Optional[float]
+    sleep_score: Optional[int]
+
+    KEYS = {
+        "calendar_date": ("calendarDate",),
+        "sleep_time_seconds": ("sleepTimeSeconds",),
+        "deep_sleep_seconds": ("deepSleepSeconds",),
+        "light_sleep_seconds": ("lightSleepSeconds",),
+        "rem_sleep_seconds": ("remSleepSeconds",),
+        "awake_sleep_seconds": ("awakeSleepSeconds",),
+        "sleep_start_timestamp_gmt": ("sleepStartTimestampGMT",),
+        "sleep_end_timestamp_gmt": ("sleepEndTimestampGMT",),
+        "average_spo2": ("averageSpO2Value",),
+        "average_respiration": ("averageRespirationValue",),
+        "average_sleep_stress": ("avgSleepStress",),
+        "sleep_score": ("sleepScores", "overall", "value"),
+    }
+
+
+@_keys
+@dataclass(frozen=True, slots=True)
+class HrvSummary(Model):
+    """The hrvSummary of get_hrv_data."""
+
+    calendar_date: str
+    weekly_avg: Optional[int]
+    last_night_avg: Optional[int]
+    last_night_5_min_high: Optional[int]
+    status: Optional[str]
+    baseline_low: Optional[int]
+    baseline_high: Optional[int]
+
+    KEYS = {
+        "calendar_date": ("calendarDate",),
+        "weekly_avg": ("weeklyAvg",),
+        "last_night_avg": ("lastNightAvg",),
+        "last_night_5_min_high": ("lastNight5MinHigh",),
+        "status": ("status",),
+        "baseline_low": ("baseline", "balancedLow"),
+        "baseline_high": ("baseline", "balancedUpper"),
+    }
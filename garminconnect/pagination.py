@@ -0,0 +1,172 @@
+"""Prefetching paginator for offset/limit list endpoints."""
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PageWindow:
+    """
+    Offset and limit of the next pages to request. A page shorter than
+    its limit ends the listing once the server is known to honor the
+    limit. Before that, it may mean the server caps 'limit', so the limit
+    drops to that page's length and paging goes on until an empty page.
+    """
+
+    def __init__(self, start: int, page_size: int):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.offset = start
+        self.limit = page_size
+        self.honored = False
+
+    def next(self) -> Tuple[int, int]:
+        """Return the (offset, limit) of the next page and advance."""
+
+        request = (self.offset, self.limit)
+        self.offset += self.limit
+        return request
+
+    def done(self, offset: int, limit: int, size: int) -> bool:
+        """
+        Account for a page of 'size' items requested at 'offset' with
+        'limit', returning True when it was the last one.
+        """
+
+        if size >= limit:
+            self.honored = True
+            return False
+        if size == 0 or self.honored:
+            return True
+        logger.debug(f"Page of {size} for limit {limit}, lowering the limit")
+        self.offset = offset + size
+        self.limit = size
+        self.honored = True
+        return False
+
+
+def paginate(
+    fetch_page: Callable[[int, int], List[Any]],
+    start: int = 0,
+    page_size: int = 20,
+    prefetch: int = 1,
+) -> Iterator[List[Any]]:
+    """
+    Yield pages from 'fetch_page(start, limit)' in order. One request is
+    in flight until a full page shows the server honors the limit, then
+    the window doubles with each full page up to 'prefetch' requests.
+    Paging stops as PageWindow decides, so a short listing costs no more
+    than a full page and a trailing empty one. Once the window has grown,
+    the requests in flight past the last page are wasted: at most
+    'prefetch' - 1, each for an empty page.
+    """
+
+    if prefetch < 1:
+        raise ValueError("prefetch must be at least 1")
+    pages = PageWindow(start, page_size)
+    window = 1
+
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < window:
+                    offset, limit = pages.next()
+                    future = executor.submit(fetch_page, offset, limit)
+                    pending.append((offset, limit, future))
+                offset, limit, future = pending.popleft()
+                page = future.result() or []
+                if page:
+                    yield page
+                if pages.done(offset, limit, len(page)):
+                    break
+                if len(page) >= limit:
+                    window = min(window * 2, prefetch)
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+
+async def apaginate(
+    fetch_page: Callable[[int, int], Awaitable[List[Any]]],
+    start: int = 0,
+    page_size: int = 20,
+) -> AsyncIterator[List[Any]]:
+    """
+    Yield pages from the coroutine 'fetch_page(start, limit)' in order,
+    stopping as PageWindow decides.
+    """
+
+    pages = PageWindow(start, page_size)
+    while True:
+        offset, limit = pages.next()
+        page = await fetch_page(offset, limit) or []
+        if page:
+            yield page
+        if pages.done(offset, limit, len(page)):
+            break
+
+
+@dataclass
+class Cursor:
+    """
+    Resume point of a listing: 'start' is the offset of the next item and
+    'last_id' the ID of the last item handed out. Iterators update it in
+    place, so it can be saved after stopping early and passed back later.
+    """
+
+    start: int = 0
+    last_id: Optional[Any] = None
+
+
+def iter_items(
+    fetch_page: Callable[[int, int], List[Dict[str, Any]]],
+    cursor: Cursor,
+    id_key: str,
+    page_size: int = 20,
+    prefetch: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield items from 'fetch_page' starting at 'cursor', advancing it as
+    items are yielded. When resuming with 'cursor.last_id', paging restarts
+    one item early and skips through that ID, so items shifted by newer
+    entries are neither repeated nor lost.
+    """
+
+    resync = cursor.last_id is not None and cursor.start > 0
+    offset = cursor.start - 1 if resync else cursor.start
+
+    pages = paginate(fetch_page, offset, page_size, prefetch)
+    try:
+        for page in pages:
+            first = 0
+            if resync:
+                resync = False
+                ids = [item.get(id_key) for item in page]
+                if cursor.last_id in ids:
+                    first = ids.index(cursor.last_id) + 1
+                else:
+                    logger.debug(f"Cursor item {cursor.last_id} not found")
+            for index in range(first, len(page)):
+                item = page[index]
+                cursor.start = offset + index + 1
+                cursor.last_id = item.get(id_key)
+                yield item
+            offset += len(page)
+    finally:
+        # Cancel prefetched pages when the caller stops early
+        pages.close()
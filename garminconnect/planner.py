@@ -0,0 +1,230 @@
+"""Split long date ranges into the fewest requests a range endpoint allows."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RangeEndpoint:
+    """
+    How a getter taking (startdate, enddate) can be chunked: 'max_days' is
+    the longest window the server accepts. Responses are either lists, or
+    dicts whose 'list_keys' are concatenated and 'map_keys' merged across
+    chunks. 'newest_first' endpoints list their items in reverse order.
+    Endpoints returning weekly or monthly aggregates 'align' windows to
+    those buckets (see plan), so no bucket is split between two requests.
+    """
+
+    max_days: int
+    list_keys: Tuple[str, ...] = ()
+    map_keys: Tuple[str, ...] = ()
+    newest_first: bool = False
+    align: str = "day"
+
+
+# Window limits aren't documented, so these are conservative defaults that
+# Garmin.get_range(max_days=...) can override.
+RANGE_ENDPOINTS: Dict[str, RangeEndpoint] = {
+    "get_daily_steps": RangeEndpoint(28),
+    "get_body_battery": RangeEndpoint(28),
+    "get_body_composition": RangeEndpoint(365, list_keys=("dateWeightList",)),
+    "get_weigh_ins": RangeEndpoint(
+        365, list_keys=("dailyWeightSummaries",), newest_first=True
+    ),
+    "get_blood_pressure": RangeEndpoint(
+        365, list_keys=("measurementSummaries",), newest_first=True
+    ),
+    # Ranges of endurance scores are aggregated weekly
+    "get_endurance_score": RangeEndpoint(
+        182, map_keys=("groupMap",), align="week"
+    ),
+    "get_hill_score": RangeEndpoint(28, list_keys=("hillScoreDTOList",)),
+}
+
+
+RESOLUTIONS = ("day", "week", "month")
+
+# Server-side aggregations of getters taking 'resolution', by resolution
+AGGREGATIONS = {
+    "get_race_predictions": {"day": "daily", "month": "monthly"},
+    "get_endurance_score": {
+        "day": "daily",
+        "week": "weekly",
+        "month": "monthly",
+    },
+    "get_hill_score": {"day": "daily", "week": "weekly", "month": "monthly"},
+}
+
+# Race predictions accept 'startdate' at most a year before 'enddate'
+RACE_PREDICTIONS = RangeEndpoint(366)
+
+
+def aggregation(getter: str, resolution: str) -> Tuple[str, str]:
+    """
+    Return the coarsest (bucket, server aggregation) of 'getter' that is
+    still at least as fine as 'resolution'.
+    """
+
+    if resolution not in RESOLUTIONS:
+        raise ValueError(
+            f"resolution must be one of {RESOLUTIONS!r}, got {resolution!r}"
+        )
+    available = AGGREGATIONS[getter]
+    for bucket in reversed(RESOLUTIONS[: RESOLUTIONS.index(resolution) + 1]):
+        if bucket in available:
+            return bucket, available[bucket]
+
+    raise ValueError(f"{getter} has no {resolution} aggregation")
+
+
+def _shift(day: date, bucket: str, count: int) -> date:
+    """Return the first day of the bucket 'count' after the one holding 'day'."""
+
+    if bucket == "week":
+        return day - timedelta(days=day.weekday() - 7 * count)
+    if bucket == "month":
+        months = day.year * 12 + day.month - 1 + count
+        return date(months // 12, months % 12 + 1, 1)
+
+    return day + timedelta(days=count)
+
+
+def _grid_start(day: date, bucket: str, count: int) -> date:
+    """
+    Return the first day of the window holding 'day' on the fixed grid of
+    'count' buckets, counted from 0001-01-01, which is a Monday.
+    """
+
+    if bucket == "week":
+        weeks = (day.toordinal() - 1) // 7
+        return date.fromordinal((weeks - weeks % count) * 7 + 1)
+    months = day.year * 12 + day.month - 1
+    months -= months % count
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _buckets_per_window(bucket: str, max_days: int) -> int:
+    """Most whole buckets that always fit in 'max_days', at least one."""
+
+    # Every run of months starts in some month of a four-year leap cycle
+    firsts = [date(2000 + i // 12, i % 12 + 1, 1) for i in range(48)]
+    count = 1
+    while (
+        max(
+            (_shift(first, bucket, count + 1) - first).days for first in firsts
+        )
+        <= max_days
+    ):
+        count += 1
+
+    return count
+
+
+def plan(
+    start: Union[str, date],
+    end: Union[str, date],
+    max_days: int,
+    align: str = "day",
+) -> List[Tuple[date, date]]:
+    """
+    Split 'start' through 'end' into consecutive windows of at most
+    'max_days'. With 'align' "week" (ISO, from Monday) or "month" windows
+    are runs of whole buckets on a fixed calendar grid, cut only at 'start'
+    and 'end': no aggregate bucket is split between two requests, and
+    overlapping queries request the same windows, so a cache serves them.
+    A window always holds at least one whole bucket, even if that is
+    longer than 'max_days': a month of 31 days is one monthly aggregate.
+    """
+
+    if isinstance(start, str):
+        start = date.fromisoformat(start)
+    if isinstance(end, str):
+        end = date.fromisoformat(end)
+    if end < start:
+        raise ValueError("end must not be before start")
+    if max_days < 1:
+        raise ValueError("max_days must be at least 1")
+    if align not in RESOLUTIONS:
+        raise ValueError(f"align must be one of {RESOLUTIONS!r}")
+
+    count = 1 if align == "day" else _buckets_per_window(align, max_days)
+    windows = []
+    while start <= end:
+        if align == "day":
+            last = start + timedelta(days=max_days - 1)
+        else:
+            grid = _grid_start(start, align, count)
+            last = _shift(grid, align, count) - timedelta(days=1)
+        last = min(last, end)
+        windows.append((start, last))
+        start = last + timedelta(days=1)
+
+    return windows
+
+
+def stitch(endpoint: RangeEndpoint, results: List[Any]) -> Any:
+    """
+    Combine chunk 'results' given in date order into one response. Other
+    keys are kept only when every chunk agrees on their value: those that
+    differ, such as the 'totalAverage' of get_body_composition or the
+    chunk's own dates, describe a single window and are dropped rather
+    than passed off as the whole range's.
+    """
+
+    results = [result for result in results if result is not None]
+    if not results:
+        return None
+    if endpoint.newest_first:
+        results = results[::-1]
+    if isinstance(results[0], list):
+        return [item for result in results for item in result]
+
+    stitched = {
+        key: value
+        for key, value in results[0].items()
+        if all(result.get(key) == value for result in results[1:])
+    }
+    for key in endpoint.list_keys:
+        stitched[key] = [
+            item for result in results for item in result.get(key) or ()
+        ]
+    for key in endpoint.map_keys:
+        stitched[key] = {}
+        for result in results:
+            stitched[key].update(result.get(key) or {})
+
+    return stitched
+
+
+def fetch(
+    getter: Callable[[str, str], Any],
+    endpoint: RangeEndpoint,
+    start: Union[str, date],
+    end: Union[str, date],
+    max_workers: int = 4,
+    align: Optional[str] = None,
+) -> Any:
+    """
+    Call 'getter' once per planned window in parallel and stitch. Windows
+    are aligned to 'align', by default the endpoint's.
+    """
+
+    windows = plan(start, end, endpoint.max_days, align or endpoint.align)
+    logger.debug(f"Planned {len(windows)} requests from {start} to {end}")
+    if len(windows) == 1:
+        return getter(str(windows[0][0]), str(windows[0][1]))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(
+            executor.map(
+                lambda window: getter(str(window[0]), str(window[1])),
+                windows,
+            )
+        )
+
+    return stitch(endpoint, results)
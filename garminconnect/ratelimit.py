@@ -0,0 +1,140 @@
+"""Client-wide adaptive rate limiting for Garmin Connect requests."""
+
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds of a Retry-After header, if any."""
+
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    # Only HTTP-date values need email.utils, which imports socket
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request of a Garmin instance.
+
+    The refill rate grows additively on success and is cut multiplicatively
+    on each 429, so it settles just below what the server tolerates. A 429
+    also pauses all callers for the Retry-After delay, or an exponential
+    backoff with full jitter when the server doesn't send one.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        min_rate: float = 0.2,
+        max_rate: float = 50.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.burst = burst if burst is not None else max(rate, 1.0)
+
+        self._rate = rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = 0
+        self.throttled = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> float:
+        """Current request rate in requests per second."""
+
+        return self._rate
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a token."""
+
+        return self._waiting
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._paused_until - now
+                    if wait <= 0:
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            return
+                        wait = (1 - self._tokens) / self._rate
+                    self._cond.wait(wait)
+            finally:
+                self._waiting -= 1
+
+    def on_success(self):
+        """Record a successful request, probing a slightly higher rate."""
+
+        with self._cond:
+            self._rate = min(self.max_rate, self._rate + self.increase)
+
+    def on_throttle(
+        self, attempt: int = 0, retry_after: Optional[float] = None
+    ) -> float:
+        """
+        Record a 429 for retry number 'attempt', lower the rate and pause
+        all callers. Returns the pause in seconds.
+        """
+
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        else:
+            delay = random.uniform(
+                0, min(self.backoff_cap, self.backoff_base * 2**attempt)
+            )
+
+        with self._cond:
+            self.throttled += 1
+            self._rate = max(self.min_rate, self._rate * self.decrease)
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = min(self._tokens, 1.0)
+            self._cond.notify_all()
+
+        logger.debug(
+            "Throttled by server, rate now %.2f/s, pausing %.2fs",
+            self._rate,
+            delay,
+        )
+
+        return delay
@@ -0,0 +1,208 @@
+"""Local columnar store for wellness time-value arrays."""
+
+import logging
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Rows = List[Tuple[int, float]]
+
+TIMESTAMPS = "ts.i64"
+VALUES = "val.f64"
+
+
+def _pairs(values, index: int = 1) -> Rows:
+    """Return (timestamp, value) rows from [timestamp, ...] arrays."""
+
+    return [
+        (int(row[0]), float(row[index]))
+        for row in values or ()
+        if row and row[0] is not None and row[index] is not None
+    ]
+
+
+def _daily(*series: Tuple[str, str, int]):
+    """Build an extractor reading 'key' arrays of a single-day response."""
+
+    def extract(cdate: str, response: Dict[str, Any]):
+        for name, key, index in series:
+            yield name, cdate, _pairs(response.get(key), index)
+
+    return extract
+
+
+def _body_battery(cdate: str, response: List[Dict[str, Any]]):
+    for day in response or ():
+        yield "body_battery", day["date"], _pairs(
+            day.get("bodyBatteryValuesArray")
+        )
+
+
+# Getter name -> extractor yielding (series, 'YYYY-MM-DD', rows)
+EXTRACTORS: Dict[str, Callable] = {
+    "get_heart_rates": _daily(("heart_rate", "heartRateValues", 1)),
+    "get_stress_data": _daily(("stress", "stressValuesArray", 1)),
+    "get_all_day_stress": _daily(
+        ("stress", "stressValuesArray", 1),
+        ("body_battery", "bodyBatteryValuesArray", 2),
+    ),
+    "get_body_battery": _body_battery,
+    "get_spo2_data": _daily(("spo2", "spO2HourlyAverages", 1)),
+    "get_respiration_data": _daily(
+        ("respiration", "respirationValuesArray", 1)
+    ),
+}
+
+
+def _to_ms(value: Union[int, float, date, datetime]) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    if isinstance(value, date):
+        return _to_ms(datetime(value.year, value.month, value.day))
+
+    return int(value)
+
+
+def _map(path: str):
+    """Memory-map 'path' read-only, None when it is empty."""
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class TimeSeriesStore:
+    """
+    Stores each series and calendar day as a pair of typed column files,
+    '<root>/<series>/<YYYY>/<YYYY-MM-DD>/ts.i64' (epoch milliseconds, GMT)
+    and 'val.f64'. Queries memory-map only the partitions overlapping the
+    requested range and binary search the timestamps.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+
+    def partition(self, series: str, cdate: str) -> str:
+        return os.path.join(self.root, series, cdate[:4], cdate)
+
+    def write(self, series: str, cdate: str, rows: Rows):
+        """Replace the partition of 'series' for 'cdate' with 'rows'."""
+
+        rows = sorted(rows)
+        directory = self.partition(series, cdate)
+        os.makedirs(directory, exist_ok=True)
+        columns = (
+            (TIMESTAMPS, array("q", (ts for ts, _ in rows))),
+            (VALUES, array("d", (value for _, value in rows))),
+        )
+        for name, column in columns:
+            path = os.path.join(directory, name)
+            with open(f"{path}.tmp", "wb") as f:
+                column.tofile(f)
+            os.replace(f"{path}.tmp", path)
+
+    def ingest(self, source: str, cdate: str, response) -> int:
+        """
+        Normalize the 'source' getter's response for 'cdate' into the store.
+        Returns the number of rows written.
+        """
+
+        if source not in EXTRACTORS:
+            raise ValueError(
+                f"source must be one of {tuple(EXTRACTORS)!r}, got {source!r}"
+            )
+        count = 0
+        for series, day, rows in EXTRACTORS[source](cdate, response):
+            self.write(series, day, rows)
+            count += len(rows)
+
+        return count
+
+    def sync(
+        self, garmin, source: str, startdate, enddate, max_workers: int = 4
+    ) -> int:
+        """Fetch 'source' from 'garmin' for a date range and ingest it."""
+
+        if source == "get_body_battery":
+            response = garmin.get_body_battery(str(startdate), str(enddate))
+            return self.ingest(source, str(startdate), response)
+
+        return sum(
+            self.ingest(source, cdate, response)
+            for cdate, response in garmin.fetch_range(
+                source, startdate, enddate, max_workers
+            )
+        )
+
+    def dates(self, series: str) -> List[str]:
+        """Return the stored days of 'series' in order."""
+
+        base = os.path.join(self.root, series)
+        if not os.path.isdir(base):
+            return []
+
+        return sorted(
+            day
+            for year in os.listdir(base)
+            for day in os.listdir(os.path.join(base, year))
+        )
+
+    def iter_partitions(
+        self, series: str, start, end
+    ) -> Iterator[Tuple[memoryview, memoryview]]:
+        """
+        Yield zero-copy (timestamps, values) memoryviews of each partition
+        sliced to 'start' <= timestamp <= 'end'. The views are only valid
+        until the next partition is yielded.
+        """
+
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        # Partitions are named by local calendar day, so allow a day of
+        # timezone slack on each side
+        first = datetime.fromtimestamp(start_ms / 1000, timezone.utc).date()
+        last = datetime.fromtimestamp(end_ms / 1000, timezone.utc).date()
+        first = (first - timedelta(days=1)).isoformat()
+        last = (last + timedelta(days=1)).isoformat()
+
+        for cdate in self.dates(series):
+            if not first <= cdate <= last:
+                continue
+            directory = self.partition(series, cdate)
+            ts_map = _map(os.path.join(directory, TIMESTAMPS))
+            if ts_map is None:
+                continue
+            val_map = _map(os.path.join(directory, VALUES))
+            timestamps = memoryview(ts_map).cast("q")
+            values = memoryview(val_map).cast("d")
+            lo = bisect_left(timestamps, start_ms)
+            hi = bisect_right(timestamps, end_ms)
+            views = (timestamps[lo:hi], values[lo:hi], timestamps, values)
+            try:
+                if lo < hi:
+                    yield views[0], views[1]
+            finally:
+                for view in views:
+                    view.release()
+                ts_map.close()
+                val_map.close()
+
+    def query(self, series: str, start, end) -> Tuple[array, array]:
+        """
+        Return (timestamps, values) arrays of 'series' between 'start' and
+        'end' (datetimes, dates or epoch milliseconds), inclusive.
+        """
+
+        timestamps, values = array("q"), array("d")
+        for ts_view, val_view in self.iter_partitions(series, start, end):
+            timestamps.frombytes(ts_view.cast("B"))
+            values.frombytes(val_view.cast("B"))
+
+        return timestamps, values
@@ -0,0 +1,207 @@
+"""Incremental sync of daily metrics and activities with high-water marks."""
+
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS = (
+    "get_user_summary",
+    "get_sleep_data",
+    "get_hrv_data",
+    "get_stress_data",
+    "get_heart_rates",
+)
+
+
+class SyncEngine:
+    """
+    Fetch only what changed since the previous run of an account.
+
+    The state file '<state_dir>/<display_name>.json' records, per metric,
+    the last day that is final ('synced'), and the start time of the newest
+    activity seen. A run fetches every day after that mark through today;
+    the last 'mutable_days' days are fetched again on the next run because
+    Garmin keeps filling them in (late sleep, HRV or device syncs).
+
+    Activities are listed newest first by start time, and one recorded
+    days ago may be uploaded after newer ones. So activities are read back
+    to 'activity_overlap_days' before the mark, and those already handed
+    out are recognized by the IDs kept for that window.
+    """
+
+    def __init__(
+        self,
+        garmin,
+        state_dir: str,
+        metrics: Iterable[str] = DEFAULT_METRICS,
+        mutable_days: int = 2,
+        initial_days: int = 7,
+        max_workers: int = 4,
+        activity_overlap_days: int = 7,
+    ):
+        if mutable_days < 0:
+            raise ValueError("mutable_days must not be negative")
+        if initial_days < 1:
+            raise ValueError("initial_days must be at least 1")
+        if activity_overlap_days < 0:
+            raise ValueError("activity_overlap_days must not be negative")
+
+        self.garmin = garmin
+        self.state_dir = os.path.expanduser(state_dir)
+        self.metrics = tuple(metrics)
+        self.mutable_days = mutable_days
+        self.initial_days = initial_days
+        self.max_workers = max_workers
+        self.activity_overlap = timedelta(days=activity_overlap_days)
+
+        for metric in self.metrics:
+            if metric not in garmin.RANGE_METRICS:
+                raise ValueError(
+                    f"metric must be one of {garmin.RANGE_METRICS!r}, "
+                    f"got {metric!r}"
+                )
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.state_dir, f"{self.garmin.display_name}.json")
+
+    def load_state(self) -> Dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return {"synced": {}, "activity_start": None, "activities": {}}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def save_state(self, state: Dict[str, Any]):
+        """Write 'state' via a temporary file renamed into place."""
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.state_path)
+
+    def sync_metric(
+        self,
+        state: Dict[str, Any],
+        metric: str,
+        today: date,
+        on_day: Optional[Callable[[str, str, Any], None]] = None,
+    ) -> int:
+        """Fetch the pending days of 'metric'; returns the number fetched."""
+
+        synced = state["synced"].get(metric)
+        if synced is None:
+            start = today - timedelta(days=self.initial_days - 1)
+        else:
+            start = date.fromisoformat(synced) + timedelta(days=1)
+        if start > today:
+            return 0
+
+        count = 0
+        for cdate, response in self.garmin.fetch_range(
+            metric, start, today, self.max_workers
+        ):
+            if on_day is not None:
+                on_day(metric, cdate, response)
+            count += 1
+
+        # Days inside the mutable window stay pending for the next run
+        final = today - timedelta(days=self.mutable_days)
+        if synced is None or final.isoformat() > synced:
+            state["synced"][metric] = final.isoformat()
+        self.save_state(state)
+        logger.debug(f"Synced {count} days of {metric} up to {today}")
+
+        return count
+
+    def sync_activities(
+        self,
+        state: Dict[str, Any],
+        today: date,
+        on_activity: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> int:
+        """Fetch activities not handed out before, see the class docstring."""
+
+        mark = state.get("activity_start")
+        # activityId -> start time of the activities inside the overlap
+        seen = dict(state.get("activities") or {})
+        startdate = cutoff = None
+        if mark is None:
+            startdate = today - timedelta(days=self.initial_days - 1)
+        else:
+            cutoff = datetime.fromisoformat(mark) - self.activity_overlap
+
+        newest, count = mark, 0
+        for activity in self.garmin.iter_activities(startdate=startdate):
+            started = _start_time(activity)
+            when = datetime.fromisoformat(started)
+            if cutoff is not None and when < cutoff:
+                break
+            key = str(activity["activityId"])
+            if key in seen:
+                continue
+            if on_activity is not None:
+                on_activity(activity)
+            seen[key] = started
+            if newest is None or when > datetime.fromisoformat(newest):
+                newest = started
+            count += 1
+
+        # Only move the mark once the whole gap has been handed out
+        if newest is not None:
+            keep = datetime.fromisoformat(newest) - self.activity_overlap
+            seen = {
+                key: started
+                for key, started in seen.items()
+                if datetime.fromisoformat(started) >= keep
+            }
+        # States from before start-time marks kept the newest activityId
+        state.pop("activity_id", None)
+        state["activity_start"] = newest
+        state["activities"] = seen
+        self.save_state(state)
+        logger.debug(f"Synced {count} activities, newest from {newest}")
+
+        return count
+
+    def run(
+        self,
+        today: Optional[Union[str, date]] = None,
+        on_day: Optional[Callable[[str, str, Any], None]] = None,
+        on_activity: Optional[Callable[[Dict[str, Any]], None]] = None,
+        activities: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Sync every metric and, unless 'activities' is False, new activities.
+        'on_day(metric, "YYYY-MM-DD", response)' and 'on_activity(activity)'
+        receive the fetched data. Returns the number of items fetched per
+        metric and under "activities".
+        """
+
+        if today is None:
+            today = date.today()
+        elif isinstance(today, str):
+            today = date.fromisoformat(today)
+
+        state = self.load_state()
+        counts = {
+            metric: self.sync_metric(state, metric, today, on_day)
+            for metric in self.metrics
+        }
+        if activities:
+            counts["activities"] = self.sync_activities(
+                state, today, on_activity
+            )
+
+        return counts
+
+
+def _start_time(activity: Dict[str, Any]) -> str:
+    # Listed as "YYYY-MM-DD HH:MM:SS", which fromisoformat reads
+    return activity.get("startTimeGMT") or activity["startTimeLocal"]
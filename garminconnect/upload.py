@@ -0,0 +1,98 @@
+"""Concurrent bulk upload of activity files."""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UploadResult:
+    """
+    Outcome of uploading one file: 'uploaded', 'duplicate' (Garmin already
+    has the activity), 'invalid' (unsupported file type) or 'failed'.
+    """
+
+    path: str
+    status: str
+    attempts: int = 0
+    response: Optional[Any] = None
+    error: Optional[str] = None
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    response = getattr(getattr(error, "error", None), "response", None)
+
+    return getattr(response, "status_code", None)
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    True for 5xx and connection failures, worth another attempt. 429s are
+    not: the client already retried them with backoff (see Garmin._send),
+    so retrying the upload as well would only multiply the attempts.
+    """
+
+    from requests.exceptions import ConnectionError, Timeout
+
+    from . import GarminConnectConnectionError
+
+    if isinstance(
+        error, (ConnectionError, Timeout, GarminConnectConnectionError)
+    ):
+        return True
+    status = _status_code(error)
+
+    return status is not None and status >= 500
+
+
+def upload_file(
+    upload: Callable[[str], Any],
+    path: str,
+    retries: int = 2,
+    backoff: float = 1.0,
+) -> UploadResult:
+    """
+    Upload 'path' with 'upload', retrying transient failures (see
+    _is_transient). Anything else, such as a 4xx for a bad file, fails
+    at once.
+    """
+
+    # Imported here as the package imports this module
+    from . import GarminConnectInvalidFileFormatError
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = upload(path)
+        except GarminConnectInvalidFileFormatError as e:
+            return UploadResult(path, "invalid", attempt, error=str(e))
+        except Exception as e:
+            if _status_code(e) == 409:
+                return UploadResult(path, "duplicate", attempt, error=str(e))
+            if not _is_transient(e) or attempt > retries:
+                logger.warning(f"Failed to upload {path}: {e}")
+                return UploadResult(path, "failed", attempt, error=str(e))
+            logger.debug(f"Retrying upload of {path} after: {e}")
+            time.sleep(backoff * 2 ** (attempt - 1))
+        else:
+            return UploadResult(path, "uploaded", attempt, response)
+
+
+def upload_files(
+    upload: Callable[[str], Any],
+    paths: Iterable[str],
+    max_workers: int = 4,
+    retries: int = 2,
+    backoff: float = 1.0,
+) -> Iterator[UploadResult]:
+    """Upload 'paths' with a bounded worker pool, yielding results in order."""
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(
+            lambda path: upload_file(upload, path, retries, backoff), paths
+        )
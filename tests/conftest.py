@@ -76,3 +76,81 @@ def vcr_config():
         "before_record_request": sanitize_request,
         "before_record_response": sanitize_response,
     }
+
+
+class FakeResponse:
+    """Minimal streamed response over an in-memory body."""
+
+    status_code = 200
+
+    def __init__(self, body, headers=None):
+        self.content = body
+        self.headers = headers or {"Content-Length": str(len(body))}
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeGarth:
+    """Offline stand-in for garth.Client answering from a handler."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def connectapi(self, path, **kwargs):
+        self.calls.append((path, kwargs.get("params")))
+        body = self.handler(path, kwargs.get("params") or {})
+        self._dispatch(body, kwargs)
+        return body
+
+    def request(self, method, subdomain, path, api=False, **kwargs):
+        body = self.connectapi(path, **kwargs)
+        if body is None:
+            response = FakeResponse(b"")
+            response.status_code = 204
+            return response
+        return FakeResponse(json.dumps(body).encode())
+
+    def download(self, path, **kwargs):
+        self.calls.append((path, kwargs.get("params")))
+        body = self.handler(path, kwargs.get("params") or {})
+        self._dispatch(body, kwargs)
+        return body
+
+    def _dispatch(self, body, kwargs):
+        """Call response hooks the way requests does."""
+
+        hook = (kwargs.get("hooks") or {}).get("response")
+        if hook is None:
+            return
+        if not isinstance(body, FakeResponse):
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode()
+            body = FakeResponse(body)
+        hook(body, stream=kwargs.get("stream", False))
+
+    def get(self, subdomain, path, **kwargs):
+        body = self.download(path, **kwargs)
+        return body if isinstance(body, FakeResponse) else FakeResponse(body)
+
+
+@pytest.fixture
+def offline_garmin():
+    """Return a logged-in looking Garmin whose requests hit a handler."""
+
+    from garminconnect import Garmin
+    from garminconnect.ratelimit import RateLimiter
+
+    def factory(handler):
+        garmin = Garmin("email", "password", rate_limiter=RateLimiter(1000))
+        garmin.garth = FakeGarth(handler)
+        garmin.display_name = "display_name"
+        return garmin
+
+    return factory
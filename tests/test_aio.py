@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+import pytest
+from garth.auth_tokens import OAuth1Token, OAuth2Token
+
+httpx = pytest.importorskip("httpx")
+
+from garminconnect import AsyncGarmin
+
+DATE = "2023-07-01"
+
+
+def oauth2_token(expires_at):
+    return OAuth2Token(
+        scope="",
+        jti="jti",
+        token_type="Bearer",
+        access_token="access",
+        refresh_token="refresh",
+        expires_in=3600,
+        expires_at=expires_at,
+        refresh_token_expires_in=7200,
+        refresh_token_expires_at=expires_at + 3600,
+    )
+
+
+def make_client(handler):
+    api = AsyncGarmin(transport=httpx.MockTransport(handler))
+    api.garth.oauth1_token = OAuth1Token("token", "secret")
+    api.garth.oauth2_token = oauth2_token(int(time.time()) + 3600)
+    api.display_name = "display_name"
+    return api
+
+
+def test_async_requests_share_pool():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"calendarDate": DATE})
+
+    async def main():
+        async with make_client(handler) as api:
+            return await asyncio.gather(
+                api.get_hrv_data(DATE),
+                api.get_sleep_data(DATE),
+                api.get_spo2_data(DATE),
+            )
+
+    results = asyncio.run(main())
+
+    assert [r["calendarDate"] for r in results] == [DATE] * 3
+    assert {r.headers["Authorization"] for r in seen} == {"Bearer access"}
+    assert seen[1].url.path.endswith("/dailySleepData/display_name")
+
+
+def test_async_refreshes_expired_token_once():
+    refreshes = []
+
+    def handler(request):
+        return httpx.Response(200, json={})
+
+    async def main():
+        api = make_client(handler)
+        api.garth.oauth2_token = oauth2_token(0)
+
+        def refresh():
+            refreshes.append(1)
+            api.garth.oauth2_token = oauth2_token(int(time.time()) + 3600)
+
+        api.garth.refresh_oauth2 = refresh
+        async with api:
+            await asyncio.gather(*(api.get_hrv_data(DATE) for _ in range(5)))
+
+    asyncio.run(main())
+
+    assert len(refreshes) == 1
+
+
+def test_async_too_many_requests():
+    from garminconnect import GarminConnectTooManyRequestsError
+
+    async def main():
+        async with make_client(lambda r: httpx.Response(429)) as api:
+            await api.get_hrv_data(DATE)
+
+    with pytest.raises(GarminConnectTooManyRequestsError):
+        asyncio.run(main())
+
+
+def test_async_requests_are_instrumented():
+    def handler(request):
+        return httpx.Response(200, json={"calendarDate": DATE})
+
+    async def main():
+        async with make_client(handler) as api:
+            await asyncio.gather(
+                api.get_hrv_data(DATE), api.get_sleep_data(DATE)
+            )
+            return api.instrumentation.snapshot()
+
+    snapshot = asyncio.run(main())
+
+    assert set(snapshot) == {"get_hrv_data", "get_sleep_data"}
+    assert snapshot["get_hrv_data"]["statuses"] == {200: 1}
+    assert snapshot["get_hrv_data"]["bytes"] == len(
+        '{"calendarDate":"2023-07-01"}'
+    )
+
+
+def test_async_getters_match_sync(offline_garmin):
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, dict(request.url.params)))
+        return httpx.Response(200, json={"privacyProtected": False})
+
+    calls = [
+        ("get_user_summary", (DATE,)),
+        ("get_sleep_data", (DATE,)),
+        ("get_rhr_day", (DATE,)),
+        ("get_body_battery", (DATE, "2023-07-03")),
+        ("get_activity_details", (11, 100)),
+    ]
+
+    async def main():
+        async with make_client(handler) as api:
+            for name, args in calls:
+                await getattr(api, name)(*args)
+
+    asyncio.run(main())
+    garmin = offline_garmin(lambda path, params: {"privacyProtected": False})
+    for name, args in calls:
+        getattr(garmin, name)(*args)
+
+    expected = [
+        (path, {k: str(v) for k, v in (params or {}).items()})
+        for path, params in garmin.garth.calls
+    ]
+    assert seen == expected
+
+
+def test_async_activities_by_date_pages():
+    def handler(request):
+        start = int(request.url.params["start"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(
+            200,
+            json=[
+                {"activityId": i} for i in range(start, min(start + limit, 25))
+            ],
+        )
+
+    async def main():
+        async with make_client(handler) as api:
+            activities = await api.get_activities_by_date(
+                DATE, DATE, typed=True
+            )
+            return activities, api.instrumentation.snapshot()
+
+    activities, snapshot = asyncio.run(main())
+
+    assert [a.activity_id for a in activities] == list(range(25))
+    assert set(snapshot) == {"get_activities_by_date"}
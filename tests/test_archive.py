@@ -0,0 +1,75 @@
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from garminconnect.archive import extract_member, iter_members
+
+with open("tests/12129115726_ACTIVITY.fit", "rb") as f:
+    FIT = f.read()
+
+
+def make_zip(compression):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        archive.writestr("12129115726_ACTIVITY.fit", FIT)
+        archive.writestr("readme.txt", b"not an activity")
+    return buffer.getvalue()
+
+
+def test_stored_members_are_views():
+    data = make_zip(zipfile.ZIP_STORED)
+    members = list(iter_members(data))
+
+    assert [member.name for member in members] == ["12129115726_ACTIVITY.fit"]
+    content = members[0].read()
+    assert content.obj is data
+    assert content == FIT
+    assert len(list(iter_members(data, extensions=None))) == 2
+
+
+@pytest.mark.parametrize(
+    "compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED]
+)
+def test_extract_member(tmp_path, compression):
+    (member,) = iter_members(make_zip(compression))
+    path = tmp_path / "activity.fit"
+
+    assert member.read() == FIT
+    assert extract_member(member, str(path), chunk_size=4096) == len(FIT)
+    assert path.read_bytes() == FIT
+
+
+def test_corrupt_member_is_not_written(tmp_path):
+    data = bytearray(make_zip(zipfile.ZIP_STORED))
+    data[data.index(FIT[:64]) + 100] ^= 0xFF
+    (member,) = iter_members(data)
+
+    with pytest.raises(zipfile.BadZipFile):
+        extract_member(member, str(tmp_path / "activity.fit"))
+    assert not list(tmp_path.iterdir())
+
+
+def test_unsupported_members_are_bad_zips():
+    (member,) = iter_members(make_zip(zipfile.ZIP_BZIP2))
+    with pytest.raises(zipfile.BadZipFile):
+        member.read()
+    with pytest.raises(zipfile.BadZipFile):
+        list(member.iter_chunks())
+
+    data = bytearray(make_zip(zipfile.ZIP_STORED))
+    # Set the encryption flag of the first member's central directory entry
+    data[data.index(b"PK\x01\x02") + 8] |= 0x1
+    with pytest.raises(zipfile.BadZipFile):
+        list(iter_members(data))
+
+
+def test_extract_activity(offline_garmin, tmp_path):
+    garmin = offline_garmin(
+        lambda path, params: make_zip(zipfile.ZIP_DEFLATED)
+    )
+    paths = garmin.extract_activity(12129115726, str(tmp_path))
+
+    assert garmin.garth.calls[0][0].endswith("/12129115726")
+    assert [Path(path).read_bytes() for path in paths] == [FIT]
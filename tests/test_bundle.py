@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from garminconnect import ActivityBundle, DailySnapshot
+
+
+def test_activity_bundle_fetches_parts_concurrently(offline_garmin):
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def handler(path, params):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        if path.endswith("/2/weather"):
+            raise RuntimeError("no weather")
+        return {"path": path, "params": params}
+
+    garmin = offline_garmin(handler)
+    bundles = garmin.get_activity_bundle([1, 2], max_workers=16)
+
+    assert [bundle.activity_id for bundle in bundles] == ["1", "2"]
+    assert isinstance(bundles[0], ActivityBundle)
+    assert bundles[0].ok
+    assert set(bundles[0].parts) == set(garmin.ACTIVITY_PARTS)
+    assert bundles[0]["splits"]["path"].endswith("/1/splits")
+    assert bundles[0]["gear"]["params"] == {"activityId": "1"}
+    assert list(bundles[1].errors) == ["weather"]
+    assert str(bundles[1].errors["weather"]) == "no weather"
+    assert len(garmin.garth.calls) == 16
+    assert peak[0] > 1
+
+
+def test_activity_bundle_selected_parts(offline_garmin):
+    garmin = offline_garmin(lambda path, params: path)
+    (bundle,) = garmin.get_activity_bundle([7], parts=["weather"])
+
+    assert bundle.parts == {"weather": garmin.garth.calls[0][0]}
+    with pytest.raises(ValueError):
+        garmin.get_activity_bundle([7], parts=["laps"])
+
+
+def test_daily_snapshot(offline_garmin):
+    def handler(path, params):
+        time.sleep(0.01)
+        if "dailySleepData" in path:
+            raise RuntimeError("no sleep data")
+        return {"path": path, "params": params, "privacyProtected": False}
+
+    garmin = offline_garmin(handler)
+    started = time.perf_counter()
+    snapshot = garmin.get_daily_snapshot("2023-07-01", max_workers=32)
+    elapsed = time.perf_counter() - started
+
+    assert isinstance(snapshot, DailySnapshot)
+    assert snapshot.cdate == "2023-07-01"
+    assert snapshot.sleep is None
+    assert list(snapshot.errors) == ["sleep"]
+    assert snapshot.hrv["path"].endswith("/2023-07-01")
+    assert snapshot.body_composition["params"] == {
+        "startDate": "2023-07-01",
+        "endDate": "2023-07-01",
+    }
+    assert len(garmin.garth.calls) == len(garmin.SNAPSHOT_PARTS)
+    assert elapsed < 0.01 * len(garmin.SNAPSHOT_PARTS)
+
+
+def test_daily_snapshot_include(offline_garmin):
+    garmin = offline_garmin(lambda path, params: {"path": path})
+    snapshot = garmin.get_daily_snapshot("2023-07-01", include=["hrv"])
+
+    assert snapshot.ok
+    assert snapshot.hrv is not None and snapshot.stats is None
+    assert len(garmin.garth.calls) == 1
+    with pytest.raises(ValueError):
+        garmin.get_daily_snapshot("2023-07-01", include=["mood"])
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+
+from garminconnect.cache import IMMUTABLE, CacheRule, ResponseCache
+
+TODAY = date(2023, 7, 10)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", today=lambda: TODAY)
+    yield cache
+    cache.close()
+
+
+def test_ttl_rules(cache):
+    assert cache.ttl("/hrv-service/hrv/2023-07-01", None) == IMMUTABLE
+    assert cache.ttl("/hrv-service/hrv/2023-07-10", None) == 300
+    assert (
+        cache.ttl(
+            "/wellness-service/wellness/dailySleepData/name",
+            {"date": "2023-07-01"},
+        )
+        == IMMUTABLE
+    )
+    assert cache.ttl("/device-service/deviceregistration/devices", None) == 600
+    assert cache.ttl("/activitylist-service/activities/search", None) == 0
+
+
+def test_garmin_serves_past_days_from_cache(offline_garmin, cache):
+    garmin = offline_garmin(lambda path, params: {"path": path})
+    garmin.cache = cache
+
+    first = garmin.get_hrv_data("2023-07-01")
+    second = garmin.get_hrv_data("2023-07-01")
+    garmin.get_activities(0, 20)
+    garmin.get_activities(0, 20)
+
+    assert first == second == {"path": "/hrv-service/hrv/2023-07-01"}
+    assert len(garmin.garth.calls) == 3
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path, today=lambda: TODAY)
+    cache.set("me", "/hrv-service/hrv/2023-07-01", None, {"a": 1})
+    cache.close()
+
+    cache = ResponseCache(path, today=lambda: TODAY)
+    assert cache.get("me", "/hrv-service/hrv/2023-07-01") == (True, {"a": 1})
+    assert cache.get("other", "/hrv-service/hrv/2023-07-01") == (False, None)
+    cache.close()
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(
+        tmp_path / "cache.sqlite",
+        max_bytes=100,
+        rules=[CacheRule(r"^/", ttl=60)],
+    )
+    for i in range(5):
+        cache.set(None, f"/item/{i}", None, "x" * 30)
+    cache.get(None, "/item/3")
+    cache.set(None, "/item/5", None, "x" * 30)
+
+    assert cache.stats()["bytes"] <= 100
+    assert cache.get(None, "/item/3")[0]
+    assert not cache.get(None, "/item/0")[0]
+    assert cache.evictions >= 3
+    cache.close()
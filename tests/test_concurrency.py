@@ -0,0 +1,190 @@
+import threading
+import time
+
+import pytest
+
+from garminconnect import Cursor
+
+DATE = "2023-07-01"
+
+
+def test_fetch_range_yields_in_date_order(offline_garmin):
+    def handler(path, params):
+        cdate = path.rsplit("/", 1)[-1]
+        # Make earlier days finish last to exercise reordering
+        time.sleep(0.01 * (5 - int(cdate[-1])))
+        return {"calendarDate": cdate}
+
+    garmin = offline_garmin(handler)
+    results = list(
+        garmin.fetch_range("get_hrv_data", DATE, "2023-07-05", max_workers=3)
+    )
+
+    assert [cdate for cdate, _ in results] == [
+        "2023-07-01",
+        "2023-07-02",
+        "2023-07-03",
+        "2023-07-04",
+        "2023-07-05",
+    ]
+    assert all(r["calendarDate"] == cdate for cdate, r in results)
+
+
+def test_fetch_range_is_bounded(offline_garmin):
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def handler(path, params):
+        with lock:
+            active.append(path)
+            peak.append(len(active))
+        time.sleep(0.005)
+        with lock:
+            active.remove(path)
+        return {}
+
+    garmin = offline_garmin(handler)
+    results = list(
+        garmin.fetch_range("get_spo2_data", DATE, "2023-07-20", max_workers=2)
+    )
+
+    assert len(results) == 20
+    assert max(peak) <= 2
+
+
+def test_fetch_range_rejects_unknown_metric(offline_garmin):
+    garmin = offline_garmin(lambda path, params: {})
+    # Raised by the call itself, before anything is iterated
+    with pytest.raises(ValueError):
+        garmin.fetch_range("upload_activity", DATE, DATE)
+    with pytest.raises(ValueError):
+        garmin.fetch_range("get_hrv_data", DATE, "not a date")
+    assert garmin.garth.calls == []
+
+
+def activity_pages(total):
+    def handler(path, params):
+        start, limit = int(params["start"]), int(params["limit"])
+        return [
+            {"activityId": total - i}
+            for i in range(start, min(start + limit, total))
+        ]
+
+    return handler
+
+
+def test_activities_by_date_skips_trailing_empty_page(offline_garmin):
+    garmin = offline_garmin(activity_pages(45))
+    activities = garmin.get_activities_by_date(
+        DATE, "2023-07-31", page_size=20, prefetch=1
+    )
+
+    assert [a["activityId"] for a in activities] == list(range(45, 0, -1))
+    assert len(garmin.garth.calls) == 3
+
+
+def test_prefetch_overshoots_by_at_most_the_window(offline_garmin):
+    for prefetch in (2, 4, 8):
+        garmin = offline_garmin(activity_pages(45))
+        activities = garmin.get_activities_by_date(
+            DATE, "2023-07-31", page_size=20, prefetch=prefetch
+        )
+
+        assert [a["activityId"] for a in activities] == list(range(45, 0, -1))
+        # 3 pages with data, then whichever empty pages already started
+        assert 3 <= len(garmin.garth.calls) <= 3 + prefetch - 1
+
+
+def test_short_listing_costs_two_requests(offline_garmin):
+    garmin = offline_garmin(activity_pages(5))
+    activities = garmin.get_activities_by_date(DATE, "2023-07-31")
+
+    assert len(activities) == 5
+    assert len(garmin.garth.calls) == 2
+
+
+def test_server_capped_limit_is_followed(offline_garmin):
+    handler = activity_pages(45)
+
+    def capped(path, params):
+        return handler(path, {**params, "limit": min(int(params["limit"]), 7)})
+
+    garmin = offline_garmin(capped)
+    activities = garmin.get_activities_by_date(DATE, "2023-07-31", prefetch=4)
+
+    assert [a["activityId"] for a in activities] == list(range(45, 0, -1))
+    assert {p["limit"] for _, p in garmin.garth.calls[1:]} == {"7"}
+
+
+def test_iter_activities_by_date_prefetches_in_order(offline_garmin):
+    garmin = offline_garmin(activity_pages(1000))
+    activities = garmin.iter_activities_by_date(
+        DATE, "2023-07-31", page_size=50, prefetch=4
+    )
+
+    assert [a["activityId"] for a in activities] == list(range(1000, 0, -1))
+    assert all(params["startDate"] == DATE for _, params in garmin.garth.calls)
+
+
+def test_iter_activities_stops_early(offline_garmin):
+    garmin = offline_garmin(activity_pages(1000))
+    cursor = Cursor()
+    for activity in garmin.iter_activities(page_size=10, cursor=cursor):
+        if activity["activityId"] == 986:
+            break
+
+    assert len(garmin.garth.calls) == 2
+    assert cursor == Cursor(start=15, last_id=986)
+
+
+def test_typed_iter_activities_closes_pages(offline_garmin):
+    garmin = offline_garmin(activity_pages(1000))
+    cursor = Cursor()
+    activities = garmin.iter_activities(
+        page_size=10, prefetch=4, cursor=cursor, typed=True
+    )
+    first = [next(activities) for _ in range(25)]
+    activities.close()
+    calls = len(garmin.garth.calls)
+
+    assert first[-1].activity_id == 976
+    assert list(activities) == []
+    time.sleep(0.05)
+    assert len(garmin.garth.calls) == calls
+    assert cursor == Cursor(start=25, last_id=976)
+
+
+def test_iter_activities_resumes_after_new_uploads(offline_garmin):
+    garmin = offline_garmin(activity_pages(30))
+    cursor = Cursor()
+    first = [
+        a["activityId"]
+        for _, a in zip(
+            range(12), garmin.iter_activities(page_size=10, cursor=cursor)
+        )
+    ]
+
+    # Two new activities push everything down the newest-first listing
+    garmin.garth.handler = activity_pages(32)
+    rest = [a["activityId"] for a in garmin.iter_activities(cursor=cursor)]
+
+    assert first == list(range(30, 18, -1))
+    assert rest == list(range(18, 0, -1))
+
+
+def test_get_goals_pages_from_one(offline_garmin):
+    def handler(path, params):
+        start, limit = int(params["start"]), int(params["limit"])
+        return [{"id": i} for i in range(start, min(start + limit, 36))]
+
+    garmin = offline_garmin(handler)
+    goals = garmin.get_goals("past", limit=10)
+
+    assert [g["id"] for g in goals] == list(range(1, 36))
+    assert [p["start"] for _, p in garmin.garth.calls] == [
+        "1",
+        "11",
+        "21",
+        "31",
+    ]
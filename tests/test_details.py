@@ -0,0 +1,139 @@
+import json
+import math
+import tracemalloc
+
+import pytest
+
+from garminconnect.details import (
+    decode_details,
+    decode_details_naive,
+    iter_details,
+)
+
+DETAILS = {
+    "metricDescriptors": [
+        {"metricsIndex": 1, "key": "directHeartRate"},
+        {"metricsIndex": 0, "key": "directTimestamp"},
+        {"metricsIndex": 2, "key": "directSpeed"},
+    ],
+    "activityDetailMetrics": [
+        {"metrics": [1000.0, 120.0, 2.5]},
+        {"metrics": [2000.0, None, 2.7]},
+        {"metrics": [3000.0, 125.0]},
+    ],
+}
+
+
+def as_list(column):
+    return [None if math.isnan(value) else value for value in column]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_decode_details_columns(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    columns = decode_details(DETAILS, use_numpy=use_numpy)
+
+    assert list(columns) == [
+        "directTimestamp",
+        "directHeartRate",
+        "directSpeed",
+    ]
+    assert as_list(columns["directTimestamp"]) == [1000.0, 2000.0, 3000.0]
+    assert as_list(columns["directHeartRate"]) == [120.0, None, 125.0]
+    assert as_list(columns["directSpeed"]) == [2.5, 2.7, None]
+    assert {
+        key: as_list(column)
+        for key, column in decode_details_naive(DETAILS).items()
+    } == {key: as_list(column) for key, column in columns.items()}
+
+
+def test_decode_details_selected_keys():
+    columns = decode_details(DETAILS, keys=["directSpeed"], use_numpy=False)
+    assert list(columns) == ["directSpeed"]
+
+    with pytest.raises(KeyError):
+        decode_details(DETAILS, keys=["directPower"])
+
+    assert decode_details({}, use_numpy=False) == {}
+
+
+def test_get_activity_metrics(offline_garmin):
+    garmin = offline_garmin(lambda path, params: DETAILS)
+    columns = garmin.get_activity_metrics(12345, maxchart=10000)
+
+    assert as_list(columns["directHeartRate"]) == [120.0, None, 125.0]
+    assert garmin.garth.calls[0][1]["maxChartSize"] == "10000"
+
+
+def chunked(body, size):
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+STREAMED = {
+    "activityId": 12345,
+    "measurementCount": 3,
+    **DETAILS,
+    "geoPolylineDTO": {
+        "startPoint": {"lat": 52.1, "lon": 4.3},
+        "polyline": [{"lat": 52.1, "lon": 4.3}, {"lat": 52.2, "lon": 4.25}],
+    },
+    "heartRateDTOs": None,
+    "detailsAvailable": True,
+}
+
+
+@pytest.mark.parametrize("size", [1, 7, 1 << 16])
+def test_iter_details_events(size):
+    body = json.dumps(STREAMED, indent=1).encode()
+    events = list(iter_details(chunked(body, size)))
+
+    assert events == [
+        ("field", ("activityId", 12345)),
+        ("field", ("measurementCount", 3)),
+        ("descriptors", DETAILS["metricDescriptors"]),
+        ("sample", [1000.0, 120.0, 2.5]),
+        ("sample", [2000.0, None, 2.7]),
+        ("sample", [3000.0, 125.0]),
+        ("field", ("geoPolylineDTO.startPoint", {"lat": 52.1, "lon": 4.3})),
+        ("polyline", {"lat": 52.1, "lon": 4.3}),
+        ("polyline", {"lat": 52.2, "lon": 4.25}),
+        ("field", ("heartRateDTOs", None)),
+        ("field", ("detailsAvailable", True)),
+    ]
+
+
+def test_iter_details_rejects_truncated_body():
+    body = json.dumps(STREAMED).encode()
+    with pytest.raises(ValueError):
+        list(iter_details(chunked(body[:-40], 16)))
+
+
+def test_iter_details_memory_is_flat():
+    samples = 50000
+
+    def body():
+        yield b'{"metricDescriptors": [], "activityDetailMetrics": ['
+        for i in range(samples):
+            sep = b"," if i else b""
+            yield sep + b'{"metrics": [%d.0, 120.0, 3.25]}' % i
+        yield b"]}"
+
+    size = sum(len(chunk) for chunk in body())
+    tracemalloc.start()
+    count = sum(event == "sample" for event, _ in iter_details(body()))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == samples
+    assert peak < size / 20
+
+
+def test_iter_activity_details(offline_garmin):
+    body = json.dumps(STREAMED).encode()
+    garmin = offline_garmin(lambda path, params: body)
+    events = list(garmin.iter_activity_details(12345, maxchart=10000))
+
+    assert sum(event == "sample" for event, _ in events) == 3
+    assert garmin.garth.calls[0][0].endswith("/12345/details")
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from conftest import FakeResponse
+
+from garminconnect import Garmin
+from garminconnect.export import ActivityExporter, IncompleteDownloadError
+
+ORIGINAL = Garmin.ActivityDownloadFormat.ORIGINAL
+
+
+def body_for(path, params):
+    return f"zip of {path.rsplit('/', 1)[-1]}".encode() * 1000
+
+
+def test_export_streams_files_and_manifest(offline_garmin, tmp_path):
+    garmin = offline_garmin(body_for)
+    results = garmin.export_activities(tmp_path, [1, 2, 3], max_workers=2)
+
+    assert [r.status for r in results] == ["downloaded"] * 3
+    assert (tmp_path / "2.zip").read_bytes() == body_for("/2", {})
+    assert not list(tmp_path.glob("*.part"))
+    manifest = [
+        json.loads(line)
+        for line in (tmp_path / "manifest.jsonl").read_text().splitlines()
+    ]
+    assert {m["activity_id"] for m in manifest} == {"1", "2", "3"}
+    assert all(m["format"] == "ORIGINAL" for m in manifest)
+
+
+def test_export_consumes_ids_lazily(offline_garmin, tmp_path):
+    garmin = offline_garmin(body_for)
+    exporter = ActivityExporter(garmin, tmp_path, ORIGINAL, max_workers=2)
+    taken = []
+
+    def ids():
+        for activity_id in range(1000):
+            taken.append(activity_id)
+            yield activity_id
+
+    results = exporter.export(ids())
+    next(results)
+    results.close()
+
+    assert len(taken) <= 2 * 2
+    assert len(garmin.garth.calls) <= 2 * 2
+
+
+def test_export_resumes_and_redownloads_damaged(offline_garmin, tmp_path):
+    garmin = offline_garmin(body_for)
+    garmin.export_activities(tmp_path, [1, 2])
+    (tmp_path / "2.zip").write_bytes(b"truncated")
+    garmin.garth.calls.clear()
+
+    results = garmin.export_activities(tmp_path, [1, 2, 3])
+
+    assert [r.status for r in results] == [
+        "skipped",
+        "downloaded",
+        "downloaded",
+    ]
+    assert [path for path, _ in garmin.garth.calls] == [
+        "/download-service/files/activity/2",
+        "/download-service/files/activity/3",
+    ]
+
+
+def test_short_download_is_discarded(offline_garmin, tmp_path):
+    def handler(path, params):
+        return FakeResponse(b"abc", {"Content-Length": "10"})
+
+    garmin = offline_garmin(handler)
+    with pytest.raises(IncompleteDownloadError):
+        garmin.download_activity_to(1, tmp_path / "1.zip", ORIGINAL)
+    assert not list(tmp_path.iterdir())
+
+    results = garmin.export_activities(tmp_path, [1])
+    assert results[0].status == "failed"
+    assert not (tmp_path / "manifest.jsonl").exists()
@@ -0,0 +1,141 @@
+from datetime import date
+
+import pytest
+from garth.exc import GarthHTTPError
+
+from garminconnect import Garmin, GarminConnectTooManyRequestsError, LoginState
+from garminconnect.fakeserver import (
+    ACTIVITY_ID_BASE,
+    FakeAccount,
+    FakeConnectServer,
+    Faults,
+)
+from garminconnect.fitfile import decode
+from garminconnect.ratelimit import RateLimiter
+
+TODAY = date(2024, 3, 31)
+
+
+@pytest.fixture
+def account():
+    return FakeAccount(days=90, activities=45, samples=120, today=TODAY)
+
+
+def attached(server, **kwargs):
+    garmin = Garmin(
+        rate_limiter=RateLimiter(1000, min_rate=100, backoff_base=0.001)
+    )
+    for name, value in kwargs.items():
+        setattr(garmin, name, value)
+    return server.attach(garmin)
+
+
+def test_serves_synthetic_account(account):
+    with FakeConnectServer([account]) as server:
+        garmin = attached(server)
+        summary = garmin.get_user_summary("2024-03-01")
+        again = garmin.get_user_summary("2024-03-01")
+        sleep = garmin.get_sleep_data("2024-03-01")
+        weigh_ins = garmin.get_weigh_ins("2024-01-01", "2024-03-31")
+        endurance = garmin.get_endurance_score(
+            "2024-01-01", "2024-03-31", resolution="month"
+        )
+
+    assert garmin.display_name == "fake_user"
+    assert summary == again
+    assert summary["calendarDate"] == "2024-03-01"
+    assert sleep["dailySleepDTO"]["calendarDate"] == "2024-03-01"
+    dates = [s["summaryDate"] for s in weigh_ins["dailyWeightSummaries"]]
+    assert dates == sorted(dates, reverse=True)
+    assert list(endurance["groupMap"]) == [
+        "2024-01-01",
+        "2024-02-01",
+        "2024-03-01",
+    ]
+    # The months straddle two windows of the fixed five month grid
+    assert server.stats()["statuses"] == {200: 6}
+
+
+def test_paginates_activities(account):
+    with FakeConnectServer([account]) as server:
+        garmin = attached(server)
+        activities = list(garmin.iter_activities(page_size=10, prefetch=3))
+        march = garmin.get_activities_by_date("2024-03-01", "2024-03-31")
+
+    ids = [activity["activityId"] for activity in activities]
+    assert ids == list(range(ACTIVITY_ID_BASE + 44, ACTIVITY_ID_BASE - 1, -1))
+    assert march
+    assert all(a["startTimeLocal"].startswith("2024-03") for a in march)
+
+
+def test_activity_resources(account):
+    activity_id = ACTIVITY_ID_BASE + 3
+    with FakeConnectServer([account]) as server:
+        garmin = attached(server)
+        metrics = garmin.get_activity_metrics(activity_id, maxchart=100)
+        events = list(garmin.iter_activity_details(activity_id))
+        files = list(garmin.iter_activity_files(activity_id))
+        with pytest.raises(GarthHTTPError):
+            garmin.get_activity_evaluation(ACTIVITY_ID_BASE + 45)
+
+    assert len(metrics["directHeartRate"]) == 100
+    assert sum(kind == "sample" for kind, _ in events) == 120
+    (member,) = files
+    records = decode(member.read())
+    assert len(records) == 120
+    assert 100 <= min(records["heart_rate"]) <= max(records["heart_rate"])
+    assert records["speed"][0] == pytest.approx(
+        metrics["directSpeed"][0], abs=1e-3
+    )
+
+
+def test_injected_throttling_is_retried(account):
+    faults = Faults(throttle_rate=0.3, seed=1)
+    with FakeConnectServer([account], faults) as server:
+        garmin = attached(server)
+        days = [f"2024-03-{day:02}" for day in range(1, 31)]
+        results = [garmin.get_hrv_data(day) for day in days]
+
+    statuses = server.stats()["statuses"]
+    assert [r["hrvSummary"]["calendarDate"] for r in results] == days
+    assert statuses[200] == 30
+    assert statuses[429] > 0
+    snapshot = garmin.instrumentation.snapshot()
+    assert snapshot["get_hrv_data"]["retries"] == statuses[429]
+
+
+def test_injected_errors_and_exhausted_retries(account):
+    with FakeConnectServer([account], Faults(error_rate=1)) as server:
+        garmin = attached(server)
+        with pytest.raises(GarthHTTPError):
+            garmin.get_devices()
+
+    with FakeConnectServer([account], Faults(throttle_rate=1)) as server:
+        garmin = attached(server, max_retries=2)
+        with pytest.raises(GarminConnectTooManyRequestsError):
+            garmin.get_devices()
+
+    assert server.stats()["statuses"] == {429: 3}
+
+
+def test_accounts_are_isolated(account):
+    other = FakeAccount("other_user", days=10, today=TODAY, seed=7)
+    with FakeConnectServer([account, other]) as server:
+        first = attached(server)
+        second = server.attach(Garmin(), "other_user")
+        day = "2024-03-30"
+        assert first.get_hrv_data(day) != second.get_hrv_data(day)
+        assert second.get_body_battery("2024-01-01", "2024-03-31")[0][
+            "date"
+        ] == str(other.first_day)
+
+
+def test_login_and_upload(account, tmp_path):
+    with FakeConnectServer([account]) as server:
+        attached(server).garth.dump(str(tmp_path))
+        garmin = server.mount(Garmin())
+        garmin.login(str(tmp_path))
+        response = garmin.add_body_composition("2024-03-01T07:00:00", 72.5)
+
+    assert garmin.login_state == LoginState("fake_user", "Fake User", "metric")
+    assert response.json()["detailedImportResult"]["fileSize"] > 0
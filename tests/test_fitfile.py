@@ -0,0 +1,121 @@
+import math
+import struct
+import zipfile
+
+import pytest
+
+from garminconnect.fitfile import (
+    FIT_EPOCH,
+    FitDecodeError,
+    FitRecords,
+    decode,
+    decode_files,
+)
+
+FIT = "tests/12129115726_ACTIVITY.fit"
+
+
+def fit_file(messages):
+    body = b"".join(messages)
+    header = struct.pack("<BBHI4s", 12, 0x20, 2132, len(body), b".FIT")
+    return header + body + b"\x00\x00"
+
+
+def synthetic():
+    # Local 0 = record: timestamp, lat, long, heart_rate, altitude, power,
+    # enhanced_altitude; big endian to exercise the architecture flag
+    fields = [
+        (253, 4, 0x86),
+        (0, 4, 0x85),
+        (1, 4, 0x85),
+        (3, 1, 0x02),
+        (2, 2, 0x84),
+        (7, 2, 0x84),
+        (78, 4, 0x86),
+    ]
+    definition = struct.pack(">BBBHB", 0x40, 0, 1, 20, len(fields))
+    definition += b"".join(struct.pack("BBB", *field) for field in fields)
+    # Local 1 = record without timestamp, for compressed timestamp headers
+    compressed = struct.pack("<BBBHB", 0x41, 0, 0, 20, 1)
+    compressed += struct.pack("BBB", 3, 1, 0x02)
+
+    semicircles = int(52.0 / (180 / 2**31))
+    return fit_file(
+        [
+            definition,
+            struct.pack(
+                ">BIiiBHHI",
+                0x00,
+                1000,
+                semicircles,
+                0x7FFFFFFF,
+                140,
+                3000,
+                0xFFFF,
+                3500,
+            ),
+            compressed,
+            # 5 bit time offsets relative to the last full timestamp
+            bytes([0x80 | (1 << 5) | 0x0A]) + bytes([141]),
+            bytes([0x80 | (1 << 5) | 0x02]) + bytes([142]),
+        ]
+    )
+
+
+def test_decode_activity_file():
+    with open(FIT, "rb") as f:
+        records = decode(f.read())
+
+    assert len(records) == 10
+    assert list(records["heart_rate"][:3]) == [86.0, 85.0, 86.0]
+    assert records["timestamp"][0] == 1695946257
+    assert all(math.isnan(value) for value in records["power"])
+
+
+def test_decode_fields_and_compressed_timestamps():
+    records = decode(synthetic())
+
+    assert list(records["heart_rate"]) == [140.0, 141.0, 142.0]
+    # 1000 = 0b1111101000, offsets replace and roll over the low 5 bits
+    assert list(records["timestamp"]) == [
+        FIT_EPOCH + 1000,
+        FIT_EPOCH + 1002,
+        FIT_EPOCH + 1026,
+    ]
+    assert records["latitude"][0] == pytest.approx(52.0)
+    assert math.isnan(records["longitude"][0])
+    assert math.isnan(records["power"][0])
+    # enhanced_altitude (3500 / 5 - 500) wins over altitude
+    assert records["altitude"][0] == 200.0
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(FitDecodeError):
+        decode(b"not a fit file at all")
+    with pytest.raises(FitDecodeError):
+        decode(synthetic()[:-10])
+
+
+def test_decode_files(tmp_path):
+    with open(FIT, "rb") as f:
+        content = f.read()
+    zipped = tmp_path / "12129115726.zip"
+    with zipfile.ZipFile(zipped, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("zipped_ACTIVITY.fit", content)
+    broken = tmp_path / "broken.fit"
+    broken.write_bytes(b"garbage")
+
+    out = tmp_path / "out"
+    report = decode_files(
+        [FIT, str(zipped), str(broken)], str(out), processes=2, chunksize=1
+    )
+
+    assert report.files == 3
+    assert report.records == 20
+    assert list(report.failed) == [str(broken)]
+    assert report.files_per_second > 0
+    records = FitRecords.load(str(out / "zipped_ACTIVITY"))
+    assert list(records["heart_rate"][:3]) == [86.0, 85.0, 86.0]
+    assert (
+        out / "12129115726_ACTIVITY" / "timestamp.i64"
+    ).stat().st_size == 80
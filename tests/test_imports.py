@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from garminconnect import Garmin
+
+
+def test_import_does_not_load_optional_subsystems():
+    code = (
+        "import sys, garminconnect; "
+        "print(*[m for m in ('garth', 'requests', 'withings_sync') "
+        "if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.split() == []
+
+
+def test_endpoints_are_class_attributes():
+    garmin = Garmin()
+
+    assert "garmin_connect_hrv_url" not in vars(garmin)
+    assert garmin.garmin_connect_hrv_url == "/hrv-service/hrv"
@@ -0,0 +1,139 @@
+import math
+
+import pytest
+import requests
+from garth.exc import GarthHTTPError
+
+from garminconnect.instrumentation import (
+    CallRecord,
+    Histogram,
+    Instrumentation,
+)
+from garminconnect.ratelimit import RateLimiter
+
+DATE = "2023-07-01"
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    error = requests.HTTPError(f"{status} Error", response=response)
+    return GarthHTTPError(msg="Error in request", error=error)
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((0.1, 1.0, math.inf))
+    for value in (0.05, 0.05, 0.05, 0.5, 3.0):
+        histogram.observe(value)
+
+    summary = histogram.as_dict()
+    assert summary["count"] == 5
+    assert summary["buckets"] == {0.1: 3, 1.0: 1, math.inf: 1}
+    assert summary["p50"] == 0.1
+    assert summary["p90"] == 3.0
+    assert summary["max"] == 3.0
+    assert summary["mean"] == pytest.approx(0.73)
+
+
+def test_requests_are_keyed_by_getter(offline_garmin):
+    garmin = offline_garmin(lambda path, params: {"path": path})
+    garmin.get_hrv_data(DATE)
+    garmin.get_hrv_data(DATE)
+    garmin.get_activity_bundle([1], parts=["splits", "weather"])
+    garmin.connectapi("/device-service/deviceregistration/devices")
+
+    snapshot = garmin.instrumentation.snapshot()
+
+    assert set(snapshot) == {
+        "connectapi",
+        "get_activity_splits",
+        "get_activity_weather",
+        "get_hrv_data",
+    }
+    hrv = snapshot["get_hrv_data"]
+    assert hrv["calls"] == 2
+    assert hrv["statuses"] == {200: 2}
+    assert hrv["bytes"] == 2 * len(f'{{"path": "{garmin.garth.calls[0][0]}"}}')
+    assert hrv["latency"]["count"] == 2
+    assert hrv["errors"] == hrv["retries"] == 0
+
+
+def test_pages_and_windows_are_keyed_by_getter(offline_garmin):
+    def handler(path, params):
+        if "goals" in path:
+            return [{"id": 1}] if params["start"] == "1" else []
+        if "stats" in path:
+            return {"groupMap": {}, "hillScoreDTOList": []}
+        return [{"activityId": 1}] if params["start"] == "0" else []
+
+    garmin = offline_garmin(handler)
+    garmin.get_activities_by_date(DATE, DATE, prefetch=2)
+    list(garmin.iter_activities(page_size=10))
+    garmin.get_goals()
+    garmin.get_endurance_score(DATE, "2023-12-31", resolution="month")
+    garmin.get_hill_score(DATE, "2023-12-31", resolution="month")
+
+    snapshot = garmin.instrumentation.snapshot()
+
+    assert set(snapshot) == {
+        "get_activities_by_date",
+        "get_endurance_score",
+        "get_goals",
+        "get_hill_score",
+        "iter_activities",
+    }
+    assert snapshot["get_activities_by_date"]["calls"] == 2
+    assert snapshot["get_hill_score"]["calls"] == 6
+
+
+def test_retries_and_errors_are_counted(offline_garmin):
+    failures = [http_error(429), http_error(429)]
+
+    def handler(path, params):
+        if "hrv" not in path:
+            raise http_error(500)
+        if failures:
+            raise failures.pop(0)
+        return {}
+
+    garmin = offline_garmin(handler)
+    garmin.rate_limiter = RateLimiter(rate=1000, backoff_base=0.001)
+    garmin.get_hrv_data(DATE)
+    with pytest.raises(GarthHTTPError):
+        garmin.get_sleep_data(DATE)
+
+    snapshot = garmin.instrumentation.snapshot()
+    assert snapshot["get_hrv_data"]["retries"] == 2
+    assert snapshot["get_hrv_data"]["errors"] == 0
+    assert snapshot["get_sleep_data"]["errors"] == 1
+
+
+def test_hooks_receive_records(offline_garmin):
+    records = []
+
+    def broken(record):
+        raise RuntimeError("hook failure")
+
+    garmin = offline_garmin(lambda path, params: {})
+    garmin.instrumentation.add_hook(broken)
+    garmin.instrumentation.add_hook(records.append)
+    garmin.get_spo2_data(DATE)
+    garmin.instrumentation.remove_hook(records.append)
+    garmin.get_spo2_data(DATE)
+
+    assert len(records) == 1
+    assert isinstance(records[0], CallRecord)
+    assert records[0].endpoint == "get_spo2_data"
+    assert records[0].path.endswith(f"/daily/spo2/{DATE}")
+    assert records[0].status == 200
+
+
+def test_instrumentation_can_be_shared():
+    instrumentation = Instrumentation()
+    instrumentation.record(CallRecord("get_devices", "/devices", 0.2))
+    instrumentation.record(CallRecord("get_devices", "/devices", 0.3))
+    snapshot = instrumentation.snapshot()
+    instrumentation.reset()
+
+    assert snapshot["get_devices"]["latency"]["sum"] == pytest.approx(0.5)
+    assert instrumentation.snapshot() == {}
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from garminconnect import Garmin
+from garminconnect.models import (
+    ActivitySummary,
+    HrvSummary,
+    SleepSummary,
+    UserSummary,
+)
+
+DATE = "2023-07-01"
+
+ACTIVITY = {
+    "activityId": 11,
+    "activityName": "Morning Run",
+    "activityType": {"typeId": 1, "typeKey": "running"},
+    "startTimeLocal": "2023-07-01 07:00:00",
+    "distance": 10000.0,
+    "averageHR": 150.0,
+    "summarizedDiveInfo": {"summarizedDiveGases": []},
+}
+
+
+def handler(path, params):
+    if "/activitylist-service/" in path:
+        start = int(params["start"])
+        stop = min(start + int(params["limit"]), 3)
+        return [dict(ACTIVITY, activityId=i) for i in range(start, stop)]
+    if "/usersummary-service/" in path:
+        return {
+            "calendarDate": DATE,
+            "totalSteps": 12000,
+            "privacyProtected": False,
+        }
+    if "dailySleepData" in path:
+        return {
+            "dailySleepDTO": {
+                "calendarDate": DATE,
+                "sleepTimeSeconds": 27000,
+                "sleepScores": {"overall": {"value": 81}},
+            }
+        }
+    if "/hrv-service/" in path:
+        return None
+    raise AssertionError(path)
+
+
+def test_from_dict_follows_nested_keys():
+    activity = ActivitySummary.from_dict(ACTIVITY)
+
+    assert activity.activity_id == 11
+    assert activity.activity_type == "running"
+    assert activity.steps is None
+    assert activity.as_dict()["distance"] == 10000.0
+    assert not hasattr(activity, "__dict__")
+    with pytest.raises(AttributeError):
+        activity.distance = 0
+
+
+def test_missing_nested_keys_are_none():
+    hrv = HrvSummary.from_dict({"calendarDate": DATE, "baseline": None})
+
+    assert hrv.baseline_low is None
+    assert hrv.calendar_date == DATE
+
+
+def test_typed_getters(offline_garmin):
+    garmin = offline_garmin(handler)
+
+    summary = garmin.get_user_summary(DATE, typed=True)
+    sleep = garmin.get_sleep_data(DATE, typed=True)
+    activities = garmin.get_activities_by_date(
+        DATE, DATE, page_size=2, typed=True
+    )
+
+    assert summary == UserSummary.from_dict(
+        handler("/usersummary-service/", {})
+    )
+    assert isinstance(sleep, SleepSummary)
+    assert sleep.sleep_score == 81
+    assert [a.activity_id for a in activities] == [0, 1, 2]
+    assert garmin.get_hrv_data(DATE, typed=True) is None
+    assert garmin.get_sleep_data(DATE)["dailySleepDTO"]["sleepTimeSeconds"]
+
+
+def test_custom_json_loads(offline_garmin):
+    decoded = []
+
+    def loads(content):
+        decoded.append(content)
+        return json.loads(content)
+
+    garmin = offline_garmin(handler)
+    garmin.json_loads = loads
+
+    assert garmin.get_activities(0, 3)[0]["activityType"]["typeKey"]
+    assert garmin.get_hrv_data(DATE) is None
+    assert len(decoded) == 1
+
+
+def test_default_decoder():
+    orjson = pytest.importorskip("orjson")
+
+    assert Garmin().json_loads is orjson.loads
@@ -0,0 +1,213 @@
+from datetime import date, timedelta
+
+import pytest
+
+from garminconnect.cache import ResponseCache
+from garminconnect.planner import RANGE_ENDPOINTS, aggregation, plan, stitch
+
+
+def test_plan_uses_fewest_windows():
+    windows = plan("2023-01-01", "2023-03-01", 28)
+
+    assert windows == [
+        (date(2023, 1, 1), date(2023, 1, 28)),
+        (date(2023, 1, 29), date(2023, 2, 25)),
+        (date(2023, 2, 26), date(2023, 3, 1)),
+    ]
+    assert plan("2023-01-01", "2023-01-01", 28) == [
+        (date(2023, 1, 1), date(2023, 1, 1))
+    ]
+    with pytest.raises(ValueError):
+        plan("2023-01-02", "2023-01-01", 28)
+
+
+def test_stitch_dicts():
+    weigh_ins = RANGE_ENDPOINTS["get_weigh_ins"]
+    older = {
+        "dailyWeightSummaries": [2, 1],
+        "totalAverage": {"weight": 1},
+        "userProfilePK": 7,
+    }
+    newer = {
+        "dailyWeightSummaries": [4, 3],
+        "totalAverage": {"weight": 2},
+        "userProfilePK": 7,
+    }
+
+    # Per-chunk aggregates don't describe the range, so they are dropped
+    assert stitch(weigh_ins, [older, newer]) == {
+        "dailyWeightSummaries": [4, 3, 2, 1],
+        "userProfilePK": 7,
+    }
+
+    endurance = RANGE_ENDPOINTS["get_endurance_score"]
+    assert stitch(
+        endurance, [{"groupMap": {"a": 1}}, {"groupMap": {"b": 2}}]
+    ) == {"groupMap": {"a": 1, "b": 2}}
+
+
+def test_get_range_chunks_in_parallel(offline_garmin):
+    def handler(path, params):
+        start, end = (date.fromisoformat(d) for d in path.split("/")[-2:])
+        days = (end - start).days + 1
+        return [
+            {"calendarDate": str(start + timedelta(days=i))}
+            for i in range(days)
+        ]
+
+    garmin = offline_garmin(handler)
+    steps = garmin.get_range("get_daily_steps", "2022-01-01", "2023-12-31")
+
+    assert len(garmin.garth.calls) == 27
+    assert len(steps) == 730
+    assert [day["calendarDate"] for day in steps] == sorted(
+        day["calendarDate"] for day in steps
+    )
+    assert steps[-1]["calendarDate"] == "2023-12-31"
+
+    garmin.garth.calls.clear()
+    garmin.get_range("get_daily_steps", "2023-01-01", "2023-01-31", max_days=7)
+    assert len(garmin.garth.calls) == 5
+    with pytest.raises(ValueError):
+        garmin.get_range("get_sleep_data", "2023-01-01", "2023-01-31")
+
+
+def test_get_range_keeps_weeks_whole(offline_garmin):
+    weeks = []
+
+    def handler(path, params):
+        start = date.fromisoformat(params["startDate"])
+        end = date.fromisoformat(params["endDate"])
+        # One aggregate per week touched by the window, partial or not
+        days = (
+            start + timedelta(days=i) for i in range((end - start).days + 1)
+        )
+        weeks.append(
+            {str(day - timedelta(days=day.weekday())) for day in days}
+        )
+        return {"groupMap": dict.fromkeys(weeks[-1], 1)}
+
+    garmin = offline_garmin(handler)
+    scores = garmin.get_range(
+        "get_endurance_score", "2023-01-04", "2023-12-20"
+    )
+
+    # No week is split between the requests
+    assert len(weeks) == 3
+    assert not weeks[0] & weeks[1] and not weeks[1] & weeks[2]
+    assert len(scores["groupMap"]) == 51
+
+
+def test_aggregation_picks_coarsest_satisfying():
+    assert aggregation("get_race_predictions", "month") == (
+        "month",
+        "monthly",
+    )
+    assert aggregation("get_race_predictions", "week") == ("day", "daily")
+    assert aggregation("get_hill_score", "week") == ("week", "weekly")
+    with pytest.raises(ValueError):
+        aggregation("get_hill_score", "year")
+
+
+def test_plan_aligns_to_buckets():
+    # Two months are at most 62 days, and pairs start in odd months
+    windows = plan("2023-01-15", "2023-05-10", 62, align="month")
+    assert windows == [
+        (date(2023, 1, 15), date(2023, 2, 28)),
+        (date(2023, 3, 1), date(2023, 4, 30)),
+        (date(2023, 5, 1), date(2023, 5, 10)),
+    ]
+    assert len(plan("2023-01-01", "2023-12-31", 366, align="month")) == 1
+    # Months longer than max_days aren't split
+    assert plan("2023-01-01", "2023-04-30", 28, align="month") == [
+        (date(2023, 1, 1), date(2023, 1, 31)),
+        (date(2023, 2, 1), date(2023, 2, 28)),
+        (date(2023, 3, 1), date(2023, 3, 31)),
+        (date(2023, 4, 1), date(2023, 4, 30)),
+    ]
+    # 2023-01-04 is a Wednesday, windows then start on Mondays
+    windows = plan("2023-01-04", "2023-01-31", 10, align="week")
+    assert [start.weekday() for start, _ in windows[1:]] == [0, 0, 0, 0]
+    assert all((end - start).days < 10 for start, end in windows)
+    # Windows sit on a fixed grid rather than following 'start'
+    first = plan("2023-01-04", "2023-06-30", 28, align="week")
+    second = plan("2023-01-10", "2023-06-30", 28, align="week")
+    assert first[2:] == second[1:]
+    assert all((end - start).days == 27 for start, end in first[1:-1])
+
+
+def test_overlapping_ranges_share_cached_windows(offline_garmin, tmp_path):
+    cache = ResponseCache(
+        tmp_path / "cache.sqlite", today=lambda: date(2024, 1, 1)
+    )
+    garmin = offline_garmin(
+        lambda path, params: {"hillScoreDTOList": [params["startDate"]]}
+    )
+    garmin.cache = cache
+
+    garmin.get_hill_score("2023-01-10", "2023-06-20", resolution="month")
+    assert len(garmin.garth.calls) == 6
+
+    garmin.garth.calls.clear()
+    hills = garmin.get_hill_score(
+        "2023-03-05", "2023-09-15", resolution="month"
+    )
+    # April and May were fetched by the first query
+    assert len(garmin.garth.calls) == 5
+    assert cache.hits == 2
+    assert hills["hillScoreDTOList"][:3] == [
+        "2023-03-05",
+        "2023-04-01",
+        "2023-05-01",
+    ]
+    cache.close()
+
+
+def test_resolution_getters(offline_garmin):
+    def handler(path, params):
+        if "racepredictions" in path:
+            return [{"calendarDate": params["fromCalendarDate"]}]
+        return {
+            "groupMap": {params["startDate"]: params["aggregation"]},
+            "hillScoreDTOList": [params["aggregation"]],
+        }
+
+    garmin = offline_garmin(handler)
+    monthly = garmin.get_race_predictions(
+        "2019-01-01", "2023-12-31", resolution="month"
+    )
+    assert len(garmin.garth.calls) == 5
+    assert garmin.garth.calls[0][0].endswith("/monthly/display_name")
+    assert [p["calendarDate"] for p in monthly][:2] == [
+        "2019-01-01",
+        "2020-01-01",
+    ]
+
+    garmin.garth.calls.clear()
+    scores = garmin.get_endurance_score(
+        "2023-01-01", "2023-12-31", resolution="month"
+    )
+    assert set(scores["groupMap"].values()) == {"monthly"}
+    assert all(
+        params["startDate"].endswith("-01") for _, params in garmin.garth.calls
+    )
+
+    garmin.garth.calls.clear()
+    hills = garmin.get_hill_score("2023-01-01", "2023-01-20", resolution="day")
+    assert hills == {
+        "groupMap": {"2023-01-01": "daily"},
+        "hillScoreDTOList": ["daily"],
+    }
+    assert len(garmin.garth.calls) == 1
+
+    garmin.garth.calls.clear()
+    hills = garmin.get_hill_score(
+        "2023-01-01", "2023-12-31", resolution="month"
+    )
+    assert hills["hillScoreDTOList"] == ["monthly"] * 12
+    assert len(garmin.garth.calls) == 12
+
+    with pytest.raises(ValueError):
+        garmin.get_race_predictions(
+            "2023-01-01", "2023-12-31", "daily", resolution="day"
+        )
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+import requests
+from garth.exc import GarthHTTPError
+
+from garminconnect import GarminConnectTooManyRequestsError
+from garminconnect.ratelimit import RateLimiter, parse_retry_after
+
+
+def throttled(retry_after=None):
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    error = requests.HTTPError("429 Too Many Requests", response=response)
+    return GarthHTTPError(msg="Error in request", error=error)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_token_bucket_paces_requests():
+    limiter = RateLimiter(rate=100, burst=1)
+    started = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+
+    assert time.monotonic() - started >= 0.09
+    assert limiter.queue_depth == 0
+
+
+def test_retries_after_429_and_adapts(offline_garmin):
+    failures = [throttled("0"), throttled()]
+
+    def handler(path, params):
+        if failures:
+            raise failures.pop(0)
+        return {"ok": True}
+
+    garmin = offline_garmin(handler)
+    garmin.rate_limiter = RateLimiter(rate=10, backoff_base=0.001)
+
+    assert garmin.get_hrv_data("2023-07-01") == {"ok": True}
+    assert len(garmin.garth.calls) == 3
+    assert garmin.rate_limiter.throttled == 2
+    assert garmin.rate_limiter.limit < 10
+
+
+def test_raises_too_many_requests_when_exhausted(offline_garmin):
+    def handler(path, params):
+        raise throttled("0")
+
+    garmin = offline_garmin(handler)
+    garmin.rate_limiter = RateLimiter(backoff_base=0.001)
+    garmin.max_retries = 2
+
+    with pytest.raises(GarminConnectTooManyRequestsError):
+        garmin.get_hrv_data("2023-07-01")
+    assert len(garmin.garth.calls) == 3
+
+
+def test_other_http_errors_propagate(offline_garmin):
+    response = requests.Response()
+    response.status_code = 404
+    error = GarthHTTPError(
+        msg="Error in request",
+        error=requests.HTTPError("404", response=response),
+    )
+
+    def handler(path, params):
+        raise error
+
+    garmin = offline_garmin(handler)
+    with pytest.raises(GarthHTTPError):
+        garmin.get_hrv_data("2023-07-01")
+    assert len(garmin.garth.calls) == 1
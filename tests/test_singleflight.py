@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from garminconnect.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return {"devices": [1, 2]}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(flight.do, "key", slow)
+        started.wait()
+        followers = [executor.submit(flight.do, "key", slow) for _ in range(7)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(result == {"devices": [1, 2]} for result in results)
+    assert len({id(result) for result in results}) == 8
+    assert flight.stats() == {"executed": 1, "shared": 7, "in_flight": 0}
+
+    # Finished calls aren't remembered
+    assert flight.do("key", slow) == {"devices": [1, 2]}
+    assert len(calls) == 2
+
+
+def test_errors_are_shared():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing)
+        started.wait()
+        follower = executor.submit(flight.do, "key", failing)
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
+    assert flight.stats()["executed"] == 1
+
+
+def test_connectapi_coalesces_identical_gets(offline_garmin):
+    barrier = threading.Barrier(4)
+
+    def handler(path, params):
+        time.sleep(0.05)
+        return [{"deviceId": 1}]
+
+    garmin = offline_garmin(handler)
+    garmin.singleflight = SingleFlight()
+
+    def get_devices():
+        barrier.wait()
+        return garmin.get_devices()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: get_devices(), range(4)))
+
+    assert results == [[{"deviceId": 1}]] * 4
+    assert len(garmin.garth.calls) == 1
+
+    # Different params are different requests
+    garmin.get_activity_gear(1)
+    garmin.get_activity_gear(2)
+    assert len(garmin.garth.calls) == 3
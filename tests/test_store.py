@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from garminconnect.store import TimeSeriesStore
+
+DATE = "2023-07-01"
+MIDNIGHT = int(datetime(2023, 7, 1, tzinfo=timezone.utc).timestamp() * 1000)
+MINUTE = 60 * 1000
+
+
+def heart_rates(cdate, offset=0):
+    start = MIDNIGHT + offset
+    return {
+        "calendarDate": cdate,
+        "heartRateValues": [
+            [start + i * MINUTE, None if i == 3 else 60 + i] for i in range(10)
+        ],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TimeSeriesStore(tmp_path)
+
+
+def test_ingest_and_query_range(store):
+    assert store.ingest("get_heart_rates", DATE, heart_rates(DATE)) == 9
+    store.ingest(
+        "get_heart_rates", "2023-07-02", heart_rates("2023-07-02", 86400000)
+    )
+
+    timestamps, values = store.query(
+        "heart_rate", MIDNIGHT + 2 * MINUTE, MIDNIGHT + 5 * MINUTE
+    )
+    assert list(values) == [62.0, 64.0, 65.0]
+    assert list(timestamps) == [MIDNIGHT + i * MINUTE for i in (2, 4, 5)]
+
+    _, values = store.query(
+        "heart_rate",
+        datetime(2023, 7, 1, 23, tzinfo=timezone.utc),
+        datetime(2023, 7, 3, tzinfo=timezone.utc),
+    )
+    assert len(values) == 9
+    assert store.dates("heart_rate") == [DATE, "2023-07-02"]
+
+
+def test_all_day_stress_splits_series(store):
+    response = {
+        "stressValuesArray": [[MIDNIGHT, 25], [MIDNIGHT + MINUTE, -1]],
+        "bodyBatteryValuesArray": [
+            [MIDNIGHT, "MEASURED", 80, 2.0],
+            [MIDNIGHT + MINUTE, "MEASURED", 79, 2.0],
+        ],
+    }
+    store.ingest("get_all_day_stress", DATE, response)
+
+    assert list(store.query("stress", MIDNIGHT, MIDNIGHT + MINUTE)[1]) == [
+        25.0,
+        -1.0,
+    ]
+    assert list(
+        store.query("body_battery", MIDNIGHT, MIDNIGHT + MINUTE)[1]
+    ) == [80.0, 79.0]
+
+
+def test_sync_fetches_range(offline_garmin, store):
+    def handler(path, params):
+        return heart_rates(params["date"])
+
+    garmin = offline_garmin(handler)
+    assert store.sync(garmin, "get_heart_rates", DATE, "2023-07-03") == 27
+    assert store.dates("heart_rate") == [
+        "2023-07-01",
+        "2023-07-02",
+        "2023-07-03",
+    ]
+
+
+def test_unknown_source(store):
+    with pytest.raises(ValueError):
+        store.ingest("get_devices", DATE, {})
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from garminconnect.sync import SyncEngine
+
+ACTIVITIES = "/activitylist-service/activities/search/activities"
+
+
+def make_handler(activities):
+    def handler(path, params):
+        if path == ACTIVITIES:
+            start, limit = int(params["start"]), int(params["limit"])
+            return activities[start : start + limit]
+        return {"calendarDate": path.rsplit("/", 1)[-1]}
+
+    return handler
+
+
+def activity(activity_id, start):
+    return {"activityId": activity_id, "startTimeGMT": f"2023-{start}:00"}
+
+
+def test_sync_fetches_only_new_and_mutable_days(offline_garmin, tmp_path):
+    activities = [
+        activity(30, "07-08 07:00"),
+        activity(20, "06-20 07:00"),
+        activity(10, "06-01 07:00"),
+    ]
+    garmin = offline_garmin(make_handler(activities))
+    engine = SyncEngine(
+        garmin, tmp_path, metrics=["get_hrv_data"], initial_days=5
+    )
+
+    days, seen = [], []
+    counts = engine.run(
+        "2023-07-10",
+        on_day=lambda metric, cdate, response: days.append(cdate),
+        on_activity=lambda activity: seen.append(activity["activityId"]),
+    )
+    assert counts == {"get_hrv_data": 5, "activities": 3}
+    assert days == [f"2023-07-{day:02}" for day in range(6, 11)]
+    assert seen == [30, 20, 10]
+
+    state = json.loads((tmp_path / "display_name.json").read_text())
+    assert state == {
+        "activity_start": "2023-07-08 07:00:00",
+        "activities": {"30": "2023-07-08 07:00:00"},
+        "synced": {"get_hrv_data": "2023-07-08"},
+    }
+
+    # The next day only the mutable window and the new day are fetched,
+    # and activities stop at the high-water mark
+    activities.insert(0, activity(40, "07-11 07:00"))
+    days.clear()
+    garmin.garth.calls.clear()
+    counts = engine.run(
+        "2023-07-11",
+        on_day=lambda metric, cdate, response: days.append(cdate),
+    )
+    assert counts == {"get_hrv_data": 3, "activities": 1}
+    assert days == ["2023-07-09", "2023-07-10", "2023-07-11"]
+    assert len(garmin.garth.calls) == 4
+    assert engine.load_state()["activity_start"] == "2023-07-11 07:00:00"
+    assert engine.load_state()["synced"]["get_hrv_data"] == "2023-07-09"
+
+
+def test_sync_finds_late_uploads(offline_garmin, tmp_path):
+    activities = [activity(30, "07-10 07:00")]
+    garmin = offline_garmin(make_handler(activities))
+    engine = SyncEngine(garmin, tmp_path, metrics=[])
+    engine.run("2023-07-10")
+
+    # An older activity uploaded late gets a higher ID than the mark's
+    activities[:0] = [activity(40, "07-11 07:00")]
+    activities.append(activity(45, "07-09 18:00"))
+    seen = []
+    counts = engine.run(
+        "2023-07-11",
+        on_activity=lambda activity: seen.append(activity["activityId"]),
+    )
+
+    assert seen == [40, 45]
+    assert counts == {"activities": 2}
+    assert engine.run("2023-07-11") == {"activities": 0}
+
+
+def test_sync_keeps_state_when_interrupted(offline_garmin, tmp_path):
+    garmin = offline_garmin(make_handler([]))
+    engine = SyncEngine(
+        garmin, tmp_path, metrics=["get_hrv_data", "get_rhr_day"]
+    )
+    engine.save_state({"synced": {"get_hrv_data": "2023-07-01"}})
+
+    def fail(metric, cdate, response):
+        if metric == "get_rhr_day":
+            raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        engine.run("2023-07-05", on_day=fail)
+
+    state = engine.load_state()
+    assert state["synced"] == {"get_hrv_data": "2023-07-03"}
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,138 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date, timedelta
+
+import pytest
+
+from garminconnect import Garmin, LoginState
+from garminconnect.fakeserver import FakeAccount, FakeConnectServer
+from garminconnect.ratelimit import RateLimiter
+
+THREADS = 16
+REQUESTS = 25
+TODAY = date(2024, 3, 31)
+
+
+def attached(server, **kwargs):
+    garmin = Garmin(rate_limiter=RateLimiter(10000), **kwargs)
+    return server.attach(garmin)
+
+
+def test_shared_instance_under_load():
+    with FakeConnectServer([FakeAccount(today=TODAY)]) as server:
+        garmin = attached(server, pool_size=THREADS)
+        fresh = garmin.garth.oauth2_token
+        garmin.garth.oauth2_token = replace(
+            fresh, access_token="stale", expires_at=0
+        )
+
+        refreshes = []
+
+        def refresh():
+            refreshes.append(threading.get_ident())
+            time.sleep(0.05)
+            garmin.garth.oauth2_token = fresh
+
+        garmin.garth.refresh_oauth2 = refresh
+
+        def work(worker):
+            results = []
+            for i in range(REQUESTS):
+                cdate = str(TODAY - timedelta(days=(worker + i) % 28))
+                response = garmin.get_hrv_data(cdate)
+                results.append(response["hrvSummary"]["calendarDate"] == cdate)
+                response = garmin.get_stress_data(cdate)
+                results.append(response["calendarDate"] == cdate)
+            return results
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            outcomes = list(executor.map(work, range(THREADS)))
+        stats = server.stats()
+
+    assert all(all(results) for results in outcomes)
+    # The stale token was never sent: the server answers it with 401
+    assert stats["statuses"] == {200: THREADS * REQUESTS * 2}
+    assert len(refreshes) == 1
+    # Keep-alive connections are reused rather than one per request
+    assert stats["connections"] <= THREADS
+    assert garmin.display_name == "fake_user"
+    hrv = garmin.instrumentation.snapshot()["get_hrv_data"]
+    assert hrv["statuses"] == {200: THREADS * REQUESTS}
+    assert hrv["bytes"] > 0
+
+
+def test_expiring_token_is_refreshed_under_lock():
+    with FakeConnectServer([FakeAccount(today=TODAY)]) as server:
+        garmin = attached(server)
+        fresh = garmin.garth.oauth2_token
+        # Not expired yet for garth, which would refresh without the lock
+        garmin.garth.oauth2_token = replace(
+            fresh, expires_at=int(time.time()) + 30
+        )
+
+        locked = []
+
+        def refresh():
+            locked.append(garmin._token_lock.locked())
+            garmin.garth.oauth2_token = fresh
+
+        garmin.garth.refresh_oauth2 = refresh
+        garmin.get_hrv_data(str(TODAY))
+
+    assert locked == [True]
+
+
+def test_pool_size_is_set_at_setup():
+    garmin = Garmin(pool_size=THREADS)
+    adapter = garmin.garth.sess.get_adapter("https://")
+
+    assert adapter._pool_maxsize == THREADS
+    assert garmin.garth.pool_maxsize == THREADS
+
+
+def test_configure_pool_replaces_and_closes_every_adapter():
+    with FakeConnectServer() as server:
+        garmin = attached(server)
+        session = garmin.garth.sess
+        redirect = session.get_adapter(
+            f"https://connectapi.{garmin.garth.domain}"
+        )
+        default = session.get_adapter("https://")
+        closed = []
+        for adapter in (redirect, default):
+            adapter.poolmanager.clear = lambda a=adapter: closed.append(a)
+
+        garmin.configure_pool(32)
+        grown = session.get_adapter(
+            f"https://connectapi.{garmin.garth.domain}"
+        )
+        profile = garmin.get_user_profile()
+
+    assert grown is not redirect
+    assert type(grown) is type(redirect)
+    assert grown.target == redirect.target
+    assert grown._pool_maxsize == 32
+    assert session.get_adapter("https://")._pool_maxsize == 32
+    assert session.get_adapter("https://").max_retries.total == (
+        default.max_retries.total
+    )
+    assert set(closed) == {redirect, default}
+    assert garmin.garth.pool_maxsize == 32
+    assert profile
+
+    garmin.configure_pool(8)
+    assert session.get_adapter("https://")._pool_maxsize == 32
+    assert garmin.pool_size == 32
+
+
+def test_login_state_is_replaced_not_mutated():
+    garmin = Garmin()
+    before = garmin.login_state
+    garmin.display_name = "someone"
+
+    assert before.display_name is None
+    assert garmin.login_state == LoginState("someone")
+    with pytest.raises(AttributeError):
+        garmin.login_state.display_name = "other"
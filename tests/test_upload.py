@@ -0,0 +1,92 @@
+import requests
+from garth.exc import GarthHTTPError
+
+from garminconnect.ratelimit import RateLimiter
+from garminconnect.upload import upload_files
+
+FIT = "tests/12129115726_ACTIVITY.fit"
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return GarthHTTPError(
+        msg="Error in request",
+        error=requests.HTTPError(str(status), response=response),
+    )
+
+
+class Uploads:
+    def __init__(self, garmin):
+        self.files = []
+        self.fail = {}
+        garmin.garth.post = self.post
+
+    def post(self, subdomain, path, files=None, **kwargs):
+        name, data = files["file"]
+        self.files.append((name, data))
+        errors = self.fail.get(name)
+        if errors:
+            raise errors.pop(0)
+        return {"name": name}
+
+
+def test_upload_activity_sends_file_contents(offline_garmin):
+    garmin = offline_garmin(None)
+    uploads = Uploads(garmin)
+
+    assert garmin.upload_activity(FIT)
+    with open(FIT, "rb") as f:
+        assert uploads.files == [("12129115726_ACTIVITY.fit", f.read())]
+
+
+def test_upload_activities_reports_per_file_status(offline_garmin, tmp_path):
+    garmin = offline_garmin(None)
+    uploads = Uploads(garmin)
+    paths = []
+    names = ["a.fit", "b.fit", "c.fit", "d.txt", "e.fit", "f.fit", "g.fit"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"data")
+        paths.append(str(tmp_path / name))
+    uploads.fail = {
+        "a.fit": [http_error(500)],
+        "b.fit": [http_error(409)],
+        "c.fit": [http_error(500)] * 3,
+        "e.fit": [http_error(400)],
+        "f.fit": [requests.ConnectionError("reset"), http_error(503)],
+        "g.fit": [http_error(429)] * 5,
+    }
+    garmin.max_retries = 1
+    garmin.rate_limiter = RateLimiter(rate=1000, backoff_base=0.001)
+
+    results = list(
+        upload_files(garmin.upload_activity, paths, retries=2, backoff=0)
+    )
+
+    assert [(r.status, r.attempts) for r in results] == [
+        ("uploaded", 2),
+        ("duplicate", 1),
+        ("failed", 3),
+        ("invalid", 1),
+        ("failed", 1),
+        ("uploaded", 3),
+        ("failed", 1),
+    ]
+    assert results[0].response == {"name": "a.fit"}
+    # Throttling is retried by the client only, not again per upload
+    assert [name for name, _ in uploads.files].count("g.fit") == 2
+
+
+def test_body_compositions_are_packed_per_batch(offline_garmin):
+    garmin = offline_garmin(None)
+    uploads = Uploads(garmin)
+    measurements = [
+        {"timestamp": f"2023-07-{day:02d}T07:00:00", "weight": 70 + day / 10}
+        for day in range(1, 11)
+    ]
+
+    responses = garmin.add_body_compositions(measurements, batch_size=4)
+
+    assert len(responses) == 3
+    sizes = [len(data) for _, data in uploads.files]
+    assert sizes[0] == sizes[1] > sizes[2]